@@ -1,6 +1,7 @@
 import streamlit as st
 from streamlit_extras.stylable_container import stylable_container
 from utils.style import apply_custom_style
+from utils.data_loader import get_prefetcher
 
 # --- 1. Theme & Page Config ---
 if "theme" not in st.session_state:
@@ -19,15 +20,6 @@ apply_custom_style(st.session_state.theme)
 
 
 # --- 3. Sidebar Navigation ---
-hide_pages_nav = """
-<style>
-    div[data-testid="stSidebarNav"] {
-        display: none;
-    }
-</style>
-"""
-st.markdown(hide_pages_nav, unsafe_allow_html=True)
-
 with st.sidebar:
     st.title("K-소설 해외진출 나침반 🧭")
     # Add new homepage link at the top
@@ -37,6 +29,15 @@ with st.sidebar:
     st.page_link("pages/3_domestic_market.py", label="한국 도서시장 현황")
     st.divider()
 
+# --- 3-1. Dataset Prefetch ---
+# 홈 화면에 들어오는 즉시 모든 데이터셋을 백그라운드에서 동시에 내려받기 시작
+prefetch_progress = get_prefetcher().progress()
+if any(p.state != "done" for p in prefetch_progress.values()):
+    with st.sidebar.expander("데이터 준비 상태", expanded=False):
+        for name, p in prefetch_progress.items():
+            label = f"{name} ({p.state})" if p.state != "error" else f"{name} (오류: {p.error})"
+            st.progress(p.fraction, text=label)
+
 # --- 4. Main Title & Intro ---
 st.title("한국소설 번역 시장 인텔리전스 플랫폼")
 st.markdown("""
@@ -2,8 +2,16 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 from st_keyup import st_keyup
-from utils.data_loader import load_data
+from utils.data_loader import dataset_version, load_columns, load_data
+from utils.bitmaps import combine_masks
+from utils.figures import show_cache_stats, theme_layout, themed
+from utils.indexes import (ann_index, bitmap_index, book_search_index, dashboard_kpis, enriched_data, figure_cache,
+                           figure_key, rank_stability, row_lookup, sort_index, topsis_ranking)
+from utils.pagination import page_cache, page_count, page_navigator, page_rows
+from utils.similarity import document_texts
+from utils.sorting import rows_to_mask
 from utils.style import apply_custom_style
+from utils.topsis import CRITERIA as TOPSIS_CRITERIA, DEFAULT_WEIGHTS as DEFAULT_TOPSIS_WEIGHTS
 from collections import Counter
 from streamlit_extras.stylable_container import stylable_container
 import plotly.io as pio
@@ -29,10 +37,11 @@ else:
     pio.templates.default = "plotly_dark"
 
 # --- 3. DATA LOADING ---
-df_ranked = load_data('data/흥행예측도서_ranked.csv')
-df_translated = load_data('data/trans_final_with_url.csv')
+df_ranked = enriched_data('data/흥행예측도서_ranked.csv')
+df_translated = enriched_data('data/trans_final_with_url.csv')
 df_book_korean = load_data('data/book_korean.csv')
-df_nyb = load_data('data/nyt_bestseller_with_keyword.csv')
+# NYT 베스트셀러는 장르 분포와 유사 도서 제목만 쓰므로 두 컬럼만 읽음
+df_nyb = load_columns('data/nyt_bestseller_with_keyword.csv', ['title', 'primary_genre'])
 df_imdb = load_data("data/imdb_llm_filtered_final.csv")
 
 # --- 4. SESSION STATE INITIALIZATION ---
@@ -40,15 +49,6 @@ if 'selected_book_isbn' not in st.session_state:
     st.session_state.selected_book_isbn = None
 
 # --- 5. SIDEBAR / NAVIGATOR ---
-hide_pages_nav = """
-<style>
-    div[data-testid="stSidebarNav"] {
-        display: none;
-    }
-</style>
-"""
-st.markdown(hide_pages_nav, unsafe_allow_html=True)
-
 with st.sidebar:
     st.title("K-소설 해외진출 나침반 🧭")
     # Add new homepage link at the top
@@ -73,25 +73,12 @@ if st.button("지표 설명 모두 보기/접기", key="trans_expand"):
     st.session_state.expand_all_metrics = not st.session_state.expand_all_metrics
 
 # --- REVISED: Create a structured list of metrics ---
-if not df_ranked.empty and not df_translated.empty and not df_book_korean.empty:
-    translated_count = df_translated['ISBN_K'].nunique()
-    untranslated_count = df_book_korean['ISBN'].nunique()
-    total_books = translated_count + untranslated_count
-    translation_percentage = (translated_count / total_books) * 100 if total_books > 0 else 0
-    success_count = df_ranked['ISBN'].nunique()
-    success_percentage = (success_count/(success_count + untranslated_count)) * 100
-    avg_final_score = df_ranked['fuzzy_topsis_score'].mean()
-    avg_salespoint = df_translated['salespoint'].mean()
-    success_salespoint = df_ranked['salespoint'].mean()
-    avg_similarity = df_translated['top_1_similarity'].mean()
-    success_nyb_max_s = df_ranked['nyb_max_s'].mean()
-else:
-    translation_percentage, avg_final_score, avg_salespoint, avg_similarity = 0, 0, 0, 0
+kpi = dashboard_kpis()
 
 metrics = [
     {
         "label": "흥행 예측도서 비율",
-        "value": f"{success_percentage:.2f}%",
+        "value": f"{kpi['success_percentage']:.2f}%",
         "expander": """
         - **설명:** 번역되지 않은 전체 한국소설 중, 해외 흥행이 예측된 도서의 비율입니다.
         - **의미:** 이 비율이 높을수록 해외 흥행이 예측된 K-소설의 비중이 크다는 것을 의미합니다.
@@ -99,7 +86,7 @@ metrics = [
     },
     {
         "label": "흥행 예측지수 평균",
-        "value": f"{avg_final_score:.2f} / 1",
+        "value": f"{kpi['avg_final_score']:.2f} / 1",
         "expander": """
         - **설명:** 다양한 지표(판매량, 평점, 유사도 등)를 종합하여 산출한 흥행 예측 점수입니다.
         - **의미:** 점수가 1에 가까울수록 해외 시장에서의 흥행 가능성이 높음을 시사합니다.
@@ -107,7 +94,7 @@ metrics = [
     },
     {
         "label": "흥행 예측도서 판매지수 평균",
-        "value": f"{success_salespoint:,.0f} pts",
+        "value": f"{kpi['success_salespoint']:,.0f} pts",
         "expander": """
         - **설명:** 흥행 성공이 예측된 도서들의 평균 판매지수로, 알라딘에서 각 도서의 인기도와 판매 추이를 수치로 나타내는 고유한 판매 지수입니다.
         - **의미:** 판매지수가 높을수록 시장 반응이 좋음을 의미합니다.
@@ -115,7 +102,7 @@ metrics = [
     },
     {
         "label": "흥행 예측도서 vs NYT 베스트셀러 유사도",
-        "value": f"{success_nyb_max_s:.2f} / 1",
+        "value": f"{kpi['success_nyb_max_s']:.2f} / 1",
         "expander": """
         - **설명:** 흥행 예측도서와 뉴욕타임즈 베스트셀러 간의 내용적 유사도를 나타냅니다. **유사도**란 도서의 설명에 포함된 장르, 배경, 캐릭터, 분위기, 전개 등 도서 내용 및 의미가 유사한 정도를 수치화한 지수입니다.
         - **의미:** 수치가 높을수록 미국 주류 시장의 독자 취향과 부합할 가능성이 큽니다.
@@ -167,26 +154,126 @@ display_labels = {
     'primary_genre': '장르',
     'salespoint': '판매지수',
     'nyb_max_s': '해외 인기도서 유사도',
+    'nyb_max_s_local': '해외 인기도서 유사도 (로컬 추정)',
     'nyt_genre_score' : '해외 인기도서 장르 유사도',
     'imdb_genre_score' :'K-컨텐츠 장르 유사도',
     'fuzzy_topsis_score': '종합 평가 점수',
-    'ISBN': 'ISBN'
+    'ISBN': 'ISBN',
+    'search_score': '검색 정확도',
+    'rank_median': '순위 중앙값',
+    'rank_band': '순위 범위 (5–95%)'
 }
 
-sort_cols = ['fuzzy_rank', 'salespoint', 'nyb_max_s', 'nyt_genre_score','imdb_genre_score' 'fuzzy_topsis_score']
+sort_cols = ['fuzzy_rank', 'salespoint', 'nyb_max_s', 'nyt_genre_score', 'imdb_genre_score', 'fuzzy_topsis_score']
+RANKED_FILE = 'data/흥행예측도서_ranked.csv'
+RANKING_PAGE_SIZE = 20
+
+# --- 종합 평가 점수 가중치 조정 (fuzzy TOPSIS 재계산) ---
+ranking_sort_index = sort_index(RANKED_FILE, sort_cols)
+with st.expander("⚖️ 종합 평가 점수 가중치 조정"):
+    use_custom_weights = st.toggle("가중치를 직접 조정해 종합 평가 점수와 순위를 다시 계산", key="topsis_custom_weights")
+    weight_cols = st.columns(len(TOPSIS_CRITERIA))
+    topsis_weights = []
+    for weight_col, criterion in zip(weight_cols, TOPSIS_CRITERIA):
+        with weight_col:
+            topsis_weights.append(st.slider(
+                display_labels.get(criterion, criterion), 0.0, 1.0, DEFAULT_TOPSIS_WEIGHTS[criterion], 0.05,
+                key=f"topsis_weight_{criterion}", disabled=not use_custom_weights
+            ))
+    if use_custom_weights:
+        if sum(topsis_weights) > 0:
+            st.caption("정규화된 가중치: " + ", ".join(
+                f"{display_labels.get(c, c)} {w / sum(topsis_weights):.0%}" for c, w in zip(TOPSIS_CRITERIA, topsis_weights)
+            ))
+        else:
+            st.warning("가중치가 모두 0이어서 기존 종합 평가 점수를 사용합니다.")
+
+if use_custom_weights and sum(topsis_weights) > 0:
+    # 가중치별로 한 번만 계산해 공유 (점수·순위와 그 정렬 순서)
+    topsis_scores, topsis_sort_index = topsis_ranking(RANKED_FILE, topsis_weights)
+    df_ranked = df_ranked.assign(
+        fuzzy_topsis_score=topsis_scores['fuzzy_topsis_score'].to_numpy(),
+        fuzzy_rank=topsis_scores['fuzzy_rank'].array,
+    )
+else:
+    topsis_weights, topsis_sort_index = None, None
+
+# --- 순위 안정성 분석 (가중치를 무작위로 흔들었을 때 순위가 얼마나 바뀌는지) ---
+STABILITY_SPREADS = {"작게": 100.0, "보통": 30.0, "크게": 10.0}
+stability_expander = st.expander("🎲 순위 안정성 분석 (Monte-Carlo)")
+with stability_expander:
+    st.caption(
+        "현재 가중치" + ("(직접 조정한 값)" if topsis_weights else "(기본값)") +
+        "를 중심으로 가중치를 여러 번 무작위로 바꿔 순위를 다시 계산하고, 도서별 순위의 중앙값과 5–95% 범위를 표에 추가합니다."
+    )
+    col_samples, col_spread, col_run = st.columns([1, 1, 1])
+    with col_samples:
+        n_samples = st.selectbox("표본 수", [500, 2000, 5000], index=1, key="stability_samples")
+    with col_spread:
+        spread_label = st.selectbox("가중치 변동 폭", list(STABILITY_SPREADS), index=1, key="stability_spread")
+    with col_run:
+        st.markdown("<div style='height: 1.7rem;'></div>", unsafe_allow_html=True)
+        if st.button("분석 실행", key="stability_run", use_container_width=True):
+            st.session_state.stability_params = (n_samples, spread_label)
+    if st.session_state.get("stability_params"):
+        st.button("분석 결과 지우기", key="stability_clear",
+                  on_click=lambda: st.session_state.pop("stability_params", None))
+
+stability_params = st.session_state.get("stability_params")
+if stability_params:
+    stability_weights = topsis_weights or [DEFAULT_TOPSIS_WEIGHTS[c] for c in TOPSIS_CRITERIA]
+    with st.spinner("순위 안정성 계산 중..."):
+        df_stability = rank_stability(RANKED_FILE, stability_weights, stability_params[0],
+                                      STABILITY_SPREADS[stability_params[1]])
+    rank_band = (df_stability['rank_p05'].map('{:.0f}'.format) + '–' + df_stability['rank_p95'].map('{:.0f}'.format))
+    df_ranked = df_ranked.assign(
+        rank_median=df_stability['rank_median'].to_numpy(),
+        rank_band=rank_band.where(df_stability['rank_median'].notna()).to_numpy(),
+    )
+    stability_signature = (tuple(stability_weights), *stability_params)
+    with stability_expander:
+        # 순위 분포는 앱에서 다시 계산한 fuzzy TOPSIS 순위 기준이므로, 기본값일 때는 CSV 순위와 같은지 확인해 표시
+        if topsis_weights:
+            st.caption("아래 순위 범위는 직접 조정한 가중치로 앱에서 다시 계산한 순위 기준입니다.")
+        elif topsis_ranking(RANKED_FILE, stability_weights)[0]['fuzzy_rank'].reset_index(drop=True).equals(
+                df_ranked['fuzzy_rank'].astype('Int32').reset_index(drop=True)):
+            st.caption("앱의 기본 가중치(기준별 동일 비중)로 다시 계산한 순위가 표의 순위와 같습니다.")
+        else:
+            st.caption(
+                "⚠️ 아래 순위 범위는 앱의 기본 가중치(기준별 동일 비중)로 다시 계산한 순위 기준으로, "
+                "데이터셋에 저장된 표의 순위와는 다를 수 있습니다."
+            )
+        # 상위 도서의 순위 중앙값과 5–95% 범위
+        top_rows = (topsis_sort_index if topsis_sort_index is not None else ranking_sort_index).order('fuzzy_rank')[:20]
+        df_band = df_ranked.iloc[top_rows][['제목', 'fuzzy_rank', 'rank_median']].assign(
+            low=df_stability['rank_median'].to_numpy()[top_rows] - df_stability['rank_p05'].to_numpy()[top_rows],
+            high=df_stability['rank_p95'].to_numpy()[top_rows] - df_stability['rank_median'].to_numpy()[top_rows],
+        )
+        fig_band = px.scatter(
+            df_band, x='rank_median', y='제목', error_x='high', error_x_minus='low',
+            hover_data={'fuzzy_rank': True},
+            labels={'rank_median': '앱 가중치 기준 순위 (중앙값, 5–95% 범위)', '제목': '', 'fuzzy_rank': '표의 순위'},
+        )
+        fig_band.update_yaxes(autorange='reversed')
+        fig_band.update_layout(height=520, margin=dict(l=10, r=10, t=10, b=10))
+        st.plotly_chart(fig_band, use_container_width=True)
+else:
+    stability_signature = None
 
 col_rank, col_detail = st.columns([2, 1])
 
 with col_rank:
-    search_query = st_keyup("🔍 도서 검색 (제목, 저자, ISBN)", debounce=500, key="book_search")
+    search_query = st_keyup("🔍 도서 검색 (제목, 저자, ISBN, 초성)", debounce=500, key="book_search")
+    # 검색/장르 필터는 df_ranked 행 번호에 대한 마스크로 처리하고, 정렬은 미리 계산한 순서를 사용
     if search_query:
-        search_filtered_df = df_ranked[
-            df_ranked['제목'].str.contains(search_query, case=False, na=False) |
-            df_ranked['저자'].str.contains(search_query, case=False, na=False) |
-            df_ranked['ISBN'].astype(str).str.contains(search_query, case=False, na=False)
-        ]
+        # 제목/저자/ISBN 검색 인덱스 (데이터셋 버전별로 한 번만 생성): 부분 입력한 한글, 초성, 오타도 찾음
+        matched_rows, _ = book_search_index(RANKED_FILE, ['제목', '저자', 'ISBN']).search(search_query)
+        row_mask = rows_to_mask(matched_rows, len(df_ranked))
+        # 검색 중에는 정확도순(정확히 일치 → 부분 입력/초성 → 오타 허용)을 기본 정렬로 제공
+        sort_options = ['search_score'] + sort_cols
     else:
-        search_filtered_df = df_ranked
+        row_mask = None
+        sort_options = sort_cols
 
     col_sort_1, col_sort_2 = st.columns([2, 1])
     with col_sort_1:
@@ -194,51 +281,67 @@ with col_rank:
         # The user sees Korean, but `sort_by` variable will hold the English key for sorting
         sort_by = st.selectbox(
             "정렬 기준 (Sort by)",
-            options=sort_cols,
+            options=sort_options,
             format_func=lambda x: display_labels.get(x, x),  # Show Korean label
             index=0
         )
     with col_sort_2:
-        order = st.radio("정렬 순서", ["오름차순", "내림차순"], horizontal=True)
-        is_ascending = "오름차순" in order
+        # 검색 정확도순은 정확도가 높은 결과부터만 보여주므로 정렬 순서를 고를 수 없음
+        order = st.radio("정렬 순서", ["오름차순", "내림차순"], horizontal=True, disabled=sort_by == 'search_score')
+        is_ascending = "오름차순" in order and sort_by != 'search_score'
 
     # --- STEP 3: Modify pills to show Korean genre names ---
-    if 'primary_genre' in df_ranked.columns:
-        unique_genres = sorted(df_ranked['primary_genre'].dropna().unique().tolist())
+    # 장르별 비트맵 인덱스 (데이터셋 버전별로 한 번만 생성): 다중 선택은 OR, 검색 결과와는 AND
+    genre_bitmaps = bitmap_index(RANKED_FILE, ['primary_genre'])
+    if 'primary_genre' in genre_bitmaps:
+        unique_genres = genre_bitmaps.values('primary_genre')
         selected_genres = st.pills(
             "장르 필터 (Filter by Genre)",
             options=unique_genres,
             format_func=lambda x: f"{genre_emoji_map.get(x, '📚')} {genre_kor_map.get(x, x)}", # Use Korean map
             selection_mode="multi"
         )
-        if selected_genres:
-            final_filtered_df = search_filtered_df[search_filtered_df['primary_genre'].isin(selected_genres)]
-        else:
-            final_filtered_df = search_filtered_df
+        row_mask = combine_masks(row_mask, genre_bitmaps.mask('primary_genre', selected_genres))
     else:
-        final_filtered_df = search_filtered_df
+        selected_genres = []
         st.warning("`primary_genre` 컬럼을 찾을 수 없어 장르 필터를 비활성화합니다.")
 
     # --- STEP 4: Translate dataframe content and headers before display ---
     display_cols = ['fuzzy_rank', '제목', '저자', 'primary_genre', 'salespoint', 'nyb_max_s', 'nyt_genre_score', 'imdb_genre_score','fuzzy_topsis_score', 'ISBN']
+    if 'nyb_max_s_local' in df_ranked.columns:
+        # 오프라인 유사도가 없는 신규 도서의 로컬 추정값은 척도가 달라 별도 컬럼으로 표시
+        display_cols.insert(display_cols.index('nyb_max_s') + 1, 'nyb_max_s_local')
+    if stability_signature:
+        display_cols = display_cols[:1] + ['rank_median', 'rank_band'] + display_cols[1:]
+
+    if sort_by == 'search_score':
+        # 검색 결과는 이미 정확도순이므로 그 순서를 유지
+        sorted_rows = matched_rows if row_mask is None else matched_rows[row_mask[matched_rows]]
+    elif topsis_sort_index is not None and sort_by in topsis_sort_index:
+        sorted_rows = topsis_sort_index.order(sort_by, ascending=is_ascending, mask=row_mask)
+    else:
+        sorted_rows = ranking_sort_index.order(sort_by, ascending=is_ascending, mask=row_mask)
+
+    if sorted_rows.size:
+        # 현재 페이지의 행만 표시용 DataFrame으로 만들어 전송 (목록 크기와 관계없이 한 페이지 분량)
+        table_signature = (dataset_version(RANKED_FILE), search_query, sort_by, is_ascending, tuple(selected_genres or ()),
+                           tuple(topsis_weights) if topsis_weights else None, stability_signature)
+        page = page_navigator(sorted_rows.size, "ranking", RANKING_PAGE_SIZE, table_signature)
+
+        def build_ranking_page(page_no):
+            df_page = df_ranked[display_cols].iloc[page_rows(sorted_rows, page_no, RANKING_PAGE_SIZE)]
+            # Translate genre content to Korean + Emoji
+            df_page['primary_genre'] = df_page['primary_genre'].map(
+                lambda x: f"{genre_emoji_map.get(x, '📚')} {genre_kor_map.get(x, x)}" if pd.notna(x) else x
+            )
+            # Translate column headers to Korean
+            df_page.columns = [display_labels.get(col, col) for col in df_page.columns]
+            return df_page
 
-    if not final_filtered_df.empty:
-        # Sort the original filtered dataframe
-        df_sorted_original = final_filtered_df.sort_values(by=sort_by, ascending=is_ascending).reset_index(drop=True)
-
-        # Create a copy for display purposes
-        df_to_display = df_sorted_original[display_cols].copy()
+        ranking_pages = page_cache("ranking")
+        df_to_display = ranking_pages.get(table_signature, page, build_ranking_page)
 
-        # Translate genre content to Korean + Emoji
-        df_to_display['primary_genre'] = df_to_display['primary_genre'].map(
-            lambda x: f"{genre_emoji_map.get(x, '📚')} {genre_kor_map.get(x, x)}" if pd.notna(x) else x
-        )
-        
-        # Translate column headers to Korean
-        df_to_display.columns = [display_labels.get(col, col) for col in df_to_display.columns]
-
-    
-        # Display the translated dataframe
+        # Display the translated dataframe (페이지가 바뀌면 이전 페이지의 행 선택이 남지 않도록 key에 페이지를 포함)
         selection = st.dataframe(
             df_to_display,
             height = 500, 
@@ -246,25 +349,31 @@ with col_rank:
             selection_mode="single-row",
             hide_index=True,
             use_container_width=True,
+            key=f"ranking_table_{abs(hash(table_signature))}_{page}",
             column_config={
                 "NYT 유사도": st.column_config.NumberColumn(format="%.2f"),
                 "IMDB 유사도": st.column_config.NumberColumn(format="%.2f"),
                 "종합 평가 점수": st.column_config.NumberColumn(format="%.2f"),
+                "순위 중앙값": st.column_config.NumberColumn(format="%.1f"),
             }
         )
 
-        # Get selected ISBN from the original sorted dataframe to ensure correctness
+        # 선택은 행 위치가 아닌 ISBN으로 보관 (정렬/페이지가 바뀌어도 같은 도서를 가리킴)
         if selection.selection.rows:
             selected_row_index = selection.selection.rows[0]
-            st.session_state.selected_book_isbn = df_sorted_original.iloc[selected_row_index]['ISBN']
+            st.session_state.selected_book_isbn = df_to_display['ISBN'].iloc[selected_row_index]
+
+        # 이전/다음 페이지를 미리 만들어 두어 페이지 이동 시 바로 그려지도록 함 (표를 보낸 뒤 실행)
+        ranking_pages.prefetch(table_signature, page, page_count(sorted_rows.size, RANKING_PAGE_SIZE), build_ranking_page)
     else:
         st.info("검색 또는 필터링 결과가 없습니다.")
 
 with col_detail:
     if st.session_state.selected_book_isbn:
-        book_data = df_ranked[df_ranked['ISBN'] == st.session_state.selected_book_isbn]
-        if not book_data.empty:
-            book = book_data.iloc[0]
+        # ISBN → 행 번호 조회 (전체 목록을 훑지 않음)
+        book_row = row_lookup(RANKED_FILE, 'ISBN').get(st.session_state.selected_book_isbn)
+        if book_row is not None:
+            book = df_ranked.iloc[book_row]
             image_url = book.get('image_url', '')
             title = book.get('제목', 'N/A')
             author = book.get('저자', 'N/A')
@@ -293,6 +402,15 @@ with col_detail:
                     <div class="details-card-desc">{description}</div>
                 </div>
             </div>""", unsafe_allow_html=True)
+
+            # 선택한 도서 한 권만 벡터화해 NYT 베스트셀러 근사 최근접 이웃 인덱스에서 조회 (전체 유사도 행렬을 계산하지 않음)
+            nyt_index = ann_index('data/nyt_bestseller_with_keyword.csv')
+            if len(nyt_index):
+                nyt_rows, nyt_scores = nyt_index.search(document_texts(df_ranked.iloc[[book_row]]), k=3)
+                st.markdown("**비슷한 NYT 베스트셀러** (소개·장르·키워드 문자 n-gram 유사도)")
+                for nyt_row, nyt_score in zip(nyt_rows[0], nyt_scores[0]):
+                    if nyt_row >= 0:
+                        st.markdown(f"- {df_nyb['title'].iloc[nyt_row]} · {nyt_score * 100:.1f}%")
     else:
         # --- CHANGE: Styled placeholder card ---
         with stylable_container(
@@ -398,7 +516,7 @@ def apply_kor_emoji_map(data_series, kor_map, emoji_map):
     )
 
 # --- 파이(도넛) 차트 함수 ---
-def plot_genre_pie(data, title, kor_map, emoji_map, color_map):
+def build_genre_pie(data, title, kor_map, emoji_map, color_map):
     mapped = apply_kor_emoji_map(data, kor_map, emoji_map)
     counts = mapped.value_counts().reset_index()
     counts.columns = ['category', 'count']
@@ -436,7 +554,13 @@ def plot_genre_pie(data, title, kor_map, emoji_map, color_map):
         insidetextorientation='horizontal',
         textfont_size=30
     )
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
+
+def plot_genre_pie(data, title, kor_map, emoji_map, color_map, source):
+    # figure는 (데이터셋 버전, 차트)마다 한 번만 만들고 테마는 템플릿만 덮어씀
+    key = figure_key("genre_pie", source, data.name, title)
+    spec = figure_cache().get(key, lambda: build_genre_pie(data, title, kor_map, emoji_map, color_map))
+    st.plotly_chart(themed(spec, theme_layout(st.session_state.theme, colors=False)), use_container_width=True)
 
 # --- 사용 예시 ---
 col_gen, col_nyt, col_imdb = st.columns([1, 1, 1], gap="large")
@@ -447,7 +571,8 @@ with col_gen:
         title=" ",
         kor_map=genre_kor_map,
         emoji_map=genre_emoji_map,
-        color_map=genre_color_map
+        color_map=genre_color_map,
+        source="흥행예측도서_ranked.csv"
     )
 with col_nyt:
     st.subheader("미국 인기 도서 장르 분포")
@@ -456,7 +581,8 @@ with col_nyt:
         title=" ",
         kor_map=genre_kor_map,
         emoji_map=genre_emoji_map,
-        color_map=genre_color_map
+        color_map=genre_color_map,
+        source="nyt_bestseller_with_keyword.csv"
     )
 with col_imdb:
     st.subheader("K-Contents 장르 분포")
@@ -465,5 +591,8 @@ with col_imdb:
         title=" ",
         kor_map=genre_kor_map_imdb,
         emoji_map=genre_emoji_map,
-        color_map=genre_color_map_imdb
+        color_map=genre_color_map_imdb,
+        source="imdb_llm_filtered_final.csv"
     )
+
+show_cache_stats(figure_cache())
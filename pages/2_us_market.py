@@ -4,24 +4,25 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-import json
-from collections import Counter
 import os
 from streamlit_extras.stylable_container import stylable_container
 
 # --- Import utility functions ---
 import sys
 sys.path.append('..')
-from utils.data_loader import load_data
+from utils.data_loader import dataset_version, load_data
+from utils.figures import chart_tabs, show_cache_stats, theme_layout, themed
+from utils.indexes import (bitmap_index, dashboard_kpis, distribution_cube, enriched_data, figure_cache, figure_key,
+                           persona_pairing)
+from utils.pagination import page_navigator
+from utils.preprocess import load_artifact, load_enriched
+from utils.reviews import cluster_emotion_counts, emotion_counts
 from utils.style import apply_custom_style
 
 # --- Page Config ---
 st.set_page_config(page_title="미국 도서시장 분석", page_icon="🇺🇸", layout="wide", initial_sidebar_state="expanded")
 if "theme" not in st.session_state: st.session_state.theme = "Light"
-apply_custom_style(st.session_state.theme)
-
-# --- Hide Default Nav ---
-st.markdown("<style>div[data-testid='stSidebarNav'] { display: none; }</style>", unsafe_allow_html=True)
+apply_custom_style(st.session_state.theme, pages=("us_market",))
 
 # --- Sidebar ---
 with st.sidebar:
@@ -34,41 +35,25 @@ with st.sidebar:
     st.divider()
 
 # --- Data Loading ---
-@st.cache_data
+# 세션마다 복사본을 만들지 않도록 전처리 결과를 프로세스 전체에서 공유하고, 세션에는 얕은 복사본만 전달
+US_MARKET_FILES = ('nyt_bestseller_with_keyword.csv', 'trans_final_with_url.csv', 'reviews_final_with_clusters.csv')
+
+@st.cache_resource(max_entries=2)
+def _load_all_data_shared(versions):
+    # versions(데이터셋 버전)는 캐시 키로만 사용: 원본이 바뀌면 다음 실행에서 다시 읽음
+    # 파생 컬럼은 utils.preprocess 산출물에서 바로 읽음 (산출물이 없을 때만 계산)
+    df_nyt = load_enriched('nyt_bestseller_with_keyword.csv')
+    df_trans = enriched_data('data/trans_final_with_url.csv')
+    # 리뷰 키워드는 (review_id, cluster, category, label) 긴 테이블로 읽고, 군집별 감정 빈도는 한 번만 집계
+    df_review_keywords = load_artifact('review_keywords')
+    df_emotion_counts = emotion_counts(df_review_keywords)
+    return df_nyt, df_trans, df_review_keywords, df_emotion_counts
+
 def load_all_data():
-    df_nyt = load_data('data/nyt_bestseller_with_keyword.csv')
-    df_trans = load_data('data/trans_final_with_url.csv')
-    df_reviews = load_data('data/reviews_final_with_clusters.csv')
-    
-    if not df_nyt.empty:
-        def extract_rating(s):
-            try: return float(s.split(' ')[0]) if isinstance(s, str) else None
-            except: return None
-        df_nyt['amazon_rating_numeric'] = df_nyt['amazon_rating'].apply(extract_rating)
-        def extract_review(s):
-            try: return int(s.replace(',', '').split(' ')[0]) if isinstance(s, str) else None
-            except: return None
-        df_nyt['review_count_numeric'] = df_nyt['amazon_review_count'].apply(extract_review)
-        df_nyt['rank_numeric'] = pd.to_numeric(df_nyt['rank'], errors='coerce')
-        df_nyt['weeks_on_list_numeric'] = pd.to_numeric(df_nyt['weeks_on_list'], errors='coerce')
-
-        def extract_primary(j):
-            try: return max(json.loads(j.replace("'", '"')), key=lambda k: float(json.loads(j.replace("'", '"'))[k])) if isinstance(j, str) else None
-            except: return None
-        json_cols = {'primary_plot': 'plot_elements', 'primary_character': 'character_types', 'primary_theme': 'theme_categories', 'primary_setting': 'setting_categories', 'primary_tone': 'tone_categories'}
-        for new, old in json_cols.items():
-            if old in df_nyt: df_nyt[new] = df_nyt[old].apply(extract_primary)
-            else: df_nyt[new] = None
-
-    if not df_reviews.empty:
-        def safe_json_load(s):
-            try: return json.loads(s.replace("'", '"')) if isinstance(s, str) else {}
-            except: return {}
-        df_reviews['parsed_keywords'] = df_reviews['parsed_keywords'].apply(safe_json_load)
-
-    return df_nyt, df_trans, df_reviews
-
-df_nyt, df_trans, df_reviews = load_all_data()
+    versions = tuple(dataset_version(f) for f in US_MARKET_FILES)
+    return tuple(df.copy(deep=False) for df in _load_all_data_shared(versions))
+
+df_nyt, df_trans, df_review_keywords, df_emotion_counts = load_all_data()
 df_book_korean = load_data('data/book_korean.csv')
 
 # --- PAGE START ---
@@ -86,24 +71,12 @@ if st.button("지표 설명 모두 보기/접기", key="us_expand"):
     st.session_state.expand_all_metrics = not st.session_state.expand_all_metrics
 
 # --- REVISED: Create a structured list of metrics ---
-if not df_trans.empty and not df_nyt.empty:
-    avg_sim_success = df_trans[df_trans['success'] == 1]['nyb_max_s'].mean()
-    avg_sim_fail = df_trans[df_trans['success'] == 0]['nyb_max_s'].mean()
-    avg_rating_success = df_trans[df_trans['success'] == 1]['amazon_rating_clean'].mean()
-    avg_rating_fail = df_trans[df_trans['success'] == 0]['amazon_rating_clean'].mean()
-    translated_count = df_trans['ISBN_K'].nunique()
-    review_count_success = df_trans[df_trans['success'] == 1]['amazon_review_count'].mean()
-    review_count_fail = df_trans[df_trans['success'] == 0]['amazon_review_count'].mean()
-    untranslated_count = df_book_korean['ISBN'].nunique()
-    total_books = translated_count + untranslated_count
-    translation_percentage = (translated_count / total_books) * 100 if total_books > 0 else 0
-else:
-    avg_sim_success, avg_sim_fail, avg_rating_success, avg_rating_fail = 0, 0, 0, 0
+kpi = dashboard_kpis()
 
 metrics = [
     {
         "label": "번역된 도서 비율",
-        "value": f"{translation_percentage:.2f}%",
+        "value": f"{kpi['translation_percentage']:.2f}%",
         "expander": """
         - **설명:** 전체 한국소설 중, 해외에 번역 출간된 도서의 비율입니다.
         - **의미:** 이 비율이 높을수록 K-소설의 해외 진출이 활발함을 의미합니다.
@@ -111,7 +84,7 @@ metrics = [
     },
     {
         "label": "NYT 베스트셀러 유사도 (흥행작)",
-        "value": f"{avg_sim_success:.2f} / 1",
+        "value": f"{kpi['avg_sim_success']:.2f} / 1",
         "expander": """
         - **설명:** 미국 시장에서 흥행에 성공한 K-소설과 NYT 베스트셀러 간의 평균 유사도입니다. **유사도**란 도서의 설명에 포함된 장르, 배경, 캐릭터, 분위기, 전개 등 도서 내용 및 의미가 유사한 정도를 수치화한 지수입니다.
         - **의미:** 미국 시장에서 흥행한 K-소설의 특징을 파악하는 데 활용됩니다.
@@ -119,7 +92,7 @@ metrics = [
     },
     {
         "label": "아마존 리뷰 수 평균 (흥행작)",
-        "value": f"{review_count_success:.0f}개",
+        "value": f"{kpi['review_count_success']:.0f}개",
         "expander": """
         - **설명:** 미국 아마존에서 흥행한 K-소설의 평균 리뷰 수입니다. 
         - **의미:** 현지 독자들의 관심을 보여주는 척도입니다.
@@ -127,7 +100,7 @@ metrics = [
     },
     {
         "label": "아마존 리뷰 수 (비흥행작)",
-        "value": f"{review_count_fail:.0f}개",
+        "value": f"{kpi['review_count_fail']:.0f}개",
         "expander": """
         - **설명:** 미국 아마존에서 흥행에 실패한 K-소설의 평균 리뷰 수입니다.
         - **의미:** 현지 독자들의 관심을 보여주는 척도입니다.
@@ -135,7 +108,7 @@ metrics = [
     },
     {
         "label": "아마존 리뷰 평균 (흥행작)",
-        "value": f"⭐{avg_rating_fail:.2f}점",
+        "value": f"⭐{kpi['avg_rating_fail']:.2f}점",
         "expander": """
         - **설명:** 흥행에 실패한 K-소설의 평균 독자 평점입니다. (5점 만점)
         - **의미:** 독자들의 낮은 평가 원인을 파악하는 데 참고할 수 있습니다.
@@ -251,18 +224,9 @@ with col_persona_main:
 with col_analysis_main:
     with stylable_container("radar_chart_card", css_styles=".content-card"):
         st.subheader("리뷰 감정분석")
-        if not df_reviews.empty:
-            cluster_df = df_reviews[df_reviews['cluster'] == selected_cluster_id_analysis]
-            emotion_counter = Counter()
-            for _, row in cluster_df.iterrows():
-                parsed = row.get('parsed_keywords', {})
-                if isinstance(parsed, dict):
-                    for key in ['emotions_positive', 'emotions_negative', 'emotions_complex']:
-                        if key in parsed and isinstance(parsed[key], dict):
-                            emotion_counter.update(parsed[key].keys())
-
+        if not df_review_keywords.empty:
             fixed_emotion_labels = ["love", "excitement", "delight", "appreciation", "satisfaction", "moved deeply", "conflicted", "roller coaster ride", "thought provoking", "memorable", "irritation", "annoyed", "dissatisfaction", "frustration", "disappointment"]
-            radar_data = {'Emotion': fixed_emotion_labels, 'Count': [emotion_counter.get(label, 0) for label in fixed_emotion_labels]}
+            radar_data = {'Emotion': fixed_emotion_labels, 'Count': cluster_emotion_counts(df_emotion_counts, selected_cluster_id_analysis, fixed_emotion_labels)}
             df_radar = pd.DataFrame(radar_data)
 
             if not df_radar.empty:
@@ -300,155 +264,30 @@ selected_persona_label_pairing = st.pills(
 if selected_persona_label_pairing != st.session_state.selected_persona_label_pairing:
     st.session_state.selected_persona_label_pairing = selected_persona_label_pairing
 
-df_similarity = load_data('data/cluster_Similarity.csv')
-
-if df_similarity is not None and not df_similarity.empty:
-    current_cluster_id_pairing = next(
-        (k for k, v in persona_data.items() if f"{v['emoji']} {v['name']}" == selected_persona_label_pairing), 0
-    )
-    persona_books = df_similarity[df_similarity['cluseter Index'] == current_cluster_id_pairing].head(5).reset_index(drop=True)
+PAIRING_PAGE_SIZE = 5
+current_cluster_id_pairing = next(
+    (k for k, v in persona_data.items() if f"{v['emoji']} {v['name']}" == selected_persona_label_pairing), 0
+)
+# 리뷰 군집별 독서 프로필(리뷰한 NYT 도서 벡터의 중심점)과 가장 비슷한 흥행예측도서를 찾아 페어링
+pairing = persona_pairing('data/reviews_final_with_clusters.csv', 'data/흥행예측도서_ranked.csv',
+                          'data/nyt_bestseller_with_keyword.csv')
+df_pairs = pairing.pairings(current_cluster_id_pairing) if pairing is not None else pd.DataFrame()
+if df_pairs.empty:
+    # 리뷰/도서 데이터로 프로필을 만들 수 없으면 오프라인에서 만든 페어링 파일을 사용
+    df_similarity = load_data('data/cluster_Similarity.csv')
+    if df_similarity is not None and not df_similarity.empty:
+        # 페르소나(군집)별 행은 비트맵 인덱스에서 바로 조회
+        persona_rows = bitmap_index('data/cluster_Similarity.csv', ['cluseter Index']).rows('cluseter Index', [current_cluster_id_pairing])
+        df_pairs = df_similarity.iloc[persona_rows]
+
+if not df_pairs.empty:
+    pairing_page = page_navigator(len(df_pairs), "pairing", PAIRING_PAGE_SIZE,
+                                  signature=(current_cluster_id_pairing, pairing and pairing.version))
+    persona_books = df_pairs.iloc[(pairing_page - 1) * PAIRING_PAGE_SIZE:pairing_page * PAIRING_PAGE_SIZE].reset_index(drop=True)
     persona_books['nyt_genre_kor'] = persona_books['nyt_genre'].map(genre_kor_map).fillna(persona_books['nyt_genre'])
     persona_books['pred_genre_kor'] = persona_books['pred_genre'].map(genre_kor_map).fillna(persona_books['pred_genre'])
 
     if not persona_books.empty:
-        # --- CSS ---
-        st.markdown("""
-        <style>
-        .book-pair-grid {
-            width: 100%;
-            display: flex;
-            flex-direction: column;
-            gap: 2.5rem;
-            align-items: center;
-            margin-bottom: 2.5rem;
-        }
-        .book-pair-row {
-            display: flex;
-            flex-direction: row;
-            justify-content: center;
-            gap: 2rem;
-            width: 100%;
-        }
-        .book-pair-card {
-            background: var(--secondary-background-color, #fff);
-            border-radius: 16px;
-            box-shadow: 0 4px 16px rgba(0,0,0,0.07);
-            border: 1px solid #e0e0e0;
-            width: 320px;
-            min-width: 300px;
-            max-width: 340px;
-            height: 260px;
-            display: flex;
-            flex-direction: column;
-            justify-content: center;
-            align-items: center;
-            padding: 0;
-            transition: box-shadow 0.2s;
-            position: relative;
-        }
-        .book-pair-card:hover {
-            box-shadow: 0 8px 24px rgba(0,0,0,0.12);
-        }
-        .pair-content {
-            display: flex;
-            flex-direction: row;
-            align-items: flex-start;
-            justify-content: space-between;
-            width: 94%;
-            height: 90%;
-            gap: 0.5rem;
-        }
-        .book-info {
-            width: 40%;
-            text-align: center;
-            display: flex;
-            flex-direction: column;
-            align-items: center;
-            justify-content: center;
-            height: 100%;
-        }
-        .book-info img {
-            width: 90px;
-            height: 130px;
-            object-fit: cover;
-            border-radius: 6px;
-            box-shadow: 0 1px 4px rgba(0,0,0,0.06);
-            margin-bottom: 0.5rem;
-        }
-        .book-title {
-            font-weight: bold;
-            font-size: 15px;
-            margin-bottom: 0.2rem;
-            margin-top: 0.1rem;
-            height: 38px;
-            line-height: 19px;
-            overflow: hidden;
-            text-overflow: ellipsis;
-            display: -webkit-box;
-            -webkit-line-clamp: 2;
-            -webkit-box-orient: vertical;
-        }
-        .book-genre {
-            font-size: 13px;
-            color: #888;
-            margin-bottom: 0.1rem;
-            margin-top: 0.1rem;
-        }
-        .similarity-connector {
-            flex: 1 1 0;
-            display: flex;
-            flex-direction: column;
-            align-items: center;
-            justify-content: center;
-            height: 100%;
-            min-width: 52px;
-            max-width: 52px;
-            position: relative;
-        }
-        .similarity-connector .dotted-line-top {
-            border-left: 2px dotted #bdbdbd;
-            height: 40px;
-            position: absolute;
-            left: 50%;
-            top: 0;
-            z-index: 0;
-            transform: translateX(-50%);
-        }
-        .similarity-connector .dotted-line-bottom {
-            border-left: 2px dotted #bdbdbd;
-            height: 40px;
-            position: absolute;
-            left: 50%;
-            bottom: 0;
-            z-index: 0;
-            transform: translateX(-50%);
-        }
-        .similarity-text {
-            background: var(--secondary-background-color, #fff);
-            position: relative;
-            z-index: 1;
-            text-align: center;
-            padding: 1px 0;
-            margin-bottom: 2px;
-            margin-top: 2px;
-        }
-        .similarity-label {
-            font-size: 13px;
-            color: #888;
-            margin-bottom: 1px;
-        }
-        .similarity-value {
-            font-size: 17px;
-            font-weight: bold;
-            color: var(--primary-color, #588157);
-        }
-        @media (max-width: 1100px) {
-            .book-pair-row { flex-direction: column; align-items: center; }
-            .book-pair-card { width: 95vw; min-width: 0; max-width: 98vw; margin-bottom: 1.2rem;}
-        }
-        </style>
-        """, unsafe_allow_html=True)
-
         # --- HTML ---
         html_rows = []
         # First row: up to 3 cards
@@ -515,10 +354,11 @@ if df_similarity is not None and not df_similarity.empty:
             {''.join(html_rows)}
         </div>
         """)
+
     else:
         st.info(f"선택된 페르소나({selected_persona_label_pairing})에 대한 추천 도서 페어링 데이터가 없습니다.")
 else:
-    st.warning("도서 페어링 데이터(`data/cluster_Similarity.csv`)를 찾을 수 없습니다.")
+    st.warning(f"선택된 페르소나({selected_persona_label_pairing})에 대한 도서 페어링 데이터(리뷰·도서 목록 또는 `data/cluster_Similarity.csv`)를 찾을 수 없습니다.")
 
 
 # --- SECTION 2: Bestseller Feature Analysis ---
@@ -630,49 +470,55 @@ analysis_map = {
 
 if not df_nyt.empty:
     selected_category = st.radio("분석 카테고리 선택", options=analysis_map.keys(), horizontal=True, key="nyt_feature_filter")
-    config = analysis_map[selected_category]
-    data_series = df_nyt.get(config["col"])
+    # 카테고리별 라벨 분포와 표시용 라벨(이모지 + 한글명)은 데이터셋 버전마다 한 번만 집계
+    cube = distribution_cube("nyt_bestseller_with_keyword.csv", analysis_map, default_emoji="📝")
+    distribution = cube.distribution(selected_category)
 
     # --- Step 3: Modify each chart function to accept and use the Korean map ---
-    def create_donut_chart(data_series, title_text, theme, kor_map, emoji_map):
-        if data_series.dropna().empty: return
-        counts = data_series.value_counts().reset_index()
-        counts.columns = ['category', 'count']
-        # Translate labels to Korean
-        counts['category'] = counts['category'].apply(lambda x: f"{emoji_map.get(x, '📝')} {kor_map.get(x, x)}")
+    # 테마와 무관한 figure만 만들고 (템플릿은 utils.figures.themed로 덮어씀) 데이터가 없으면 None
+    def build_donut_chart(distribution, title_text):
+        if distribution.empty: return None
+        counts = distribution[['display', 'count']].rename(columns={'display': 'category'})
         total = counts['count'].sum()
-        fig = px.pie(counts, values='count', names='category', title=f"{title_text} 분포", hole=0.4, template="plotly_white" if theme == "Light" else "plotly_dark")
+        fig = px.pie(counts, values='count', names='category', title=f"{title_text} 분포", hole=0.4)
         fig.update_traces(textposition='inside', textinfo='percent', insidetextorientation='radial')
         fig.update_layout(annotations=[dict(text=f'전체<br>{total}', x=0.5, y=0.5, font_size=20, showarrow=False)], showlegend=True, legend=dict(title=title_text, yanchor="top", y=1, xanchor="left", x=1.05))
-        st.plotly_chart(fig, use_container_width=True)
+        return fig
 
-    def create_treemap_chart(data_series, title_text, emoji_map, theme, kor_map):
-        if data_series.dropna().empty: return
-        counts = Counter(data_series.dropna().astype(str))
-        df_treemap = pd.DataFrame(counts.items(), columns=['label', 'value'])
+    def build_treemap_chart(distribution, title_text):
+        if distribution.empty: return None
         # Translate labels to "Emoji + Korean Name"
-        df_treemap['formatted_label'] = df_treemap['label'].apply(lambda x: f"{emoji_map.get(x, '📝')}<br>{kor_map.get(x, x)}")
+        df_treemap = pd.DataFrame({
+            'label': distribution['label'],
+            'value': distribution['count'],
+            'formatted_label': distribution['emoji'] + "<br>" + distribution['name'],
+        })
         fig = px.treemap(df_treemap, path=[px.Constant("all"), 'formatted_label'], values='value', color='label', color_discrete_sequence=px.colors.qualitative.Pastel, hover_data={'value': ':,.0f'})
         fig.update_traces(textposition='middle center', textinfo='label+value', insidetextfont=dict(size=18, color='#333333'), marker=dict(cornerradius=5, line=dict(width=2, color='white')))
         fig.update_layout(title=f"{title_text} 분포", margin=dict(t=40, l=10, r=10, b=10), paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)', showlegend=False)
-        st.plotly_chart(fig, use_container_width=True)
-
-    def create_bubble_chart(data_series, title_text, theme, kor_map, emoji_map):
-        if data_series.dropna().empty: return
-        counts = data_series.value_counts().reset_index()
-        counts.columns = ['category', 'count']
-        # Translate labels to Korean
-        counts['category'] = counts['category'].apply(lambda x: f"{emoji_map.get(x, '📝')} {kor_map.get(x, x)}")
-        fig = px.scatter(counts, x='category', y='count', size='count', color='category', title=f"{title_text} 분포", size_max=60, template="plotly_white" if theme == "Light" else "plotly_dark", labels={'category': title_text, 'count': '등장 횟수'})
-        st.plotly_chart(fig, use_container_width=True)
-
-    tab_donut, tab_treemap, tab_bubble = st.tabs(["도넛 차트", "트리맵", "버블 차트"])
-    with tab_donut:
-        create_donut_chart(data_series, selected_category, st.session_state.theme, config["kor"], config["emoji"])
-    with tab_treemap:
-        create_treemap_chart(data_series, selected_category, config["emoji"], st.session_state.theme, config["kor"])
-    with tab_bubble:
-        create_bubble_chart(data_series, selected_category, st.session_state.theme, config["kor"], config["emoji"])
+        return fig
+
+    def build_bubble_chart(distribution, title_text):
+        if distribution.empty: return None
+        counts = distribution[['display', 'count']].rename(columns={'display': 'category'})
+        fig = px.scatter(counts, x='category', y='count', size='count', color='category', title=f"{title_text} 분포", size_max=60, labels={'category': title_text, 'count': '등장 횟수'})
+        return fig
+
+    def plot_cached_chart(chart, build, theme):
+        # (데이터셋 버전, 분석 카테고리, 차트 종류)마다 한 번만 만들고 재실행 시에는 캐시된 figure에 테마만 적용
+        key = figure_key(chart, "nyt_bestseller_with_keyword.csv", selected_category)
+        spec = figure_cache().get(key, build)
+        if spec is not None:
+            st.plotly_chart(themed(spec, theme_layout(theme, colors=False)), use_container_width=True)
+
+    # 선택한 차트만 만들어 보냄 (다른 차트는 탭을 열 때 계산되고 이후에는 figure 캐시에서 꺼냄)
+    selected_chart = chart_tabs(["도넛 차트", "트리맵", "버블 차트"], key="nyt_chart_tab")
+    if selected_chart == "도넛 차트":
+        plot_cached_chart("donut", lambda: build_donut_chart(distribution, selected_category), st.session_state.theme)
+    elif selected_chart == "트리맵":
+        plot_cached_chart("treemap", lambda: build_treemap_chart(distribution, selected_category), st.session_state.theme)
+    else:
+        plot_cached_chart("bubble", lambda: build_bubble_chart(distribution, selected_category), st.session_state.theme)
 else:
     st.warning("NYT 베스트셀러 데이터(`nyt_bestseller_with_keyword.csv`)를 찾을 수 없습니다.")
 st.divider()
@@ -734,3 +580,5 @@ with col_right:
             fig.update_layout(yaxis_title="언급 횟수", xaxis_title="마케팅 유형", paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)')
             st.plotly_chart(fig, use_container_width=True)
 st.divider()
+
+show_cache_stats(figure_cache())
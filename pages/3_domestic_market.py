@@ -3,10 +3,11 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 from streamlit_extras.stylable_container import stylable_container
-from collections import Counter
 
 # 데이터 로딩 및 스타일 함수는 프로젝트 환경에 맞게 import
 from utils.data_loader import load_data
+from utils.figures import chart_tabs, show_cache_stats, theme_layout, themed
+from utils.indexes import dashboard_kpis, distribution_cube, enriched_data, figure_cache, figure_key
 from utils.style import apply_custom_style
 
 # --- 1. 테마 상태 및 스타일 적용 ---
@@ -20,73 +21,7 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-apply_custom_style(st.session_state.theme)
-
-# --- 2. CSS 스타일 및 네비게이션 숨김 ---
-st.markdown("""
-<style>
-div[data-testid="stSidebarNav"] { display: none; }
-.metric-card {
-    background: #F8F8F8;
-    border: 2px solid #588157;
-    color: #588157;
-    border-radius: 12px;
-    padding: 20px;
-    text-align: center;
-    margin: 5px;
-    position: relative;
-    min-height: 90px;
-}
-.metric-card-label {
-    font-size: 18px;
-}
-.metric-card-value {
-    font-size: 28px;
-    font-weight: bold;
-}
-.metric-tooltip {
-    visibility: hidden;
-    opacity: 0;
-    width: 400px;
-    background: #222;
-    color: #fff;
-    text-align: left;
-    border-radius: 8px;
-    padding: 8px 12px;
-    position: absolute;
-    z-index: 10;
-    left: 50%;
-    top: 110%;
-    transform: translateX(-50%);
-    transition: opacity 0.2s;
-    font-size: 0.95em;
-    pointer-events: none;
-    box-shadow: 0 2px 8px rgba(0,0,0,0.15);
-}
-.metric-card:hover .metric-tooltip {
-    visibility: visible;
-    opacity: 1;
-    pointer-events: auto;
-}
-.book-item-compact {
-    display: flex;
-    align-items: flex-start;
-    gap: 16px;
-    background: #f9f9f9;
-    border-radius: 14px;
-    padding: 14px 16px;
-    border: 1px solid #e0e0e0;
-    margin-bottom: 12px;
-}
-.book-image-small img {
-    width: 90px; height: auto; border-radius: 8px;
-    box-shadow: 0 2px 8px rgba(0,0,0,0.07);
-}
-.book-text-info { flex: 1; }
-.book-title { font-size: 1.1rem; font-weight: bold; margin-bottom: 2px; }
-.book-author, .book-bsr { font-size: 0.95rem; color: #666; }
-</style>
-""", unsafe_allow_html=True)
+apply_custom_style(st.session_state.theme, pages=("domestic_market",))
 
 # --- 3. 사이드바 ---
 with st.sidebar:
@@ -100,8 +35,8 @@ with st.sidebar:
 
 
 # --- 4. 데이터 로딩 ---
-df_ranked = load_data('data/흥행예측도서_ranked.csv')
-df_translated = load_data('data/trans_final_with_url.csv')
+df_ranked = enriched_data('data/흥행예측도서_ranked.csv')
+df_translated = enriched_data('data/trans_final_with_url.csv')
 df_book_korean = load_data('data/book_korean.csv')
 df_imdb = load_data('data/imdb_llm_filtered_final.csv')
 
@@ -123,36 +58,12 @@ if st.button("지표 설명 모두 보기/접기", key="domestic_expand"):
     st.session_state.expand_all_metrics = not st.session_state.expand_all_metrics
 
 # --- REVISED: Add expander content to the metrics list ---
-if not df_ranked.empty and not df_book_korean.empty:
-    avg_salespoint_success = df_ranked['salespoint'].mean()
-    hit_isbns = df_ranked['ISBN'].unique()
-    df_not_hit = df_book_korean[~df_book_korean['ISBN'].isin(hit_isbns)]
-    avg_salespoint_miss = df_not_hit['salespoint'].mean()
-    avg_salespoint_all = df_book_korean['salespoint'].mean()
-else:
-    avg_salespoint_success, avg_salespoint_miss, avg_salespoint_all = 0, 0, 0
-
-if not df_ranked.empty and not df_translated.empty and not df_book_korean.empty:
-    translated_count = df_translated['ISBN_K'].nunique()
-    untranslated_count = df_book_korean['ISBN'].nunique()
-    total_books = translated_count + untranslated_count
-    translation_percentage = (translated_count / total_books) * 100 if total_books > 0 else 0
-    avg_final_score = df_ranked['fuzzy_topsis_score'].mean()
-    avg_salespoint = df_translated['salespoint'].mean()
-    book_kor_salespoint = df_book_korean['salespoint'].mean()
-    translated_salespoint = df_translated['salespoint'].mean()
-    avg_similarity = df_translated['top_1_similarity'].mean()
-    trans_success = df_translated[df_translated['success'] == 1]['ISBN'].nunique()
-    trans_fail = df_translated[df_translated['success'] == 0]['ISBN'].nunique()
-    trans_success_percentage = (trans_success / (trans_success + trans_fail)) * 100
-    book_korean_imdb_maxs = df_book_korean['max_imdb_similarity'].mean()
-else:
-    translation_percentage, avg_final_score, avg_salespoint, avg_similarity = 0, 0, 0, 0
+kpi = dashboard_kpis()
 
 metrics = [
     {
         "label": "한국도서 해외 흥행률",
-        "value": f"{trans_success_percentage:.2f}%",
+        "value": f"{kpi['trans_success_percentage']:.2f}%",
         "expander": """
         - **설명:** 해외에서 인기도서로 선정된 한국도서를 Amazon BSR(아마존 베스트셀러 순위) 기준으로 평가한 지수입니다.
         - **의미:** 번역된 한국 도서 중 BSR 순위가 상위 10% 이내인 도서를 ‘해외 흥행’으로 간주합니다.
@@ -160,7 +71,7 @@ metrics = [
     },
     {
         "label": "한국도서 평균 판매지수",
-        "value": f"{book_kor_salespoint:.0f} pts",
+        "value": f"{kpi['book_kor_salespoint']:.0f} pts",
         "expander": """
         - **설명:** 알라딘에서 각 도서의 인기도와 판매 추이를 수치로 나타내는 고유한 판매 지수입니다.
         - **의미:** 판매지수가 높을수록 시장 반응이 좋음을 의미합니다.
@@ -168,7 +79,7 @@ metrics = [
     },
     {
         "label": "번역도서 평균 판매지수",
-        "value": f"{translated_salespoint:.0f} pts",
+        "value": f"{kpi['avg_salespoint']:.0f} pts",
         "expander": """
         - **설명:** 알라딘에서 각 도서의 인기도와 판매 추이를 수치로 나타내는 고유한 판매 지수입니다.
         - **의미:** 판매지수가 높을수록 시장 반응이 좋음을 의미합니다.
@@ -201,50 +112,6 @@ for i, metric in enumerate(metrics):
 
 # --- 7. 인기 도서 & 분석 ---
 
-# --- Step 1: Define the required CSS styles locally ---
-st.markdown("""
-<style>
-.bsr-book-card {
-    display: flex;
-    align-items: center;
-    padding: 1rem;
-    background-color: #FFFFFF;
-    border-radius: 12px;
-    box-shadow: 0 2px 8px rgba(0,0,0,0.06);
-    height: 168px; /* Increased height for more content */
-    border: 1px solid #f0f0f0;
-    margin-bottom: 1rem;
-}
-.bsr-book-image {
-    flex-shrink: 0;
-    width: 70px;
-    margin-right: 1.2rem;
-}
-.bsr-book-image img {
-    width: 100%;
-    height: 95px;
-    object-fit: cover;
-    border-radius: 4px;
-}
-.bsr-book-info {
-    flex-grow: 1;
-    overflow: hidden;
-}
-.bsr-book-title {
-    font-weight: bold;
-    font-size: 1em;
-    color: #2E2E2E;
-    margin-bottom: 0.3rem;
-    white-space: nowrap;
-    overflow: hidden;
-    text-overflow: ellipsis;
-}
-.bsr-book-author, .bsr-book-rank {
-    font-size: 0.9em;
-    color: #666666;
-}
-</style>
-""", unsafe_allow_html=True)
 
 
 col_bsr, col_trend = st.columns([1.4, 1], gap="large")
@@ -294,7 +161,7 @@ with col_trend:
         if author_col in df_book_korean.columns and 'salespoint' in df_book_korean.columns:
             author_sales = (
                 df_book_korean
-                .groupby(author_col)['salespoint']
+                .groupby(author_col, observed=True)['salespoint']
                 .sum()
                 .reset_index()
                 .sort_values(by='salespoint', ascending=False)
@@ -488,12 +355,12 @@ genre_emoji_map = {
 
 # --- 분석 카테고리 매핑 ---
 analysis_map = {
-    "장르": {"col": "primary_genre", "emoji": genre_kor_map},
-    "전개": {"col": "primary_plot", "emoji": plot_emoji_map},
-    "등장인물": {"col": "primary_character", "emoji": character_emoji_map},
-    "주제": {"col": "primary_theme", "emoji": theme_emoji_map},
-    "배경": {"col": "primary_setting", "emoji": setting_emoji_map},
-    "분위기": {"col": "primary_tone", "emoji": tone_emoji_map}
+    "장르": {"col": "primary_genre", "emoji": genre_emoji_map, "kor": genre_kor_map},
+    "전개": {"col": "primary_plot", "emoji": plot_emoji_map, "kor": plot_kor_map},
+    "등장인물": {"col": "primary_character", "emoji": character_emoji_map, "kor": character_kor_map},
+    "주제": {"col": "primary_theme", "emoji": theme_emoji_map, "kor": theme_kor_map},
+    "배경": {"col": "primary_setting", "emoji": setting_emoji_map, "kor": setting_kor_map},
+    "분위기": {"col": "primary_tone", "emoji": tone_emoji_map, "kor": tone_kor_map}
 }
 
 custom_palette = [
@@ -502,155 +369,74 @@ custom_palette = [
               "#FADBD8", "#F5CBA7", "#D2B4DE", "#A9CCE3", "#A3E4D7"
             ]
 
-# 카테고리별 한국어 mapping 
-# --- 한글+이모지 매핑 함수 ---
-def apply_kor_emoji_map(data_series, category):
-    kor_map_dict = {
-        "장르": genre_kor_map,
-        "전개": plot_kor_map,
-        "등장인물": character_kor_map,
-        "주제": theme_kor_map,
-        "배경": setting_kor_map,
-        "분위기": tone_kor_map
-    }
-    emoji_map_dict = {
-        "장르": genre_emoji_map,
-        "전개": plot_emoji_map,
-        "등장인물": character_emoji_map,
-        "주제": theme_emoji_map,
-        "배경": setting_emoji_map,
-        "분위기": tone_emoji_map
-    }
-    kor_map = kor_map_dict.get(category)
-    emoji_map = emoji_map_dict.get(category)
-    if kor_map is not None and emoji_map is not None:
-        return data_series.map(
-            lambda x: f"{emoji_map.get(x, '')} {kor_map.get(x, x)}" if pd.notna(x) else x
-        )
-    return data_series
-
 # --- 도넛 차트 함수 ---
-def create_donut_chart(data_series, title_text, theme, category=None):
-    # 한글+이모지 매핑 적용
-    if category:
-        data_series = apply_kor_emoji_map(data_series, category)
-    if data_series.dropna().empty:
-        st.info("분석할 데이터가 없습니다.")
-        return
-    counts = data_series.value_counts().reset_index()
-    counts.columns = ['category', 'count']
+# 차트 함수는 분포 큐브(utils.cube)의 라벨 분포로 테마와 무관한 figure만 만들고
+# (테마는 plot_cached_chart에서 덮어씀) 데이터가 없으면 None
+def build_donut_chart(distribution, title_text):
+    if distribution.empty:
+        return None
+    counts = distribution[['display', 'count']].rename(columns={'display': 'category'})
     total = counts['count'].sum()
     fig = px.pie(counts, values='count', names='category', title=f"{title_text} 분포", hole=0.4, color_discrete_sequence=custom_palette)
-    if theme == "Light":
-        fig.update_layout(
-            template="plotly_white",
-            paper_bgcolor='white',
-            plot_bgcolor='white',
-            font_color='black',
-            title_font_color='black',
-            legend_font_color='black',
-            annotations=[dict(text=f'전체<br>{total}', x=0.5, y=0.5, font_size=20, font_color='black', showarrow=False)]
-        )
-    else:
-        fig.update_layout(
-            width = 700,
-            height= 700,
-            template="plotly_dark",
-            paper_bgcolor='#262730',
-            plot_bgcolor='#262730',
-            font_color='white',
-            title_font_color='white',
-            legend_font_color='white',
-            annotations=[dict(text=f'전체<br>{total}', x=0.5, y=0.5, font_size=20, font_color='white', showarrow=False)]
-        )
     fig.update_traces(textposition='inside', textinfo='percent', insidetextorientation='radial')
     fig.update_layout(
+        annotations=[dict(text=f'전체<br>{total}', x=0.5, y=0.5, font_size=20, showarrow=False)],
         showlegend=True, legend=dict(title=title_text, yanchor="top", y=1, xanchor="left", x=1.05)
     )
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
 
 # --- 트리맵 차트 함수 ---
-def create_treemap_chart(data_series, title_text, emoji_map, theme, category=None):
-    if category:
-        data_series = apply_kor_emoji_map(data_series, category)
-    if data_series.dropna().empty:
-        st.info("분석할 데이터가 없습니다.")
-        return
-    counts = Counter(data_series.dropna().astype(str))
-    df_treemap = pd.DataFrame(counts.items(), columns=['label', 'value'])
+def build_treemap_chart(distribution, title_text):
+    if distribution.empty:
+        return None
+    df_treemap = pd.DataFrame({'label': distribution['display'], 'value': distribution['count']})
     df_treemap['formatted_label'] = df_treemap['label']
-    color_scale = px.colors.qualitative.Pastel
     fig = px.treemap(
         df_treemap, path=[px.Constant("전체"), 'formatted_label'], values='value',
         color='label', color_discrete_sequence=custom_palette, hover_data={'value': ':,.0f'}
     )
-    if theme == "Light":
-        fig.update_layout(
-            template="plotly_white",
-            paper_bgcolor='white',
-            plot_bgcolor='white',
-            font_color='black',
-            title_font_color='black'
-        )
-        fig.update_traces(
-            textposition='middle center', textinfo='label+value',
-            insidetextfont=dict(size=18, color='black'),
-            marker=dict(cornerradius=5, line=dict(width=2, color='white'))
-        )
-    else:
-        fig.update_layout(
-            template="plotly_dark",
-            paper_bgcolor='#262730',
-            plot_bgcolor='#262730',
-            font_color='white',
-            title_font_color='white'
-        )
-        fig.update_traces(
-            textposition='middle center', textinfo='label+value',
-            insidetextfont=dict(size=18, color='white'),
-            marker=dict(cornerradius=5, line=dict(width=2, color='white'))
-        )
+    fig.update_traces(
+        textposition='middle center', textinfo='label+value',
+        insidetextfont=dict(size=18),
+        marker=dict(cornerradius=5, line=dict(width=2, color='white'))
+    )
     fig.update_layout(
         title=f"{title_text} 분포", margin=dict(t=40, l=10, r=10, b=10),
         showlegend=False
     )
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
 
 # --- 버블 차트 함수 ---
-def create_bubble_chart(data_series, title_text, theme, emoji_map=None, category=None):
-    if category:
-        data_series = apply_kor_emoji_map(data_series, category)
-    if data_series.dropna().empty:
-        st.info("분석할 데이터가 없습니다.")
-        return
-    counts = data_series.value_counts().reset_index()
-    counts.columns = ['category', 'count']
+def build_bubble_chart(distribution, title_text):
+    if distribution.empty:
+        return None
+    counts = distribution[['display', 'count']].rename(columns={'display': 'category'})
     fig = px.scatter(
         counts, x='category', y='count', size='count', color='category',
         title=f"{title_text} 분포", size_max=60, color_discrete_sequence=custom_palette,
         labels={'category': title_text, 'count': '등장 횟수'}
     )
-    if theme == "Light":
-        fig.update_layout(
-            template="plotly_white",
-            paper_bgcolor='white',
-            plot_bgcolor='white',
-            font_color='black',
-            title_font_color='black'
-        )
-        fig.update_xaxes(tickfont_color='black', titlefont_color='black', title=title_text)
-        fig.update_yaxes(tickfont_color='black', titlefont_color='black', title='등장 횟수')
-    else:
-        fig.update_layout(
-            template="plotly_dark",
-            paper_bgcolor='#262730',
-            plot_bgcolor='#262730',
-            font_color='white',
-            title_font_color='white'
-        )
-        fig.update_xaxes(tickfont_color='white', titlefont_color='white', title=title_text)
-        fig.update_yaxes(tickfont_color='white', titlefont_color='white', title='등장 횟수')
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
+
+# --- 테마별 덮어쓰기 (배경/글자색은 utils.figures.theme_layout) ---
+chart_theme_overlays = {
+    "donut": {"Dark": {"layout": {"width": 700, "height": 700}}},
+    "treemap": {
+        "Light": {"traces": {"insidetextfont": {"color": "black"}}},
+        "Dark": {"traces": {"insidetextfont": {"color": "white"}}},
+    },
+}
+
+def plot_cached_chart(chart, build, theme, category, segment=None):
+    # (데이터셋 버전, 분석 카테고리, 조각, 차트 종류)마다 한 번만 만들고 재실행 시에는 캐시된 figure에 테마만 적용
+    key = figure_key(chart, "trans_final_with_url.csv", category, segment)
+    spec = figure_cache().get(key, build)
+    if spec is None:
+        st.info("분석할 데이터가 없습니다.")
+        return
+    overlay = chart_theme_overlays.get(chart, {}).get(theme, {})
+    layout = {**theme_layout(theme), **overlay.get("layout", {})}
+    st.plotly_chart(themed(spec, layout, overlay.get("traces")), use_container_width=True)
 
 # --- UI Layout for the new section ---
 if not df_translated.empty:
@@ -660,17 +446,30 @@ if not df_translated.empty:
         options=analysis_map.keys(),
         horizontal=True
     )
-    config = analysis_map[selected_category]
-    column_to_analyze = config["col"]
-    emoji_map = config["emoji"]
-    data_series = df_translated.get(column_to_analyze)
-
-    tab_donut, tab_treemap, tab_bubble = st.tabs(["도넛 차트", "트리맵", "버블 차트"])
-    with tab_donut:
-        create_donut_chart(data_series, selected_category, st.session_state.theme, category=selected_category)
-    with tab_treemap:
-        create_treemap_chart(data_series, selected_category, emoji_map, st.session_state.theme, category=selected_category)
-    with tab_bubble:
-        create_bubble_chart(data_series, selected_category, st.session_state.theme, category=selected_category)
+    # 카테고리별 라벨 분포는 데이터셋 버전마다 한 번만 집계 (흥행 여부별 분포 포함)
+    cube = distribution_cube("trans_final_with_url.csv", analysis_map)
+    success_segments = {"전체": None, "해외 흥행": 1, "비흥행": 0}
+    selected_segment = st.radio(
+        "대상 도서", options=success_segments.keys(), horizontal=True, key="trans_success_segment"
+    ) if "success" in cube.slices else "전체"
+    success_value = success_segments[selected_segment]
+    # 서로 다른 라벨이 같은 이모지 + 한글명으로 표시되면 한 항목으로 합쳐 표시
+    distribution = cube.distribution(
+        selected_category, "success" if success_value is not None else None, success_value, merge_display=True
+    )
+
+    # 선택한 차트만 만들어 보냄 (다른 차트는 탭을 열 때 계산되고 이후에는 figure 캐시에서 꺼냄)
+    selected_chart = chart_tabs(["도넛 차트", "트리맵", "버블 차트"], key="trans_chart_tab")
+    if selected_chart == "도넛 차트":
+        plot_cached_chart("donut", lambda: build_donut_chart(distribution, selected_category),
+                          st.session_state.theme, selected_category, selected_segment)
+    elif selected_chart == "트리맵":
+        plot_cached_chart("treemap", lambda: build_treemap_chart(distribution, selected_category),
+                          st.session_state.theme, selected_category, selected_segment)
+    else:
+        plot_cached_chart("bubble", lambda: build_bubble_chart(distribution, selected_category),
+                          st.session_state.theme, selected_category, selected_segment)
 else:
-    st.warning("번역 도서 데이터(`trans_final_with_url.csv`)를 찾을 수 없어 분석을 표시할 수 없습니다.")
\ No newline at end of file
+    st.warning("번역 도서 데이터(`trans_final_with_url.csv`)를 찾을 수 없어 분석을 표시할 수 없습니다.")
+
+show_cache_stats(figure_cache())
@@ -0,0 +1,48 @@
+# tests/test_bitmaps.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.bitmaps import BitmapIndex, combine_masks
+
+# 8의 배수가 아닌 행 수로 마지막 바이트의 남는 비트도 확인
+DF = pd.DataFrame({
+    "primary_genre": pd.Categorical(
+        ["Romance", "Fantasy", None, "Thriller", "Romance", "Fantasy", "Fantasy", None, "Thriller", "Romance", "SF"]),
+    "cluster": [0, 1, 2, 0, 1, 2, 0, 1, 2, 0, 3],
+})
+
+
+@pytest.mark.parametrize("values", [["Romance"], ["Romance", "Thriller"], ["SF", "Fantasy", "Romance", "Thriller"],
+                                    ["Unknown"], ["Fantasy", "Unknown"]])
+def test_or_of_values_matches_isin(values):
+    index = BitmapIndex(DF, ["primary_genre"])
+    expected = DF["primary_genre"].isin(values).to_numpy()
+    np.testing.assert_array_equal(index.mask("primary_genre", values), expected)
+    assert index.rows("primary_genre", values).tolist() == np.flatnonzero(expected).tolist()
+    assert index.count("primary_genre", values) == expected.sum()
+    assert index.bitmap("primary_genre", values).size == (len(DF) + 7) // 8
+
+
+def test_and_across_columns_matches_pandas_mask():
+    index = BitmapIndex(DF, ["primary_genre", "cluster"])
+    search = np.arange(len(DF)) % 3 != 1
+    combined = combine_masks(index.mask("primary_genre", ["Romance", "Fantasy"]), index.mask("cluster", [0, 2]),
+                             None, search)
+    expected = DF["primary_genre"].isin(["Romance", "Fantasy"]) & DF["cluster"].isin([0, 2]) & search
+    np.testing.assert_array_equal(combined, expected.to_numpy())
+
+
+def test_empty_selection_means_no_filter():
+    index = BitmapIndex(DF, ["primary_genre"])
+    assert index.mask("primary_genre", []) is None
+    assert combine_masks(None, None) is None
+    mask = np.arange(len(DF)) < 4
+    assert combine_masks(None, mask) is mask
+
+
+def test_values_are_sorted_and_exclude_missing():
+    index = BitmapIndex(DF, ["primary_genre", "cluster", "missing"])
+    assert index.values("primary_genre") == ["Fantasy", "Romance", "SF", "Thriller"]
+    assert index.values("cluster") == [0, 1, 2, 3]
+    assert "missing" not in index and index.values("missing") == []
@@ -0,0 +1,68 @@
+# tests/test_cube.py
+import numpy as np
+import pandas as pd
+
+from utils.cube import DistributionCube
+
+GENRE_EMOJI = {"Romance": "💕", "Love Story": "💕", "Thriller": "🔪", "Fantasy": "🐉"}
+GENRE_KOR = {"Romance": "로맨스", "Love Story": "로맨스", "Thriller": "스릴러", "Fantasy": "판타지"}
+FACETS = {
+    "장르": {"col": "primary_genre", "emoji": GENRE_EMOJI, "kor": GENRE_KOR},
+    "분위기": {"col": "primary_tone", "emoji": {}, "kor": {"dark": "어두움"}},
+    "없음": {"col": "missing_column"},
+}
+DF = pd.DataFrame({
+    "primary_genre": ["Romance", "Thriller", "Love Story", None, "Fantasy", "Romance", "Mystery", "Love Story",
+                      "Thriller", "Romance"],
+    "primary_tone": ["dark", "light", "dark", "dark", None, "warm", "light", "dark", "warm", "dark"],
+    "success": pd.array([1, 0, 1, 1, 0, None, 1, 0, 0, 1], dtype="Int8"),
+})
+
+
+def _old_display_counts(series, config, default_emoji=""):
+    """리팩터링 전 페이지 방식: 행마다 '이모지 한글명'으로 바꾼 뒤 value_counts."""
+    emoji_map, kor_map = config.get("emoji") or {}, config.get("kor") or {}
+    display = series.map(lambda x: f"{emoji_map.get(x, default_emoji)} {kor_map.get(x, x)}" if pd.notna(x) else x)
+    return display.value_counts()
+
+
+def _assert_same_counts(table, expected):
+    assert dict(zip(table["display"], table["count"])) == expected.to_dict()
+    assert np.all(np.diff(table["count"].to_numpy()) <= 0)
+
+
+def test_merge_display_matches_pre_refactor_label_merging():
+    cube = DistributionCube(DF, FACETS, default_emoji="📝")
+    for facet in ("장르", "분위기"):
+        expected = _old_display_counts(DF[FACETS[facet]["col"]], FACETS[facet], "📝")
+        _assert_same_counts(cube.distribution(facet, merge_display=True), expected)
+    # 'Romance'와 'Love Story'는 같은 '💕 로맨스'로 표시되어 한 항목(3 + 2)으로 합쳐짐
+    merged = cube.distribution("장르", merge_display=True)
+    assert merged.iloc[0][["display", "count", "label"]].tolist() == ["💕 로맨스", 5, "Romance"]
+    assert "📝 Mystery" in merged["display"].tolist()
+
+
+def test_slices_match_filtered_value_counts():
+    cube = DistributionCube(DF, FACETS)
+    assert cube.slices == ["success", "primary_genre"] and cube.slice_values("success") == [0, 1]
+    for value in (0, 1):
+        subset = DF[DF["success"] == value]
+        expected = _old_display_counts(subset["primary_genre"], FACETS["장르"])
+        _assert_same_counts(cube.distribution("장르", "success", value, merge_display=True), expected)
+        raw = cube.distribution("분위기", "success", value)
+        assert dict(zip(raw["label"], raw["count"])) == subset["primary_tone"].value_counts().to_dict()
+
+
+def test_unmerged_distribution_keeps_each_label():
+    table = DistributionCube(DF, FACETS).distribution("장르")
+    assert dict(zip(table["label"], table["count"])) == DF["primary_genre"].value_counts().to_dict()
+    assert table.loc[table["label"] == "Love Story", "display"].item() == "💕 로맨스"
+
+
+def test_unknown_facet_or_slice_is_empty():
+    cube = DistributionCube(DF, FACETS)
+    assert cube.distribution("없음").empty
+    assert cube.distribution("장르", "success", 7).empty
+    assert cube.slice_values("absent") == []
+    # 조각 컬럼 없이 slice_value만 주면 전체 분포
+    assert cube.distribution("장르", None, 1).equals(cube.distribution("장르"))
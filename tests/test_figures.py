@@ -0,0 +1,51 @@
+# tests/test_figures.py
+import plotly.graph_objects as go
+
+from utils import indexes
+from utils.figures import FigureCache, themed
+
+
+def _figure(value):
+    return go.Figure(go.Bar(x=["a"], y=[value]))
+
+
+def test_figure_key_changes_with_dataset_version(monkeypatch):
+    versions = {"trans_final_with_url.csv": "v1"}
+    monkeypatch.setattr(indexes, "dataset_version", lambda name: versions[name])
+    key = indexes.figure_key("donut", "data/trans_final_with_url.csv", "장르", None)
+    assert key == ("donut", "trans_final_with_url.csv", "v1", "장르", None)
+    assert indexes.figure_key("donut", "trans_final_with_url.csv", "장르", None) == key
+    versions["trans_final_with_url.csv"] = "v2"
+    assert indexes.figure_key("donut", "trans_final_with_url.csv", "장르", None) != key
+
+
+def test_new_dataset_version_rebuilds_figure(monkeypatch):
+    versions = {"nyt_bestseller_with_keyword.csv": "v1"}
+    monkeypatch.setattr(indexes, "dataset_version", lambda name: versions[name])
+    cache, built = FigureCache(), []
+
+    def build():
+        built.append(versions["nyt_bestseller_with_keyword.csv"])
+        return _figure(len(built))
+
+    def get():
+        return cache.get(indexes.figure_key("bubble", "nyt_bestseller_with_keyword.csv", "장르"), build)
+
+    assert get()["data"][0]["y"] == [1]
+    assert get()["data"][0]["y"] == [1]
+    versions["nyt_bestseller_with_keyword.csv"] = "v2"
+    assert get()["data"][0]["y"] == [2]
+    assert built == ["v1", "v2"]
+    assert cache.stats() == {"hits": 1, "misses": 2, "hit_rate": 1 / 3, "entries": 2}
+
+
+def test_cached_spec_is_a_fresh_dict_and_cache_is_bounded():
+    cache = FigureCache(max_entries=2)
+    spec = cache.get("a", lambda: _figure(1))
+    themed(spec, {"paper_bgcolor": "black"})
+    assert "paper_bgcolor" not in cache.get("a", lambda: None).get("layout", {})
+    assert cache.get("none", lambda: None) is None
+    cache.get("b", lambda: _figure(2))
+    cache.get("c", lambda: _figure(3))
+    assert cache.stats()["entries"] == 2
+    assert cache.get("a", lambda: None) is None
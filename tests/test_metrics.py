@@ -0,0 +1,93 @@
+# tests/test_metrics.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.metrics import DatasetMetrics, dashboard_kpis
+
+RANKED = pd.DataFrame({
+    "ISBN": ["k1", "k2", "k2", "k3"],
+    "salespoint": pd.array([100.0, 250.0, np.nan, 40.0], dtype="float32"),
+    "nyb_max_s": pd.array([0.4, 0.7, 0.2, np.nan], dtype="float32"),
+    "fuzzy_topsis_score": pd.array([0.61, 0.48, 0.52, 0.33], dtype="float32"),
+})
+TRANSLATED = pd.DataFrame({
+    "ISBN_K": ["k1", "k4", "k5", "k5", "k6", "k7"],
+    "ISBN": ["e1", "e4", "e5", "e6", "e7", "e8"],
+    "success": pd.array([1, 0, 1, 1, None, 0], dtype="Int8"),
+    "salespoint": pd.array([90.0, 20.0, np.nan, 300.0, 55.0, 10.0], dtype="float32"),
+    "top_1_similarity": pd.array([0.3, 0.5, 0.6, np.nan, 0.2, 0.1], dtype="float32"),
+    "nyb_max_s": pd.array([0.35, 0.55, 0.65, 0.8, np.nan, 0.15], dtype="float32"),
+    "amazon_rating_clean": pd.array([4.5, 3.9, np.nan, 4.8, 4.0, 3.1], dtype="float32"),
+    "amazon_review_count": pd.array([120, 8, 40, 900, np.nan, 2], dtype="float32"),
+})
+KOREAN = pd.DataFrame({
+    "ISBN": ["k1", "k8", "k9", "k9", "k10"],
+    "salespoint": pd.array([100.0, 10.0, 30.0, np.nan, 5.0], dtype="float32"),
+    "max_imdb_similarity": pd.array([0.2, np.nan, 0.4, 0.6, 0.1], dtype="float32"),
+})
+
+
+def _direct_kpis(df_ranked, df_translated, df_book_korean):
+    """대시보드 페이지가 DataFrame에서 바로 계산하던 방식 그대로."""
+    success, fail = df_translated[df_translated["success"] == 1], df_translated[df_translated["success"] == 0]
+    translated_count = df_translated["ISBN_K"].nunique()
+    untranslated_count = df_book_korean["ISBN"].nunique()
+    success_count = df_ranked["ISBN"].nunique()
+    trans_success, trans_fail = success["ISBN"].nunique(), fail["ISBN"].nunique()
+    return {
+        "translated_count": translated_count,
+        "untranslated_count": untranslated_count,
+        "total_books": translated_count + untranslated_count,
+        "translation_percentage": translated_count / (translated_count + untranslated_count) * 100,
+        "success_count": success_count,
+        "success_percentage": success_count / (success_count + untranslated_count) * 100,
+        "avg_final_score": df_ranked["fuzzy_topsis_score"].mean(),
+        "success_salespoint": df_ranked["salespoint"].mean(),
+        "success_nyb_max_s": df_ranked["nyb_max_s"].mean(),
+        "avg_salespoint": df_translated["salespoint"].mean(),
+        "avg_similarity": df_translated["top_1_similarity"].mean(),
+        "avg_sim_success": success["nyb_max_s"].mean(),
+        "avg_sim_fail": fail["nyb_max_s"].mean(),
+        "avg_rating_success": success["amazon_rating_clean"].mean(),
+        "avg_rating_fail": fail["amazon_rating_clean"].mean(),
+        "review_count_success": success["amazon_review_count"].mean(),
+        "review_count_fail": fail["amazon_review_count"].mean(),
+        "trans_success": trans_success,
+        "trans_fail": trans_fail,
+        "trans_success_percentage": trans_success / (trans_success + trans_fail) * 100,
+        "book_kor_salespoint": df_book_korean["salespoint"].mean(),
+        "book_korean_imdb_maxs": df_book_korean["max_imdb_similarity"].mean(),
+    }
+
+
+def test_cached_kpis_equal_direct_pandas_aggregation():
+    kpis = dashboard_kpis(DatasetMetrics.from_spec(RANKED, "흥행예측도서_ranked.csv"),
+                          DatasetMetrics.from_spec(TRANSLATED, "data/trans_final_with_url.csv"),
+                          DatasetMetrics.from_spec(KOREAN, "book_korean.csv"))
+    for key, expected in _direct_kpis(RANKED, TRANSLATED, KOREAN).items():
+        assert kpis[key] == pytest.approx(float(expected), rel=1e-6), key
+    assert np.isnan(kpis["avg_salespoint_miss"])
+
+
+def test_segment_means_match_groupby_and_totals_include_missing_segments():
+    metrics = DatasetMetrics(TRANSLATED, mean=["salespoint", "nyb_max_s"], distinct=["ISBN_K"], segments=["success"])
+    grouped = TRANSLATED.groupby("success")
+    for value in (0, 1):
+        assert metrics.mean("salespoint", "success", value) == pytest.approx(grouped["salespoint"].mean()[value])
+        assert metrics.count("success", value) == grouped.size()[value]
+        assert metrics.nunique("ISBN_K", "success", value) == grouped["ISBN_K"].nunique()[value]
+    # 흥행 여부가 결측인 행도 전체 평균에는 포함
+    assert metrics.mean("nyb_max_s") == pytest.approx(TRANSLATED["nyb_max_s"].mean())
+    assert metrics.mean("salespoint") == pytest.approx(TRANSLATED["salespoint"].mean())
+    assert metrics.nunique("ISBN_K") == TRANSLATED["ISBN_K"].nunique()
+
+
+def test_unknown_columns_segments_and_values():
+    metrics = DatasetMetrics(TRANSLATED, mean=["salespoint", "absent"], segments=["success", "absent"])
+    assert np.isnan(metrics.mean("absent"))
+    assert np.isnan(metrics.mean("salespoint", "absent", 1))
+    assert np.isnan(metrics.mean("salespoint", "success", 7))
+    assert metrics.count("success", 7) == 0 and metrics.nunique("ISBN") == 0
+    empty = DatasetMetrics(TRANSLATED.iloc[:0], mean=["salespoint"], segments=["success"])
+    assert empty.count() == 0 and np.isnan(empty.mean("salespoint"))
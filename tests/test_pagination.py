@@ -0,0 +1,52 @@
+# tests/test_pagination.py
+import numpy as np
+
+from utils.pagination import PAGE_CACHE_SIZE, PageCache, page_count, page_rows
+
+
+def test_page_cache_evicts_least_recently_used_beyond_capacity():
+    cache, built = PageCache(), []
+
+    def build(page):
+        built.append(page)
+        return f"page {page}"
+
+    for page in range(1, PAGE_CACHE_SIZE + 1):
+        cache.get("sig", page, build)
+    # 1페이지를 다시 보면 가장 최근으로 옮겨지고, 다음 새 페이지는 가장 오래된 2페이지를 밀어냄
+    assert cache.get("sig", 1, build) == "page 1"
+    cache.get("sig", PAGE_CACHE_SIZE + 1, build)
+    assert len(cache._frames) == PAGE_CACHE_SIZE == 8
+    assert ("sig", 2) not in cache._frames and ("sig", 1) in cache._frames
+
+    built.clear()
+    cache.get("sig", 2, build)
+    cache.get("sig", 1, build)
+    assert built == [2]
+
+
+def test_page_cache_stays_bounded_across_signatures_and_prefetch():
+    cache = PageCache()
+    for signature in range(5):
+        for page in range(1, 4):
+            cache.get(signature, page, str)
+            cache.prefetch(signature, page, 3, str)
+            assert len(cache._frames) <= PAGE_CACHE_SIZE
+    # 같은 페이지 번호라도 signature가 다르면 다른 항목
+    assert cache.get(4, 1, lambda page: "new") == "1"
+    assert cache.get("other", 1, lambda page: "new") == "new"
+
+
+def test_prefetch_builds_only_existing_neighbours():
+    cache = PageCache()
+    cache.prefetch("sig", 1, 1, str)
+    assert not cache._frames
+    cache.prefetch("sig", 2, 3, str)
+    assert set(cache._frames) == {("sig", 1), ("sig", 3)}
+
+
+def test_page_rows_and_count():
+    rows = np.arange(45, dtype=np.int32)
+    assert page_count(0) == 1 and page_count(45) == 3
+    assert page_rows(rows, 3).tolist() == list(range(40, 45))
+    assert page_rows(rows, 1).base is rows
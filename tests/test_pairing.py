@@ -0,0 +1,107 @@
+# tests/test_pairing.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils import indexes
+from utils.ann import AnnIndex
+from utils.pairing import PAIRING_COLUMNS, PersonaPairing
+
+KOREAN = pd.DataFrame({
+    "제목": ["마법사의 탑", "용의 계곡", "파리의 연인", "서울 연애", "살인자의 기억", "형사의 밤"],
+    "image_url": [f"k{i}.jpg" for i in range(6)],
+    "primary_genre": ["Fantasy", "Fantasy", "Romance", "Romance", "Thriller", "Thriller"],
+    "description": ["a young wizard in a tower", "a dragon guards the valley", "two lovers in paris",
+                    "lovers in seoul", "a killer loses memory", "a detective at night hunts a killer"],
+})
+NYT = pd.DataFrame({
+    "title": ["Wizard", "Paris Love", "Night Killer", "Dragon Song"],
+    "book_image": [f"n{i}.jpg" for i in range(4)],
+    "primary_genre": ["Fantasy", "Romance", "Thriller", "Fantasy"],
+    "description": ["a wizard school", "lovers meet in paris", "a detective hunts a killer", "a dragon and a song"],
+})
+REVIEWS = pd.DataFrame({
+    "review_id": [1, 2, 3, 4, 5, 6],
+    "title": ["Wizard", "Dragon Song", "Wizard", "Paris Love", "Night Killer", "Unknown"],
+    "cluster": [0, 0, 0, 1, 2, 1],
+})
+
+
+def _pairing(reviews=REVIEWS):
+    pairing = PersonaPairing(AnnIndex.from_frame(KOREAN), KOREAN, NYT)
+    pairing.sync(reviews)
+    return pairing
+
+
+def _assert_same_counts(pairing, other):
+    assert set(pairing.clusters()) == set(other.clusters())
+    for cluster in other.clusters():
+        np.testing.assert_array_equal(pairing._counts[cluster], other._counts[cluster])
+
+
+def test_appended_reviews_update_only_touched_clusters():
+    pairing = _pairing(REVIEWS.iloc[:4])
+    cached = {cluster: pairing.pairings(cluster) for cluster in pairing.clusters()}
+    appended = pd.concat([REVIEWS, pd.DataFrame({"review_id": [7], "title": ["Dragon Song"], "cluster": [0]})],
+                         ignore_index=True)
+    added = []
+    original_add = pairing._add
+    pairing._add = lambda df: added.append(df["review_id"].tolist()) or original_add(df)
+    pairing.sync(appended)
+    # 앞부분이 그대로면 뒤에 붙은 리뷰만 더하고, 프로필이 바뀌지 않은 군집(목록에 없는 제목만 추가)의 결과는 재사용
+    assert added == [[5, 6, 7]]
+    assert pairing.pairings(1) is cached[1]
+    assert pairing.pairings(0) is not cached[0]
+    assert set(cached) == {0, 1} and 2 in pairing.clusters()
+    _assert_same_counts(pairing, _pairing(appended))
+
+
+def test_changed_prefix_triggers_full_recount():
+    pairing = _pairing()
+    pairing.pairings(0)
+    edited = REVIEWS.iloc[1:].reset_index(drop=True)
+    pairing.sync(edited)
+    _assert_same_counts(pairing, _pairing(edited))
+    assert pairing._counts[0].tolist() == [1, 0, 0, 1]
+    assert 0 not in pairing._results
+
+
+def test_same_version_is_not_synced_again():
+    pairing = PersonaPairing(AnnIndex.from_frame(KOREAN), KOREAN, NYT)
+    pairing.sync(REVIEWS.iloc[:2], version="v1")
+    pairing.sync(REVIEWS, version="v1")
+    assert pairing._counts[0].tolist() == [1, 0, 0, 1]
+
+
+def test_profile_is_review_count_weighted_centroid():
+    pairing = _pairing()
+    # 군집 0: Wizard 2건, Dragon Song 1건 (목록에 없는 제목은 무시)
+    assert pairing._counts[0].tolist() == [2, 0, 0, 1]
+    expected = 2 * pairing.nyt_matrix[0].toarray() + pairing.nyt_matrix[3].toarray()
+    expected /= np.linalg.norm(expected)
+    np.testing.assert_allclose(pairing.profile(0).toarray(), expected, rtol=1e-6)
+    assert pairing.profile(99) is None
+
+
+def test_pairings_follow_profile_similarity_order():
+    pairing = _pairing()
+    out = pairing.pairings(0)
+    assert list(out.columns) == PAIRING_COLUMNS
+    profile_scores = (pairing.korean_index.matrix @ pairing.profile(0).T).toarray().ravel()
+    expected = np.argsort(-profile_scores, kind="stable")[:len(out)]
+    assert out["pred_title"].tolist() == KOREAN["제목"].iloc[expected].tolist()
+    assert out["pred_title"].iloc[0] in ("마법사의 탑", "용의 계곡")
+    # 각 한국 도서는 군집이 읽은 NYT 도서 중 가장 비슷한 책과 짝지음
+    assert set(out["nyt_title"]) <= {"Wizard", "Dragon Song"}
+    assert out.loc[out["pred_title"] == "용의 계곡", "nyt_title"].item() == "Dragon Song"
+
+
+def test_persona_pairing_skips_index_build_without_review_columns(monkeypatch):
+    def build(*args):
+        raise AssertionError("리뷰 컬럼이 없으면 ANN 인덱스/페어링을 만들지 않아야 함")
+
+    monkeypatch.setattr(indexes, "load_columns",
+                        lambda name, columns: pd.DataFrame({"cluster": [0]}))
+    monkeypatch.setattr(indexes, "dataset_version", lambda name: "v1")
+    monkeypatch.setattr(indexes, "_persona_pairing", build)
+    assert indexes.persona_pairing("reviews.csv", "korean.csv", "nyt.csv") is None
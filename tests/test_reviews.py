@@ -0,0 +1,61 @@
+# tests/test_reviews.py
+import json
+
+import pandas as pd
+import pytest
+
+from utils.facets import parse_mapping
+from utils.reviews import cluster_emotion_counts, emotion_counts, explode_review_keywords
+
+
+def _baseline_parse(text):
+    # 기존 페이지의 파싱: 작은따옴표를 큰따옴표로 바꿔 json.loads
+    try:
+        return json.loads(text.replace("'", '"'))
+    except ValueError:
+        return {}
+
+
+@pytest.mark.parametrize("text, expected", [
+    ('{"emotions_positive": {"love": 0.9}}', {"emotions_positive": {"love": 0.9}}),
+    ("{'emotions_positive': {'love': 0.9}}", {"emotions_positive": {"love": 0.9}}),
+    ("not a mapping", None),
+    ("['love']", None),
+    (None, None),
+])
+def test_parse_mapping_matches_baseline_for_plain_rows(text, expected):
+    assert parse_mapping(text) == expected
+    if expected is not None:
+        assert _baseline_parse(text) == expected
+
+
+@pytest.mark.parametrize("text, expected", [
+    # 키 안의 아포스트로피: 기존 방식은 따옴표가 깨져 버려지던 행
+    ("{'emotions_complex': {\"hero's journey\": 1}}", {"emotions_complex": {"hero's journey": 1}}),
+    # 파이썬 repr 값(None/True): 기존 방식은 JSON이 아니어서 버려지던 행
+    ("{'emotions_negative': {'irritation': None}}", {"emotions_negative": {"irritation": None}}),
+    ("{'emotions_positive': {'love': True}}", {"emotions_positive": {"love": True}}),
+])
+def test_parse_mapping_recovers_python_repr_rows(text, expected):
+    assert _baseline_parse(text) == {}
+    assert parse_mapping(text) == expected
+
+
+def test_emotion_counts_include_recovered_rows():
+    reviews = pd.DataFrame({
+        "cluster": [0, 0, 1, 1],
+        "parsed_keywords": [
+            "{'emotions_positive': {'love': 1, 'delight': 1}}",
+            "{'emotions_positive': {\"reader's love\": 1, 'love': 1}, 'emotions_negative': {'irritation': None}}",
+            "{'emotions_negative': {'irritation': 1}, 'themes': {'love': 1}}",
+            "broken",
+        ],
+    })
+    keywords = explode_review_keywords(reviews)
+    assert keywords["review_id"].tolist() == [0, 0, 1, 1, 1, 2, 2]
+    counts = emotion_counts(keywords)
+    # 두 번째 리뷰는 기존 방식에서 통째로 버려져 love 1, irritation 0이던 군집 0의 빈도가 늘어남
+    assert cluster_emotion_counts(counts, 0, ["love", "delight", "reader's love", "irritation"]) == [2, 1, 1, 1]
+    # 감정 카테고리가 아닌 라벨(themes)은 세지 않음
+    assert cluster_emotion_counts(counts, 1, ["love", "irritation"]) == [0, 1]
+    assert cluster_emotion_counts(counts, 2, ["love"]) == [0]
@@ -0,0 +1,98 @@
+# tests/test_schemas.py
+import pandas as pd
+import pytest
+
+from utils import data_loader
+from utils.schemas import read_csv_with_schema
+
+REVIEWS = "reviews_final_with_clusters.csv"
+
+
+@pytest.fixture
+def reviews_csv(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "data").mkdir()
+    path = tmp_path / "data" / REVIEWS
+    pd.DataFrame({
+        "title": ["A", "B", "C", "D"],
+        "cluster": [0, 1, 2, 0],
+        "parsed_keywords": ["{'joy': 1}", "{}", "{'fear': 2}", "{'joy': 3}"],
+    }).to_csv(path, index=False)
+    return str(path)
+
+
+def _assert_integer_clusters(df):
+    assert isinstance(df["cluster"].dtype, pd.CategoricalDtype)
+    assert pd.api.types.is_integer_dtype(df["cluster"].cat.categories)
+    assert list(df.index[df["cluster"] == 0]) == [0, 3]
+
+
+def test_cluster_keeps_integer_categories(reviews_csv):
+    _assert_integer_clusters(read_csv_with_schema(reviews_csv))
+
+
+@pytest.mark.parametrize("mmap", ["none", REVIEWS])
+def test_cluster_survives_snapshot_round_trip(reviews_csv, monkeypatch, mmap):
+    # Parquet 스냅샷과 메모리 매핑용 Arrow 스냅샷 모두 확인
+    monkeypatch.setenv("KNOVEL_MMAP_DATASETS", mmap)
+    df, fingerprint = data_loader._read_snapshot(reviews_csv)
+    assert df is None
+    data_loader._write_snapshot(reviews_csv, read_csv_with_schema(reviews_csv), fingerprint)
+    df, _ = data_loader._read_snapshot(reviews_csv)
+    assert df is not None
+    _assert_integer_clusters(df)
+
+
+def test_non_numeric_categories_stay_strings(tmp_path):
+    path = tmp_path / "book_korean.csv"
+    pd.DataFrame({"primary_genre": ["Fantasy", "Romance"], "출판사": ["1", "x"]}).to_csv(path, index=False)
+    df = read_csv_with_schema(str(path))
+    assert list(df["primary_genre"].cat.categories) == ["Fantasy", "Romance"]
+    assert list(df["출판사"].cat.categories) == ["1", "x"]
+
+
+def test_snapshot_write_failure_is_logged(reviews_csv, monkeypatch, caplog):
+    monkeypatch.setenv("KNOVEL_MMAP_DATASETS", "none")
+    _, fingerprint = data_loader._read_snapshot(reviews_csv)
+    # 직렬화할 수 없는 컬럼: 스냅샷 없이 계속 동작하고 경고만 남김
+    df = pd.DataFrame({"cluster": [object()]})
+    data_loader._write_snapshot(reviews_csv, df, fingerprint)
+    assert data_loader._read_snapshot(reviews_csv)[0] is None
+    assert "스냅샷 저장 실패 (reviews_final_with_clusters.csv)" in caplog.text
+
+
+def test_non_numeric_column_keeps_values_and_logs(tmp_path, caplog):
+    path = tmp_path / "book_korean.csv"
+    pd.DataFrame({"발행년도": ["2020", "미상"], "salespoint": [1.5, 2.0]}).to_csv(path, index=False)
+    df = read_csv_with_schema(str(path))
+    assert df["발행년도"].tolist() == ["2020", "미상"]
+    assert df["salespoint"].dtype == "float32"
+    assert "book_korean.csv:발행년도 컬럼이 수치형이 아니어서 Int16 변환을 건너뜀" in caplog.text
+
+
+def test_load_columns_reads_mmap_snapshot_without_shared_frame(reviews_csv, monkeypatch):
+    monkeypatch.setenv("KNOVEL_MMAP_DATASETS", REVIEWS)
+    monkeypatch.setattr(data_loader, "_SHARED_BYTES", {})
+    data_loader._load_columns_shared.clear()
+    df = data_loader.load_columns(REVIEWS, ["cluster", "missing"])
+    # 스냅샷만 만들고 전체 테이블은 공유 저장소에 올리지 않음
+    assert list(df.columns) == ["cluster"]
+    _assert_integer_clusters(df)
+    assert data_loader.shared_memory_report() == {}
+    assert data_loader._read_snapshot(reviews_csv)[0] is not None
+
+
+def test_dataset_version_hashes_once_without_snapshot_meta(reviews_csv, monkeypatch):
+    # 스냅샷 저장에 실패해 메타 파일이 없어도 (경로, 크기, mtime)이 같으면 다시 해시하지 않음
+    hashed = []
+    original = data_loader._file_sha256
+    monkeypatch.setattr(data_loader, "_file_sha256", lambda path: hashed.append(path) or original(path))
+    monkeypatch.setattr(data_loader, "_SHA256_CACHE", {})
+    version = data_loader.dataset_version(REVIEWS)
+    assert data_loader.dataset_version("data/" + REVIEWS) == version
+    assert len(hashed) == 1
+
+    with open(reviews_csv, "a", encoding="utf-8") as f:
+        f.write("E,1,{}\n")
+    assert data_loader.dataset_version(REVIEWS) != version
+    assert len(hashed) == 2
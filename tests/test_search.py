@@ -0,0 +1,97 @@
+# tests/test_search.py
+import numpy as np
+import pandas as pd
+
+from utils.search import BookSearchIndex, NgramIndex
+
+BOOKS = pd.DataFrame({
+    "제목": ["편의점 인간", "작별하지 않는다", "불편한 편의점", "소년이 온다", "채식주의자"],
+    "저자": ["무라타 사야카", "한강", "김호연", "한강", "한강"],
+    "ISBN": ["9788937473401", "9788954682152", "9791161571188", "9788936434120", "9788936433598"],
+})
+
+
+def _index():
+    return BookSearchIndex.from_frame(BOOKS, ["제목", "저자", "ISBN"])
+
+
+def test_choseong_query_matches_initial_consonants():
+    rows, scores = _index().search("ㅂㅍㅎ")
+    assert rows.tolist() == [2]
+    assert scores.tolist() == [2.0]
+
+
+def test_partial_jamo_prefix_matches_word_being_typed():
+    # '작벼'는 '작별'을 입력하는 중인 상태
+    rows, scores = _index().search("작벼")
+    assert rows.tolist() == [1]
+    assert scores.tolist() == [2.0]
+
+
+def test_exact_matches_rank_above_fuzzy_matches():
+    rows, scores = _index().search("편의점")
+    assert rows.tolist() == [0, 2]
+    assert scores.tolist() == [3.0, 3.0]
+
+    rows, scores = _index().search("한강")
+    assert scores[:3].tolist() == [3.0, 3.0, 3.0]
+    assert set(rows[:3].tolist()) == {1, 3, 4}
+
+
+def test_typo_ranks_below_exact_and_keeps_row_order():
+    rows, scores = _index().search("소녀니 온다")
+    assert rows.tolist()[0] == 3
+    assert 0.5 <= scores[0] < 2.0
+    assert np.all(np.diff(scores) <= 0)
+
+
+def test_query_whitespace_is_stripped_and_collapsed():
+    index = _index()
+    for query, same_as in (("편의점 ", "편의점"), ("  한강\t", "한강"), ("편의점  인간", "편의점 인간")):
+        rows, scores = index.search(query)
+        expected_rows, expected_scores = index.search(same_as)
+        np.testing.assert_array_equal(rows, expected_rows)
+        np.testing.assert_array_equal(scores, expected_scores)
+    # 뒤에 공백이 붙어도 제목 끝의 '편의점'이 정확히 일치
+    assert index.search("편의점 ")[1].tolist() == [3.0, 3.0]
+
+
+def test_blank_query_returns_every_row_unscored():
+    rows, scores = _index().search("   ")
+    assert rows.tolist() == list(range(len(BOOKS)))
+    assert not scores.any()
+
+
+# --- NgramIndex: 포스팅 리스트 교집합 ---
+
+def _scan(texts, query):
+    return [row for row, text in enumerate(texts) if query.casefold() in text.casefold()]
+
+
+def test_multi_gram_query_returns_only_rows_with_every_gram():
+    texts = ["abcd", "abxcd", "bcda", "xbcx", "ab cd", "ABCD"]
+    index = NgramIndex(texts, n=2)
+    # 'abcd'의 바이그램 ab/bc/cd를 모두 가진 행만 후보, 그중 실제로 이어진 행만 결과
+    assert index.search("abcd").tolist() == _scan(texts, "abcd") == [0, 5]
+    assert index.search("bcd").tolist() == _scan(texts, "bcd") == [0, 2, 5]
+    assert index.search("abz").tolist() == []
+
+
+def test_ngram_matches_scan_on_a_catalog():
+    index = NgramIndex.from_frame(BOOKS, ["제목", "저자", "ISBN"])
+    texts = ["\x00".join(values) for values in BOOKS.astype(str).itertuples(index=False)]
+    for query in ("편의점", "한강", "9788936", "소년이 온다", "다"):
+        assert index.search(query).tolist() == _scan(texts, query), query
+    # 필드 경계를 넘는 검색어는 찾지 않음
+    assert index.search("인간무라타").tolist() == []
+
+
+def test_empty_and_short_queries():
+    index = NgramIndex(["abc", "bcd", "xyz"])
+    assert index.search("").tolist() == [0, 1, 2]
+    assert index.search("  ").tolist() == [0, 1, 2]
+    assert index.search(None).tolist() == [0, 1, 2]
+    # n보다 짧은 검색어는 길이 1..n n-gram 포스팅 리스트로 바로 찾음
+    assert index.search("b").tolist() == [0, 1]
+    assert index.search("q").tolist() == []
+    assert index.search("B").dtype == np.int32
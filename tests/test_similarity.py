@@ -0,0 +1,56 @@
+# tests/test_similarity.py
+import numpy as np
+import pandas as pd
+
+from utils import preprocess
+from utils.similarity import SimilarityIndex, similarity_frame
+
+NYT = pd.DataFrame({
+    "primary_genre": ["Fantasy", "Romance", "Thriller"],
+    "description": ["a young wizard and a dragon", "two lovers in paris", "a detective hunts a killer"],
+})
+
+
+def test_similarity_frame_outputs_both_dataset_columns():
+    books = pd.DataFrame({"primary_genre": ["Romance"], "description": ["lovers meet in paris"]}, index=[7])
+    frame = similarity_frame(books, SimilarityIndex.from_frame(NYT))
+    assert list(frame.columns) == ["nyb_max_s", "top_1_similarity", "nyb_top_row"]
+    assert frame.index.tolist() == [7]
+    assert frame["nyb_top_row"].iloc[0] == 1
+    assert frame["nyb_max_s"].iloc[0] == frame["top_1_similarity"].iloc[0] > 0
+
+
+def test_fill_similarity_scores_only_new_titles():
+    books = pd.DataFrame({
+        "primary_genre": ["Fantasy", "Thriller", "Romance"],
+        "description": ["wizard school", "a detective story", "lovers in paris"],
+        "nyb_max_s": [0.9, np.nan, np.nan],
+        "top_1_similarity": [0.8, 0.7, np.nan],
+    })
+    out = preprocess.enrich_translated(books, NYT)["trans_final_with_url"]
+    expected = similarity_frame(books, SimilarityIndex.from_frame(NYT))
+    # 오프라인 값은 그대로 두고, 비어 있던 칸만 새로 계산해 척도가 다른 *_local 컬럼에 저장
+    np.testing.assert_array_equal(out["nyb_max_s"].to_numpy(), [0.9, np.nan, np.nan])
+    np.testing.assert_array_equal(out["top_1_similarity"].to_numpy(), [0.8, 0.7, np.nan])
+    local = out["nyb_max_s_local"]
+    assert local.dtype == "float32" and np.isnan(local.iloc[0])
+    np.testing.assert_array_equal(local.to_numpy()[1:], expected["nyb_max_s"].to_numpy()[1:])
+    assert out["top_1_similarity_local"].isna().tolist() == [True, True, False]
+    assert out["top_1_similarity_local"].iloc[2] == expected["top_1_similarity"].iloc[2]
+    assert out.attrs["similarity_filled"] == 2
+
+def test_fill_similarity_adds_missing_columns_and_skips_complete_frames(monkeypatch):
+    ranked = pd.DataFrame({"description": ["a detective story"]})
+    out = preprocess.enrich_ranked(ranked, NYT)["흥행예측도서_ranked"]
+    assert out["nyb_max_s"].dtype == "float32" and out["nyb_max_s"].isna().all()
+    assert out["nyb_max_s_local"].iloc[0] > 0
+
+    # 비어 있는 값이 없으면 유사도 인덱스를 만들지 않음
+    monkeypatch.setattr(preprocess, "SimilarityIndex", None)
+    out = preprocess.enrich_ranked(ranked.assign(nyb_max_s=0.5), NYT)["흥행예측도서_ranked"]
+    assert out.attrs["similarity_filled"] == 0
+
+
+def test_artifact_version_tracks_the_reference_dataset():
+    assert preprocess.source_version("a", "b") == "a+b"
+    assert preprocess.source_version("a", None) is None
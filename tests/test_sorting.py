@@ -0,0 +1,48 @@
+# tests/test_sorting.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.sorting import SortIndex, rows_to_mask
+
+DF = pd.DataFrame({
+    "salespoint": pd.array([30.0, np.nan, 10.0, 30.0, 20.0, np.nan, 10.0, 30.0], dtype="float32"),
+    "fuzzy_rank": pd.array([3, 1, None, 3, 2, 5, None, 4], dtype="Int32"),
+    "primary_genre": pd.Categorical(["Romance", "Fantasy", None, "Romance", "Fantasy", "Thriller", "Fantasy", None],
+                                    categories=["Thriller", "Romance", "Fantasy"]),
+    "제목": pd.array(["b", "a", "c", "a", None, "b", "c", "a"], dtype="string"),
+})
+
+
+def _expected(df, column, ascending):
+    # pandas 안정 정렬: 같은 값은 원래 순서, 결측은 방향과 관계없이 맨 뒤
+    order = df.reset_index(drop=True).sort_values(column, ascending=ascending, kind="stable", na_position="last")
+    return order.index.to_numpy()
+
+
+@pytest.mark.parametrize("column", list(DF.columns))
+@pytest.mark.parametrize("ascending", [True, False])
+def test_order_matches_stable_pandas_sort(column, ascending):
+    order = SortIndex(DF, DF.columns).order(column, ascending=ascending)
+    np.testing.assert_array_equal(order, _expected(DF, column, ascending))
+    assert order.dtype == np.int32
+
+
+def test_descending_keeps_ties_in_row_order_and_missing_last():
+    order = SortIndex(DF, ["salespoint"]).order("salespoint", ascending=False)
+    assert order.tolist() == [0, 3, 7, 4, 2, 6, 1, 5]
+
+
+@pytest.mark.parametrize("ascending", [True, False])
+def test_mask_filters_without_resorting(ascending):
+    index = SortIndex(DF, ["salespoint"])
+    mask = rows_to_mask([0, 1, 2, 4, 7], len(DF))
+    expected = [row for row in index.order("salespoint", ascending) if mask[row]]
+    assert index.order("salespoint", ascending, mask=mask).tolist() == expected
+
+
+def test_unknown_column_and_empty_frame():
+    index = SortIndex(DF.iloc[:0], ["salespoint", "missing"])
+    assert "missing" not in index
+    assert index.order("salespoint", ascending=False).size == 0
+    assert index.order("missing").size == 0
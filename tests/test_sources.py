@@ -0,0 +1,289 @@
+# tests/test_sources.py
+"""utils.sources 백엔드와 utils.prefetch.Prefetcher를 로컬 http.server에 대해 확인."""
+import hashlib
+import json
+import os
+import threading
+from email.utils import parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote
+
+import pytest
+import requests
+
+from utils import sources
+from utils.prefetch import Prefetcher
+from utils.sources import (PARTIAL_SUFFIX, VALIDATORS_SUFFIX, GoogleDriveSource, HTTPSource, LocalDirectorySource,
+                           source_from_env)
+
+LAST_MODIFIED = "Wed, 01 Jan 2025 00:00:00 GMT"
+DATA = b"ISBN,title\n" + b"".join(b"%d,book %d\n" % (i, i) for i in range(2000))
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """ETag/Last-Modified 조건부 GET과 Range/If-Range를 지원하는 데이터셋 미러 대역."""
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append(dict(self.headers))
+        name = unquote(self.path.lstrip("/"))
+        if name in server.failing:
+            self.send_error(500)
+            return
+        body = server.files.get(name)
+        if body is None:
+            self.send_error(404)
+            return
+        etag = '"%s"' % hashlib.sha1(body).hexdigest()[:16]
+        validators = {"Last-Modified": LAST_MODIFIED}
+        if server.send_etag:
+            validators["ETag"] = etag
+
+        if_none_match = self.headers.get("If-None-Match")
+        if_modified_since = self.headers.get("If-Modified-Since")
+        if (if_none_match == etag and server.send_etag) or (
+            if_none_match is None and if_modified_since
+            and parsedate_to_datetime(if_modified_since) >= parsedate_to_datetime(LAST_MODIFIED)
+        ):
+            self._respond(304, validators)
+            return
+
+        requested = self.headers.get("Range")
+        if_range = self.headers.get("If-Range")
+        if requested and (if_range is None or if_range in validators.values()):
+            start = int(requested[len("bytes="):].rstrip("-"))
+            if start >= len(body):
+                self._respond(416, {"Content-Range": f"bytes */{len(body)}"})
+                return
+            self._respond(206, dict(validators, **{"Content-Range": f"bytes {start}-{len(body) - 1}/{len(body)}"}),
+                          body[start:])
+            return
+        self._respond(200, validators, body)
+
+    def _respond(self, status, headers, body=b""):
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    httpd.files = {"books.csv": DATA, "흥행예측도서_ranked.csv": DATA[:500]}
+    httpd.requests = []
+    httpd.failing = set()
+    httpd.send_etag = True
+    httpd.url = f"http://127.0.0.1:{httpd.server_port}/"
+    thread = threading.Thread(target=httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _read(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+# --- HTTPSource ---
+
+def test_http_200_downloads_and_stores_validators(server, tmp_path):
+    dest = str(tmp_path / "흥행예측도서_ranked.csv")
+    progress = []
+    assert HTTPSource(server.url).fetch("흥행예측도서_ranked.csv", dest, lambda done, total: progress.append((done, total)))
+    assert _read(dest) == DATA[:500]
+    assert progress[-1] == (500, 500)
+    assert not os.path.exists(dest + PARTIAL_SUFFIX)
+    with open(dest + VALIDATORS_SUFFIX, encoding="utf-8") as f:
+        assert json.load(f)["last_modified"] == LAST_MODIFIED
+
+
+def test_http_304_with_etag(server, tmp_path):
+    source, dest = HTTPSource(server.url), str(tmp_path / "books.csv")
+    assert source.fetch("books.csv", dest)
+    assert source.fetch("books.csv", dest) is False
+    assert server.requests[-1]["If-None-Match"].startswith('"')
+    assert _read(dest) == DATA
+
+
+def test_http_304_with_if_modified_since(server, tmp_path):
+    server.send_etag = False
+    source, dest = HTTPSource(server.url), str(tmp_path / "books.csv")
+    assert source.fetch("books.csv", dest)
+    assert source.fetch("books.csv", dest) is False
+    assert "If-None-Match" not in server.requests[-1]
+    assert server.requests[-1]["If-Modified-Since"] == LAST_MODIFIED
+
+
+def test_http_changed_file_is_downloaded_again(server, tmp_path):
+    source, dest = HTTPSource(server.url), str(tmp_path / "books.csv")
+    source.fetch("books.csv", dest)
+    server.files["books.csv"] = DATA + b"2000,new book\n"
+    assert source.fetch("books.csv", dest)
+    assert _read(dest) == server.files["books.csv"]
+
+
+def _leave_partial(server, dest, size):
+    # 중간에 끊긴 다운로드: .part 파일과 그 응답의 캐시 헤더
+    source = HTTPSource(server.url)
+    source.fetch("books.csv", dest)
+    os.replace(dest + VALIDATORS_SUFFIX, dest + PARTIAL_SUFFIX + VALIDATORS_SUFFIX)
+    os.remove(dest)
+    with open(dest + PARTIAL_SUFFIX, "wb") as f:
+        f.write(DATA[:size])
+    return source
+
+
+def test_http_206_resumes_partial_download(server, tmp_path):
+    dest = str(tmp_path / "books.csv")
+    source = _leave_partial(server, dest, 1000)
+    progress = []
+    assert source.fetch("books.csv", dest, lambda done, total: progress.append((done, total)))
+    assert server.requests[-1]["Range"] == "bytes=1000-"
+    assert server.requests[-1]["If-Range"].startswith('"')
+    assert progress[0] == (1000, len(DATA))
+    assert _read(dest) == DATA
+    assert not os.path.exists(dest + PARTIAL_SUFFIX)
+
+
+def test_http_if_range_mismatch_restarts_from_scratch(server, tmp_path):
+    dest = str(tmp_path / "books.csv")
+    source = _leave_partial(server, dest, 1000)
+    server.files["books.csv"] = b"changed," + DATA
+    assert source.fetch("books.csv", dest)
+    assert _read(dest) == server.files["books.csv"]
+
+
+def test_http_416_discards_partial_file(server, tmp_path):
+    dest = str(tmp_path / "books.csv")
+    source = _leave_partial(server, dest, 1000)
+    with open(dest + PARTIAL_SUFFIX, "ab") as f:
+        f.write(b"x" * len(DATA))
+    assert source.fetch("books.csv", dest)
+    assert _read(dest) == DATA
+
+
+def test_http_error_raises(server, tmp_path):
+    server.failing.add("books.csv")
+    with pytest.raises(requests.HTTPError):
+        HTTPSource(server.url).fetch("books.csv", str(tmp_path / "books.csv"))
+    with pytest.raises(requests.HTTPError):
+        HTTPSource(server.url).fetch("missing.csv", str(tmp_path / "missing.csv"))
+
+
+# --- LocalDirectorySource ---
+
+def test_local_copies_then_skips_unchanged(tmp_path):
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "books.csv").write_bytes(DATA)
+    source, dest = LocalDirectorySource(str(tmp_path / "src")), str(tmp_path / "books.csv")
+    assert source.fetch("books.csv", dest)
+    assert source.fetch("books.csv", dest) is False
+    (tmp_path / "src" / "books.csv").write_bytes(DATA + b"2000,new book\n")
+    assert source.fetch("books.csv", dest)
+    assert _read(dest) == DATA + b"2000,new book\n"
+
+
+# --- GoogleDriveSource (gdown 대신 로컬 서버에서 받음) ---
+
+@pytest.fixture
+def drive_stand_in(server, monkeypatch):
+    def download(url, output, **kwargs):
+        response = requests.get(url, timeout=10)
+        response.raise_for_status()
+        with open(output, "wb") as f:
+            f.write(response.content)
+        return output
+
+    monkeypatch.setattr(sources.gdown, "download", download)
+    return server
+
+
+def test_drive_downloads_through_gdown(drive_stand_in, tmp_path):
+    source = GoogleDriveSource({"books.csv": drive_stand_in.url + "books.csv"})
+    dest = str(tmp_path / "books.csv")
+    assert source.fetch("books.csv", dest)
+    assert _read(dest) == DATA
+
+
+# --- Prefetcher: 200 / 304 / 실패 시 기존 파일 사용 ---
+
+def _sources(server, tmp_path):
+    (tmp_path / "src").mkdir(exist_ok=True)
+    (tmp_path / "src" / "books.csv").write_bytes(DATA)
+    return {
+        "http": HTTPSource(server.url),
+        "local": LocalDirectorySource(str(tmp_path / "src")),
+        "drive": GoogleDriveSource({"books.csv": server.url + "books.csv"}),
+    }
+
+
+def _break(kind, server, tmp_path):
+    if kind == "local":
+        os.remove(tmp_path / "src" / "books.csv")
+    else:
+        server.failing.add("books.csv")
+
+
+@pytest.mark.parametrize("kind", ["http", "local", "drive"])
+def test_prefetcher_downloads_each_source(kind, drive_stand_in, tmp_path):
+    data_dir = tmp_path / "data"
+    prefetcher = Prefetcher(_sources(drive_stand_in, tmp_path)[kind], ["books.csv"], data_dir=str(data_dir)).start()
+    try:
+        assert _read(prefetcher.wait("books.csv", timeout=10)) == DATA
+        assert prefetcher.progress()["books.csv"].state == "done"
+    finally:
+        prefetcher.shutdown()
+
+
+@pytest.mark.parametrize("kind", ["http", "local", "drive"])
+def test_prefetcher_keeps_existing_file_when_source_fails(kind, drive_stand_in, tmp_path, caplog):
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    (data_dir / "books.csv").write_bytes(b"old")
+    source = _sources(drive_stand_in, tmp_path)[kind]
+    _break(kind, drive_stand_in, tmp_path)
+    prefetcher = Prefetcher(source, ["books.csv"], data_dir=str(data_dir)).start()
+    try:
+        assert _read(prefetcher.wait("books.csv", timeout=10)) == b"old"
+        assert prefetcher.progress()["books.csv"].state == "done"
+        if source.revalidates:
+            assert "books.csv 재검증 실패" in caplog.text
+    finally:
+        prefetcher.shutdown()
+
+
+@pytest.mark.parametrize("kind", ["http", "local", "drive"])
+def test_prefetcher_reports_error_and_retries(kind, drive_stand_in, tmp_path):
+    source = _sources(drive_stand_in, tmp_path)[kind]
+    _break(kind, drive_stand_in, tmp_path)
+    prefetcher = Prefetcher(source, ["books.csv"], data_dir=str(tmp_path / "data")).start()
+    try:
+        with pytest.raises(Exception):
+            prefetcher.wait("books.csv", timeout=10)
+        assert prefetcher.progress()["books.csv"].state == "error"
+        # 원본이 복구되면 다음 wait()에서 다시 받음
+        drive_stand_in.failing.clear()
+        (tmp_path / "src" / "books.csv").write_bytes(DATA)
+        assert _read(prefetcher.wait("books.csv", timeout=10)) == DATA
+    finally:
+        prefetcher.shutdown()
+
+
+def test_source_from_env(monkeypatch, tmp_path):
+    monkeypatch.delenv("KNOVEL_DATA_SOURCE", raising=False)
+    assert isinstance(source_from_env({}), GoogleDriveSource)
+    monkeypatch.setenv("KNOVEL_DATA_SOURCE", "http://mirror.local/data")
+    assert source_from_env({}).url_for("a b.csv") == "http://mirror.local/data/a%20b.csv"
+    monkeypatch.setenv("KNOVEL_DATA_SOURCE", f"local:{tmp_path}")
+    assert isinstance(source_from_env({}), LocalDirectorySource)
+    monkeypatch.setenv("KNOVEL_DATA_SOURCE", str(tmp_path / "missing"))
+    with pytest.raises(ValueError):
+        source_from_env({})
@@ -0,0 +1,75 @@
+# tests/test_stability.py
+import numpy as np
+import pytest
+
+from utils import stability
+from utils.topsis import WEIGHT_SPREAD, closeness, normalized_matrix
+
+
+def _exact_quantiles(values, weights, n_samples, seed):
+    # 표본별 순위를 모두 저장해 계산한 도서별 분위수 (히스토그램 없이)
+    y, shape, _ = normalized_matrix(values)
+    weight_matrix = stability.perturbed_weights(weights, n_samples, rng=seed)
+    scores = closeness(y, shape[None, :, :] * stability._triangular(weight_matrix, WEIGHT_SPREAD))
+    order = np.argsort(-scores, axis=1, kind="stable")
+    ranks = np.empty_like(order)
+    np.put_along_axis(ranks, order, np.arange(y.shape[1])[None, :], axis=1)
+    return np.quantile(ranks + 1, stability.QUANTILES, axis=0, method="inverted_cdf").T
+
+
+def test_rank_bin_edges_are_exact_near_the_top():
+    edges = stability.rank_bin_edges(100_000)
+    assert edges[0] == 0 and edges[-1] == 100_000
+    assert len(edges) - 1 <= stability.MAX_RANK_BINS
+    assert list(edges[:21]) == list(range(21))
+    assert np.all(np.diff(edges) > 0)
+    np.testing.assert_array_equal(stability.rank_bin_edges(50), np.arange(51))
+
+
+def test_top_ranks_match_exact_quantiles():
+    rng = np.random.default_rng(1)
+    values = rng.random((3000, 4))
+    weights = [0.25, 0.25, 0.25, 0.25]
+    summary = stability.rank_stability(values, weights, n_samples=200, seed=3)
+    exact = _exact_quantiles(values, weights, 200, seed=3)
+    top = np.argsort(exact[:, 1], kind="stable")[:20]
+    # 한 순위 폭 구간에만 들어가는 도서는 분위수가 정확히 같고, 나머지 상위 도서도 순위의 5% 이내
+    edges = stability.rank_bin_edges(len(values))
+    exact_limit = edges[np.argmax(np.diff(edges) > 1)]
+    narrow = top[exact[top, 2] <= exact_limit]
+    assert narrow.size >= 5
+    np.testing.assert_array_equal(summary.to_numpy()[narrow], exact[narrow])
+    assert np.all(np.abs(summary.to_numpy()[top] - exact[top]) <= 0.05 * exact[top] + 1)
+    # 상위 20권의 순위 중앙값이 모두 같은 값으로 뭉개지지 않음
+    assert summary["rank_median"].nsmallest(20).nunique() > 1
+
+
+@pytest.mark.parametrize("n_books", [1, 40])
+def test_small_catalogs_are_exact(n_books):
+    values = np.random.default_rng(0).random((n_books, 4))
+    summary = stability.rank_stability(values, [1, 2, 3, 4], n_samples=100, seed=5)
+    np.testing.assert_array_equal(summary.to_numpy(), _exact_quantiles(values, [1, 2, 3, 4], 100, seed=5))
+
+
+def test_histogram_memory_is_bounded_by_the_histogram(monkeypatch):
+    import tracemalloc
+
+    # 표본 하나씩 묶음을 만들어도 묶음마다 히스토그램 크기의 배열을 새로 만들지 않아야 함
+    monkeypatch.setattr(stability, "CHUNK_ELEMENTS", 80_000)
+    values = np.random.default_rng(2).random((20_000, 4))
+    histogram_bytes = 20_000 * (len(stability.rank_bin_edges(20_000)) - 1) * np.dtype(np.int32).itemsize
+    tracemalloc.start()
+    try:
+        stability.rank_stability(values, [0.25] * 4, n_samples=20, seed=1)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert peak < 1.5 * histogram_bytes
+
+
+def test_process_pool_matches_single_process():
+    values = np.random.default_rng(4).random((300, 4))
+    single = stability.rank_stability(values, [1, 1, 1, 1], n_samples=60, seed=2)
+    # 작은 묶음으로 나눠 여러 프로세스(spawn)에서 계산해도 같은 결과
+    pooled = stability.rank_stability(values, [1, 1, 1, 1], n_samples=60, seed=2, workers=2)
+    np.testing.assert_array_equal(single.to_numpy(), pooled.to_numpy())
@@ -0,0 +1,79 @@
+# tests/test_topsis.py
+import numpy as np
+import pytest
+
+from utils.topsis import fuzzify, fuzzy_topsis, normalize_weights, rank_scores, triangular_weights
+
+VALUES = np.array([
+    [120.0, 0.42, 0.8, 0.1],
+    [45.0, 0.91, 0.3, 0.6],
+    [300.0, 0.15, 0.5, 0.9],
+    [80.0, 0.66, 0.9, 0.2],
+    [10.0, 0.05, 0.1, 0.05],
+])
+
+
+def _direct_fuzzy_topsis(values, weights, benefit):
+    """(도서 수, 기준 수, 3) TFN 배열을 그대로 만들어 계산하는 교과서식 fuzzy TOPSIS."""
+    tfn = fuzzify(values)
+    normalized = np.empty_like(tfn)
+    for j, is_benefit in enumerate(benefit):
+        if is_benefit:
+            normalized[:, j] = tfn[:, j] / tfn[:, j, 2].max()
+        else:
+            normalized[:, j] = tfn[:, j, 0].min() / tfn[:, j, ::-1]
+    weighted = normalized * triangular_weights(weights)[None]
+    fpis, fnis = weighted[:, :, 2].max(axis=0), weighted[:, :, 0].min(axis=0)
+
+    def distance(point):
+        return np.sqrt(((weighted - point[None, :, None]) ** 2).mean(axis=2)).sum(axis=1)
+
+    d_plus, d_minus = distance(fpis), distance(fnis)
+    return d_minus / (d_plus + d_minus)
+
+
+@pytest.mark.parametrize("benefit", [[True] * 4, [True, False, True, False]])
+@pytest.mark.parametrize("weights", [[0.25] * 4, [0.7, 0.1, 0.1, 0.1], [3, 0, 1, 0]])
+def test_closed_form_matches_direct_triangular_computation(weights, benefit):
+    np.testing.assert_allclose(fuzzy_topsis(VALUES, weights, benefit), _direct_fuzzy_topsis(VALUES, weights, benefit),
+                               rtol=1e-10, atol=1e-12)
+
+
+def test_rows_with_missing_values_score_nan():
+    values = VALUES.copy()
+    values[1, 2] = np.nan
+    scores = fuzzy_topsis(values, [0.25] * 4)
+    assert np.isnan(scores[1])
+    np.testing.assert_allclose(np.delete(scores, 1), _direct_fuzzy_topsis(np.delete(VALUES, 1, axis=0), [0.25] * 4,
+                                                                          [True] * 4))
+
+
+def test_weights_are_renormalised():
+    np.testing.assert_allclose(normalize_weights([2, 1, 1, 0]), [0.5, 0.25, 0.25, 0.0])
+    np.testing.assert_allclose(fuzzy_topsis(VALUES, [2, 2, 2, 2]), fuzzy_topsis(VALUES, [0.25] * 4))
+    # 가중치 TFN의 아래 꼭짓점은 0 미만으로 내려가지 않음
+    assert triangular_weights([1, 0, 0, 0])[1].tolist() == [0.0, 0.0, 0.05]
+
+
+@pytest.mark.parametrize("weights", [[0, 0, 0, 0], [0.5, -0.1, 0.3, 0.3], [-1, -1, -1, -1], [0.5, np.nan, 0.2, 0.3]])
+def test_zero_negative_or_missing_weights_are_rejected(weights):
+    with pytest.raises(ValueError):
+        normalize_weights(weights)
+    with pytest.raises(ValueError):
+        fuzzy_topsis(VALUES, weights)
+
+
+def test_tied_scores_share_the_smallest_rank():
+    ranks = rank_scores([0.5, 0.9, 0.5, np.nan, 0.9, 0.1])
+    assert ranks.isna().tolist() == [False, False, False, True, False, False]
+    assert ranks.fillna(0).tolist() == [3, 1, 3, 0, 1, 5]
+    assert str(ranks.dtype) == "Int32"
+
+
+def test_identical_books_tie_in_rank():
+    values = np.vstack([VALUES, VALUES[2]])
+    scores = fuzzy_topsis(values, [0.25] * 4)
+    ranks = rank_scores(scores)
+    assert ranks[2] == ranks[5]
+    # 동점 다음 순위는 동점 수만큼 건너뜀
+    assert ranks[scores < scores[2]].min() == ranks[2] + 2
@@ -0,0 +1,198 @@
+# utils/ann.py
+"""
+도서 소개 벡터의 근사 최근접 이웃(ANN) 인덱스 (IVF, NumPy/SciPy 구현).
+
+utils.similarity의 문자 n-gram TF-IDF 희소 벡터를 희소 랜덤 투영(n-gram마다 임의의 한 차원에 ±1)으로
+PROJECTION_DIM차원 밀집 벡터로 줄이고, 구면 k-means 중심점별 역파일 리스트(IVF)로 나눔.
+검색은 질의와 가까운 리스트 n_probe개만 훑어 투영 벡터로 후보를 고른 뒤, 후보만 원래 TF-IDF 코사인으로 다시 정렬.
+기준 문서 수가 늘어도 질의당 계산량은 훑는 리스트 크기에 비례.
+인덱스는 np.savez로 저장해 두고 다음 실행에서는 다시 학습하지 않고 읽음.
+"""
+import os
+
+import numpy as np
+import scipy.sparse as sp
+
+from utils.similarity import NGRAM_RANGE, TEXT_COLUMNS, CharTfidf, document_texts
+
+# 저장 형식이 바뀌면 올림 (이전 형식 파일은 읽지 않고 다시 만듦)
+ANN_FORMAT_VERSION = 1
+PROJECTION_DIM = 256
+PROJECTION_SEED = 0
+# 질의마다 훑는 역파일 리스트 수
+DEFAULT_PROBES = 16
+# 투영 벡터로 고른 뒤 TF-IDF 코사인으로 다시 정렬할 후보 수: max(k × RERANK_FACTOR, MIN_CANDIDATES)
+RERANK_FACTOR = 30
+MIN_CANDIDATES = 300
+KMEANS_ITERATIONS = 10
+# k-means 학습에 사용하는 최대 표본 수 (전체 문서는 학습 후 한 번만 배정)
+KMEANS_SAMPLE = 50_000
+# 중심점 배정 시 한 번에 곱하는 문서 수
+ASSIGN_BLOCK = 8192
+
+
+def _projection(n_features, dim=PROJECTION_DIM, seed=PROJECTION_SEED):
+    """n-gram마다 임의의 한 차원에 ±1을 더하는 (어휘 수, dim) 희소 투영 행렬. seed로 항상 같은 행렬을 재생성."""
+    rng = np.random.default_rng(seed)
+    columns = rng.integers(0, dim, n_features)
+    signs = rng.choice(np.array([-1.0, 1.0], dtype=np.float32), n_features)
+    return sp.csr_matrix((signs, columns, np.arange(n_features + 1)), shape=(n_features, dim))
+
+
+def _normalize_rows(vectors):
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+
+def _nearest_centroid(vectors, centroids):
+    """블록 단위 내적으로 문서별 가장 가까운 중심점 번호."""
+    assignments = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), ASSIGN_BLOCK):
+        block = vectors[start:start + ASSIGN_BLOCK].astype(np.float32, copy=False)
+        assignments[start:start + ASSIGN_BLOCK] = (block @ centroids.T).argmax(axis=1)
+    return assignments
+
+
+def _spherical_kmeans(vectors, n_lists, rng, iterations=KMEANS_ITERATIONS):
+    """코사인 기준 k-means 중심점 (n_lists, dim). 표본이 빈 군집은 임의의 표본으로 다시 시작."""
+    sample_size = min(len(vectors), KMEANS_SAMPLE)
+    sample = vectors[np.sort(rng.choice(len(vectors), sample_size, replace=False))].astype(np.float32)
+    centroids = sample[rng.choice(sample_size, n_lists, replace=False)].copy()
+    for _ in range(iterations):
+        assignments = _nearest_centroid(sample, centroids)
+        membership = sp.csr_matrix(
+            (np.ones(sample_size, dtype=np.float32), (assignments, np.arange(sample_size))),
+            shape=(n_lists, sample_size),
+        )
+        sums = membership @ sample
+        empty = np.flatnonzero(np.asarray(membership.sum(axis=1)).ravel() == 0)
+        sums[empty] = sample[rng.choice(sample_size, empty.size, replace=False)]
+        centroids = _normalize_rows(sums)
+    return centroids
+
+
+class AnnIndex:
+    """
+    기준 문서에 대한 IVF 근사 최근접 이웃 인덱스.
+    search()가 돌려주는 번호는 기준 문서 목록(from_frame이면 df의 위치)과 같음.
+    """
+
+    def __init__(self, texts, ngram_range=NGRAM_RANGE, n_lists=None, seed=PROJECTION_SEED):
+        self.vectorizer = CharTfidf(texts, ngram_range)
+        self.matrix = self.vectorizer.matrix
+        self.seed = seed
+        self._projection = _projection(self.vectorizer.n_features, PROJECTION_DIM, seed)
+        vectors = self._project(self.matrix)
+        n_docs = len(vectors)
+        if n_lists is None:
+            n_lists = int(round(np.sqrt(n_docs)))
+        n_lists = max(1, min(n_lists, n_docs))
+        if n_docs:
+            self.centroids = _spherical_kmeans(vectors, n_lists, np.random.default_rng(seed))
+            assignments = _nearest_centroid(vectors, self.centroids)
+        else:
+            self.centroids = np.zeros((0, PROJECTION_DIM), dtype=np.float32)
+            assignments = np.zeros(0, dtype=np.int32)
+        self._set_lists(assignments)
+        # 리스트 순서로 재배열해 리스트 하나의 투영 벡터가 연속 메모리 구간이 되도록 보관
+        self.vectors = vectors[self.list_rows]
+
+    @classmethod
+    def from_frame(cls, df, columns=TEXT_COLUMNS, **kwargs):
+        return cls(document_texts(df, columns), **kwargs)
+
+    def _set_lists(self, assignments):
+        # 역파일 리스트를 CSR 형태로: list_rows[list_offsets[c]:list_offsets[c + 1]]가 리스트 c의 문서
+        self.list_rows = np.argsort(assignments, kind="stable").astype(np.int32)
+        self.list_offsets = np.searchsorted(assignments[self.list_rows], np.arange(len(self.centroids) + 1))
+
+    def _project(self, matrix):
+        return _normalize_rows((matrix @ self._projection).toarray().astype(np.float32))
+
+    def __len__(self):
+        return self.matrix.shape[0]
+
+    @property
+    def n_lists(self):
+        return len(self.centroids)
+
+    def search(self, texts, k=10, n_probe=DEFAULT_PROBES):
+        """
+        texts 각각과 가장 유사한 기준 문서 k개 (근사).
+        (번호 (문서 수, k) int32, 코사인 유사도 (문서 수, k) float32)를 유사도 내림차순으로 반환.
+        후보가 k개보다 적으면 남는 칸은 번호 -1, 유사도 0.
+        """
+        return self.search_matrix(self.vectorizer.transform(texts), k, n_probe)
+
+    def search_matrix(self, queries, k=10, n_probe=DEFAULT_PROBES):
+        """이미 벡터화한 L2 정규화 질의 행렬(CSR, 어휘 수 열)로 search()."""
+        n_queries = queries.shape[0]
+        rows = np.full((n_queries, k), -1, dtype=np.int32)
+        scores = np.zeros((n_queries, k), dtype=np.float32)
+        if not len(self) or not k:
+            return rows, scores
+        projected = self._project(queries)
+        centroid_scores = projected @ self.centroids.T
+        n_probe = min(n_probe, self.n_lists)
+        if n_probe < self.n_lists:
+            probes = np.argpartition(-centroid_scores, n_probe - 1, axis=1)[:, :n_probe]
+        else:
+            probes = np.broadcast_to(np.arange(self.n_lists), centroid_scores.shape)
+        n_candidates = max(k * RERANK_FACTOR, MIN_CANDIDATES)
+        for i in range(n_queries):
+            spans = [slice(self.list_offsets[c], self.list_offsets[c + 1]) for c in probes[i]]
+            candidates = np.concatenate([self.list_rows[span] for span in spans])
+            if candidates.size > n_candidates:
+                approx = np.concatenate([self.vectors[span] @ projected[i] for span in spans])
+                candidates = candidates[np.argpartition(-approx, n_candidates - 1)[:n_candidates]]
+            exact = (self.matrix[candidates] @ queries[i].T).toarray().ravel()
+            top = np.argsort(-exact, kind="stable")[:k]
+            rows[i, :top.size] = candidates[top]
+            scores[i, :top.size] = exact[top]
+        return rows, scores
+
+    def save(self, path):
+        """인덱스를 .npz 파일로 저장 (임시 파일에 쓴 뒤 교체)."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(
+                f,
+                format_version=ANN_FORMAT_VERSION,
+                grams=np.array(list(self.vectorizer.vocabulary), dtype=str),
+                idf=self.vectorizer.idf,
+                oov_idf=self.vectorizer.oov_idf,
+                ngram_range=np.array(self.vectorizer.ngram_range),
+                seed=self.seed,
+                matrix_data=self.matrix.data,
+                matrix_indices=self.matrix.indices,
+                matrix_indptr=self.matrix.indptr,
+                centroids=self.centroids,
+                vectors=self.vectors,
+                list_rows=self.list_rows,
+                list_offsets=self.list_offsets,
+            )
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path):
+        """save()로 저장한 인덱스를 읽음. 저장 형식 버전이 다르면 ValueError."""
+        with np.load(path, allow_pickle=False) as saved:
+            if int(saved["format_version"]) != ANN_FORMAT_VERSION:
+                raise ValueError(f"ANN 인덱스 형식 버전이 다릅니다: {int(saved['format_version'])}")
+            self = cls.__new__(cls)
+            grams = saved["grams"].tolist() if saved["grams"].size else []
+            self.vectorizer = CharTfidf.from_vocabulary(grams, saved["idf"], saved["oov_idf"], saved["ngram_range"])
+            self.matrix = sp.csr_matrix(
+                (saved["matrix_data"], saved["matrix_indices"], saved["matrix_indptr"]),
+                shape=(len(saved["matrix_indptr"]) - 1, len(grams)),
+            )
+            self.vectorizer.matrix = self.matrix
+            self.seed = int(saved["seed"])
+            self.centroids = saved["centroids"]
+            self.vectors = saved["vectors"]
+            self.list_rows = saved["list_rows"]
+            self.list_offsets = saved["list_offsets"]
+        self._projection = _projection(self.vectorizer.n_features, PROJECTION_DIM, self.seed)
+        return self
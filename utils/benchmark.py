@@ -0,0 +1,444 @@
+# utils/benchmark.py
+"""
+데이터 로딩/검색 벤치마크.
+
+    python -m utils.benchmark mmap [파일명 ...] [--columns 컬럼1,컬럼2]
+    python -m utils.benchmark sessions [파일명 ...] [--sessions 1,10,50]
+    python -m utils.benchmark search [--sizes 1000,100000] [--queries 검색어1,검색어2]
+    python -m utils.benchmark topsis [--sizes 1000,100000]
+    python -m utils.benchmark similarity [--sizes 1000,10000]
+    python -m utils.benchmark ann [--sizes 1000,10000] [--k 10] [--probes 4,16,64]
+
+mmap: 각 로딩 방식(CSV 파싱, Parquet, 메모리 매핑 Arrow, 메모리 매핑 Arrow 일부 컬럼)을
+새 프로세스에서 실행해 로드 시간과 RSS 증가량을 비교.
+sessions: 새 프로세스에서 load_data()로 세션 수만큼 공유 DataFrame의 뷰를 받아 들고 있으면서
+세션 수별 RSS 증가량과 공유 저장소 크기(shared_memory_report)를 측정. 세션이 늘어도 거의 일정해야 함.
+search: 흥행예측도서 목록을 지정한 행 수까지 복제해 n-gram 인덱스 검색, 한글 인식 검색(자모/초성/오타 허용),
+str.contains 전체 스캔의 검색어당 지연 시간을 비교.
+topsis: 흥행예측도서 목록을 복제해 가중치를 바꿨을 때 fuzzy TOPSIS 점수/순위/정렬 순서 재계산 시간을 측정.
+similarity: NYT 베스트셀러 목록을 복제해 TF-IDF 유사도 인덱스 생성, 흥행예측도서 전체의 최대 유사도 계산,
+도서 한 권 평가 시간을 측정.
+ann: NYT 베스트셀러 목록을 단어를 덜어 낸 복제본으로 늘려 IVF 근사 최근접 이웃 인덱스의 질의당 지연 시간과
+정확 검색 대비 recall@k를 n_probe별로 비교.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+DEFAULT_MMAP_FILES = ["reviews_final_with_clusters.csv", "nyt_bestseller_with_keyword.csv"]
+DEFAULT_SESSION_COUNTS = [1, 10, 50]
+SEARCH_FILE = "흥행예측도서_ranked.csv"
+SEARCH_COLUMNS = ["제목", "저자", "ISBN"]
+DEFAULT_SEARCH_SIZES = [1_000, 10_000, 100_000, 300_000]
+SIMILARITY_FILE = "nyt_bestseller_with_keyword.csv"
+DEFAULT_SIMILARITY_SIZES = [1_000, 10_000, 50_000]
+DEFAULT_ANN_PROBES = [1, 4, 16, 64]
+LOAD_MODES = ["csv", "parquet", "arrow-mmap", "arrow-mmap-columns"]
+
+
+def _rss_bytes():
+    """현재 프로세스의 RSS(바이트). Linux는 /proc, 그 외에는 최대 RSS로 대체."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    import resource
+
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _touch(df):
+    # 지연 매핑된 페이지까지 실제로 읽히도록 모든 컬럼을 한 번씩 훑음
+    for col in df.columns:
+        series = df[col]
+        if series.dtype.kind in "biufc":
+            series.sum()
+        else:
+            series.isna().sum()
+            series.astype(str).str.len().sum()
+
+
+def _measure(mode, path, columns):
+    """새 프로세스 안에서 실행: 한 가지 방식으로 로드한 뒤 시간/RSS를 JSON으로 출력."""
+    import pandas as pd
+    import pyarrow as pa
+
+    from utils.schemas import read_csv_with_schema
+
+    rss_before = _rss_bytes()
+    start = time.perf_counter()
+    if mode == "csv":
+        df = read_csv_with_schema(path)
+    elif mode == "parquet":
+        df = pd.read_parquet(path)
+    else:
+        table = pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+        if mode == "arrow-mmap-columns":
+            table = table.select([c for c in columns if c in table.column_names])
+        df = table.to_pandas(split_blocks=True)
+    load_seconds = time.perf_counter() - start
+    rss_loaded = _rss_bytes()
+    _touch(df if mode != "arrow-mmap-columns" else df[[c for c in columns if c in df.columns]])
+    rss_touched = _rss_bytes()
+    print(json.dumps({
+        "load_ms": round(load_seconds * 1000, 1),
+        "rss_after_load_mb": round((rss_loaded - rss_before) / 2**20, 1),
+        "rss_after_touch_mb": round((rss_touched - rss_before) / 2**20, 1),
+    }))
+
+
+def _prepare_snapshots(csv_path, work_dir):
+    """CSV에서 벤치마크용 Parquet / 비압축 Arrow 파일을 만들어 경로를 반환."""
+    from utils.schemas import read_csv_with_schema
+
+    stem = os.path.splitext(os.path.basename(csv_path))[0]
+    df = read_csv_with_schema(csv_path)
+    parquet_path = os.path.join(work_dir, stem + ".parquet")
+    arrow_path = os.path.join(work_dir, stem + ".arrow")
+    df.to_parquet(parquet_path, index=False)
+    df.reset_index(drop=True).to_feather(arrow_path, compression="uncompressed")
+    return {"csv": csv_path, "parquet": parquet_path, "arrow-mmap": arrow_path, "arrow-mmap-columns": arrow_path}
+
+
+def benchmark_mmap(file_names=None, data_dir="data", columns=None):
+    """파일별로 각 로딩 방식의 결과 dict 목록을 반환."""
+    results = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        for file_name in file_names or DEFAULT_MMAP_FILES:
+            csv_path = os.path.join(data_dir, file_name)
+            if not os.path.exists(csv_path):
+                print(f"건너뜀 (파일 없음): {csv_path}")
+                continue
+            paths = _prepare_snapshots(csv_path, work_dir)
+            selected = columns or _default_columns(csv_path)
+            for mode in LOAD_MODES:
+                out = subprocess.run(
+                    [sys.executable, "-m", "utils.benchmark", "_measure", mode, paths[mode],
+                     "--columns", ",".join(selected)],
+                    capture_output=True, text=True, check=True,
+                )
+                row = {"dataset": file_name, "mode": mode}
+                row.update(json.loads(out.stdout.strip().splitlines()[-1]))
+                results.append(row)
+    return results
+
+
+def _measure_sessions(file_names, counts):
+    """새 프로세스 안에서 실행: 세션 수별 RSS 증가량과 공유 저장소 크기를 JSON 목록으로 출력."""
+    from utils.data_loader import load_data, shared_memory_report
+
+    rss_before = _rss_bytes()
+    sessions, rows = [], []
+    for count in sorted(counts):
+        while len(sessions) < count:
+            views = [load_data(file_name) for file_name in file_names]
+            # 페이지처럼 세션마다 파생 컬럼을 하나 추가 (Copy-on-Write로 그 컬럼만 새로 할당됨)
+            for view in views:
+                if not view.empty:
+                    view["_session"] = len(sessions)
+            sessions.append(views)
+        rows.append({
+            "sessions": count,
+            "rss_mb": round((_rss_bytes() - rss_before) / 2**20, 1),
+            "shared_mb": round(sum(shared_memory_report().values()) / 2**20, 1),
+        })
+    print(json.dumps(rows))
+
+
+def benchmark_sessions(file_names=None, counts=None):
+    """data 폴더의 데이터셋으로 세션 수별 결과 dict 목록을 반환 (대시보드와 같은 작업 디렉터리에서 실행)."""
+    file_names = [f for f in file_names or DEFAULT_MMAP_FILES if os.path.exists(os.path.join("data", f))]
+    if not file_names:
+        print("건너뜀 (파일 없음)")
+        return []
+    out = subprocess.run(
+        [sys.executable, "-m", "utils.benchmark", "_sessions", *file_names,
+         "--sessions", ",".join(str(c) for c in counts or DEFAULT_SESSION_COUNTS)],
+        capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def _scaled_catalog(df, size):
+    """df를 size행까지 복제. ISBN에는 복제 번호를 붙여 서로 다른 값이 되게 함."""
+    import pandas as pd
+
+    repeats = -(-size // max(len(df), 1))
+    scaled = pd.concat([df] * repeats, ignore_index=True).iloc[:size]
+    if "ISBN" in scaled.columns:
+        copy_no = (scaled.index // max(len(df), 1)).astype(str)
+        scaled["ISBN"] = scaled["ISBN"].astype("string") + "-" + copy_no
+    return scaled
+
+
+def _default_queries(df):
+    # 짧은 검색어(1~2자), 제목 일부, 저자, ISBN 앞자리
+    queries = []
+    for col, length in (("제목", 1), ("제목", 2), ("제목", 4), ("저자", 2), ("ISBN", 6)):
+        if col in df.columns and df[col].notna().any():
+            queries.append(str(df[col].dropna().iloc[len(df) // 3 % df[col].notna().sum()])[:length])
+    return [q for q in queries if q]
+
+
+def benchmark_search(sizes=None, queries=None, data_dir="data", repeat=20):
+    """크기별로 인덱스 생성 시간과 검색어당 평균 지연(ms)을 측정한 dict 목록을 반환."""
+    from utils.schemas import read_csv_with_schema
+    from utils.search import BookSearchIndex, NgramIndex
+
+    csv_path = os.path.join(data_dir, SEARCH_FILE)
+    if not os.path.exists(csv_path):
+        print(f"건너뜀 (파일 없음): {csv_path}")
+        return []
+    base = read_csv_with_schema(csv_path)
+    queries = queries or _default_queries(base)
+    results = []
+    for size in sizes or DEFAULT_SEARCH_SIZES:
+        df = _scaled_catalog(base, size)
+        start = time.perf_counter()
+        index = NgramIndex.from_frame(df, SEARCH_COLUMNS)
+        build_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        korean_index = BookSearchIndex.from_frame(df, SEARCH_COLUMNS)
+        korean_build_seconds = time.perf_counter() - start
+        for query in queries:
+            start = time.perf_counter()
+            for _ in range(repeat):
+                hits = index.search(query)
+            index_ms = (time.perf_counter() - start) / repeat * 1000
+            start = time.perf_counter()
+            for _ in range(repeat):
+                korean_hits, _ = korean_index.search(query)
+            korean_ms = (time.perf_counter() - start) / repeat * 1000
+            start = time.perf_counter()
+            scan = df[
+                df["제목"].str.contains(query, case=False, na=False, regex=False) |
+                df["저자"].str.contains(query, case=False, na=False, regex=False) |
+                df["ISBN"].astype(str).str.contains(query, case=False, na=False, regex=False)
+            ]
+            scan_ms = (time.perf_counter() - start) * 1000
+            results.append({
+                "rows": size, "query": query, "hits": int(hits.size), "scan_hits": len(scan),
+                "build_s": round(build_seconds, 2), "index_ms": round(index_ms, 3), "scan_ms": round(scan_ms, 1),
+                "korean_hits": int(korean_hits.size), "korean_build_s": round(korean_build_seconds, 2),
+                "korean_ms": round(korean_ms, 3),
+            })
+    return results
+
+
+def benchmark_topsis(sizes=None, data_dir="data", repeat=5):
+    """크기별로 score_frame(점수+순위)과 정렬 순서 생성까지의 평균 시간(ms)을 측정한 dict 목록을 반환."""
+    import numpy as np
+
+    from utils.schemas import read_csv_with_schema
+    from utils.sorting import SortIndex
+    from utils.topsis import CRITERIA, score_frame
+
+    csv_path = os.path.join(data_dir, SEARCH_FILE)
+    if not os.path.exists(csv_path):
+        print(f"건너뜀 (파일 없음): {csv_path}")
+        return []
+    base = read_csv_with_schema(csv_path)
+    rng = np.random.default_rng(0)
+    results = []
+    for size in sizes or DEFAULT_SEARCH_SIZES:
+        df = _scaled_catalog(base, size)
+        score_ms = sort_ms = 0.0
+        for _ in range(repeat):
+            weights = rng.random(len(CRITERIA)) + 0.05
+            start = time.perf_counter()
+            scores = score_frame(df, weights)
+            score_ms += (time.perf_counter() - start) * 1000
+            start = time.perf_counter()
+            SortIndex(scores, scores.columns)
+            sort_ms += (time.perf_counter() - start) * 1000
+        results.append({"rows": size, "score_ms": round(score_ms / repeat, 1), "sort_ms": round(sort_ms / repeat, 1)})
+    return results
+
+
+def benchmark_similarity(sizes=None, data_dir="data", repeat=20):
+    """기준 문서 수별로 인덱스 생성(s), 흥행예측도서 전체 평가(ms), 한 권 평가(ms) 시간을 측정한 dict 목록을 반환."""
+    from utils.schemas import read_csv_with_schema
+    from utils.similarity import SimilarityIndex, document_texts
+
+    reference_path = os.path.join(data_dir, SIMILARITY_FILE)
+    books_path = os.path.join(data_dir, SEARCH_FILE)
+    for path in (reference_path, books_path):
+        if not os.path.exists(path):
+            print(f"건너뜀 (파일 없음): {path}")
+            return []
+    reference = read_csv_with_schema(reference_path)
+    texts = document_texts(read_csv_with_schema(books_path))
+    results = []
+    for size in sizes or DEFAULT_SIMILARITY_SIZES:
+        start = time.perf_counter()
+        index = SimilarityIndex.from_frame(_scaled_catalog(reference, size))
+        build_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        index.max_similarity(texts)
+        all_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        for i in range(repeat):
+            index.nearest(texts[i % len(texts):i % len(texts) + 1], k=5)
+        one_ms = (time.perf_counter() - start) / repeat * 1000
+        results.append({"reference": size, "books": len(texts), "features": index.vectorizer.n_features,
+                        "build_s": round(build_seconds, 2), "all_ms": round(all_ms, 1), "one_ms": round(one_ms, 2)})
+    return results
+
+
+def _perturbed_texts(texts, size, seed=0, keep=0.7):
+    """texts를 size개까지 늘리되, 복제본은 단어를 무작위로 덜어 내 서로 다른 문서가 되게 함 (동점 이웃 방지)."""
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    result = list(texts[:size])
+    while len(result) < size:
+        words = texts[len(result) % len(texts)].split()
+        kept = rng.random(len(words)) < keep
+        result.append(" ".join(w for w, k in zip(words, kept) if k))
+    return result
+
+
+def _recall_at_k(approx_scores, exact_scores):
+    # 동점 문서가 많은 복제 데이터에서도 맞도록 번호 대신 점수로 비교: 정확 검색 k번째 점수 이상인 근사 결과의 비율
+    threshold = exact_scores[:, -1:] - 1e-6
+    return float((approx_scores >= threshold).sum(axis=1).mean() / exact_scores.shape[1])
+
+
+def benchmark_ann(sizes=None, k=10, probes=None, data_dir="data"):
+    """기준 문서 수 × n_probe별 ANN 질의당 지연(ms)과 recall@k를 정확 검색(SimilarityIndex)과 비교한 dict 목록을 반환."""
+    from utils.ann import AnnIndex
+    from utils.schemas import read_csv_with_schema
+    from utils.similarity import SimilarityIndex, document_texts
+
+    reference_path = os.path.join(data_dir, SIMILARITY_FILE)
+    books_path = os.path.join(data_dir, SEARCH_FILE)
+    for path in (reference_path, books_path):
+        if not os.path.exists(path):
+            print(f"건너뜀 (파일 없음): {path}")
+            return []
+    reference = read_csv_with_schema(reference_path)
+    texts = document_texts(read_csv_with_schema(books_path))
+    results = []
+    for size in sizes or DEFAULT_SIMILARITY_SIZES:
+        reference_texts = _perturbed_texts(document_texts(reference), size)
+        start = time.perf_counter()
+        ann = AnnIndex(reference_texts)
+        build_seconds = time.perf_counter() - start
+        exact = SimilarityIndex(reference_texts)
+        queries = ann.vectorizer.transform(texts)
+        start = time.perf_counter()
+        _, exact_scores = exact.nearest(texts, k=k)
+        exact_ms = (time.perf_counter() - start) / len(texts) * 1000
+        for n_probe in probes or DEFAULT_ANN_PROBES:
+            start = time.perf_counter()
+            _, approx_scores = ann.search_matrix(queries, k=k, n_probe=n_probe)
+            ann_ms = (time.perf_counter() - start) / len(texts) * 1000
+            results.append({
+                "reference": size, "lists": ann.n_lists, "probes": min(n_probe, ann.n_lists),
+                "build_s": round(build_seconds, 2), "exact_ms": round(exact_ms, 3), "ann_ms": round(ann_ms, 3),
+                "recall": round(_recall_at_k(approx_scores, exact_scores), 3),
+            })
+    return results
+
+
+def _default_columns(csv_path):
+    # 일부 컬럼만 쓰는 페이지를 흉내내기 위해 앞쪽 두 컬럼을 사용
+    import pandas as pd
+
+    return list(pd.read_csv(csv_path, nrows=0).columns[:2])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="K-소설 대시보드 데이터 로딩 벤치마크")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    mmap_parser = sub.add_parser("mmap", help="CSV / Parquet / 메모리 매핑 Arrow 로딩 비교")
+    mmap_parser.add_argument("files", nargs="*")
+    mmap_parser.add_argument("--data-dir", default="data")
+    mmap_parser.add_argument("--columns", default=None)
+
+    sessions_parser = sub.add_parser("sessions", help="동시 세션 수에 따른 RSS / 공유 저장소 크기 측정")
+    sessions_parser.add_argument("files", nargs="*")
+    sessions_parser.add_argument("--sessions", default=None)
+
+    search_parser = sub.add_parser("search", help="n-gram 인덱스 검색 vs str.contains 스캔 지연 시간 비교")
+    search_parser.add_argument("--sizes", default=None)
+    search_parser.add_argument("--queries", default=None)
+    search_parser.add_argument("--data-dir", default="data")
+
+    topsis_parser = sub.add_parser("topsis", help="가중치 변경 시 fuzzy TOPSIS 재계산 시간 측정")
+    topsis_parser.add_argument("--sizes", default=None)
+    topsis_parser.add_argument("--data-dir", default="data")
+
+    similarity_parser = sub.add_parser("similarity", help="TF-IDF 유사도 인덱스 생성/평가 시간 측정")
+    similarity_parser.add_argument("--sizes", default=None)
+    similarity_parser.add_argument("--data-dir", default="data")
+
+    ann_parser = sub.add_parser("ann", help="IVF 근사 최근접 이웃 검색의 지연 시간과 recall@k 측정")
+    ann_parser.add_argument("--sizes", default=None)
+    ann_parser.add_argument("--k", type=int, default=10)
+    ann_parser.add_argument("--probes", default=None)
+    ann_parser.add_argument("--data-dir", default="data")
+
+    measure_parser = sub.add_parser("_measure")
+    measure_parser.add_argument("mode", choices=LOAD_MODES)
+    measure_parser.add_argument("path")
+    measure_parser.add_argument("--columns", default="")
+
+    measure_sessions_parser = sub.add_parser("_sessions")
+    measure_sessions_parser.add_argument("files", nargs="+")
+    measure_sessions_parser.add_argument("--sessions", default="")
+
+    args = parser.parse_args(argv)
+    if args.command == "_measure":
+        _measure(args.mode, args.path, [c for c in args.columns.split(",") if c])
+        return
+    if args.command == "_sessions":
+        _measure_sessions(args.files, [int(c) for c in args.sessions.split(",") if c])
+        return
+    if args.command == "mmap":
+        columns = args.columns.split(",") if args.columns else None
+        results = benchmark_mmap(args.files, args.data_dir, columns)
+        for row in results:
+            print(f"{row['dataset']:<40} {row['mode']:<20} load {row['load_ms']:>8.1f} ms  "
+                  f"RSS +{row['rss_after_load_mb']:>7.1f} MB (접근 후 +{row['rss_after_touch_mb']:.1f} MB)")
+    if args.command == "sessions":
+        counts = [int(c) for c in args.sessions.split(",")] if args.sessions else None
+        for row in benchmark_sessions(args.files, counts):
+            print(f"세션 {row['sessions']:>4}개  RSS +{row['rss_mb']:>7.1f} MB  공유 저장소 {row['shared_mb']:>7.1f} MB")
+    if args.command == "search":
+        sizes = [int(s) for s in args.sizes.split(",")] if args.sizes else None
+        queries = args.queries.split(",") if args.queries else None
+        for row in benchmark_search(sizes, queries, args.data_dir):
+            print(f"{row['rows']:>9,}행  {row['query']!r:<16} 결과 {row['hits']:>7,} (스캔 {row['scan_hits']:>7,})  "
+                  f"인덱스 {row['index_ms']:>8.3f} ms  스캔 {row['scan_ms']:>8.1f} ms  (생성 {row['build_s']} s)  "
+                  f"한글 검색 {row['korean_ms']:>8.3f} ms / {row['korean_hits']:,}건 (생성 {row['korean_build_s']} s)")
+    if args.command == "topsis":
+        sizes = [int(s) for s in args.sizes.split(",")] if args.sizes else None
+        for row in benchmark_topsis(sizes, args.data_dir):
+            print(f"{row['rows']:>9,}행  점수+순위 {row['score_ms']:>7.1f} ms  정렬 순서 {row['sort_ms']:>7.1f} ms")
+
+    if args.command == "similarity":
+        sizes = [int(s) for s in args.sizes.split(",")] if args.sizes else None
+        for row in benchmark_similarity(sizes, args.data_dir):
+            print(f"기준 {row['reference']:>7,}건 (n-gram {row['features']:,}개)  생성 {row['build_s']:>6.2f} s  "
+                  f"{row['books']:,}권 평가 {row['all_ms']:>8.1f} ms  한 권 {row['one_ms']:>6.2f} ms")
+
+    if args.command == "ann":
+        sizes = [int(s) for s in args.sizes.split(",")] if args.sizes else None
+        probes = [int(p) for p in args.probes.split(",")] if args.probes else None
+        for row in benchmark_ann(sizes, args.k, probes, args.data_dir):
+            print(f"기준 {row['reference']:>7,}건 (리스트 {row['lists']:,}개, 생성 {row['build_s']:.2f} s)  "
+                  f"n_probe {row['probes']:>4}  recall@{args.k} {row['recall']:.3f}  "
+                  f"질의당 ANN {row['ann_ms']:>7.3f} ms / 정확 {row['exact_ms']:>7.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# utils/bitmaps.py
+"""
+범주형 컬럼 필터용 비트맵 인덱스.
+
+컬럼 값마다 "이 값을 가진 행"을 비트셋(np.packbits로 압축한 uint8 배열, 행 8개당 1바이트)으로 한 번만 만들어 두고,
+여러 값을 고르는 필터(st.pills 다중 선택 등)는 비트셋 OR, 다른 필터(검색 결과 등)와의 결합은 AND로 처리.
+"""
+import numpy as np
+import pandas as pd
+
+
+class BitmapIndex:
+    """
+    columns별 {값: 비트셋}.
+    mask()/rows()의 행 번호는 인덱스를 만든 df의 위치(iloc)와 같음.
+    """
+
+    def __init__(self, df, columns):
+        self.n_rows = len(df)
+        self._bitmaps = {}
+        for col in columns:
+            if col not in df.columns:
+                continue
+            codes, uniques = pd.factorize(df[col])
+            # 값별 행 번호를 한 번의 정렬로 나눈 뒤 비트셋으로 압축 (결측은 코드 -1로 제외)
+            order = np.argsort(codes, kind="stable")
+            bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+            bitmaps = {}
+            for code, value in enumerate(uniques.tolist()):
+                bits = np.zeros(self.n_rows, dtype=bool)
+                bits[order[bounds[code]:bounds[code + 1]]] = True
+                bitmaps[value] = np.packbits(bits)
+            try:
+                ordered = sorted(bitmaps)
+            except TypeError:
+                ordered = sorted(bitmaps, key=str)
+            self._bitmaps[col] = {value: bitmaps[value] for value in ordered}
+
+    def __contains__(self, column):
+        return column in self._bitmaps
+
+    def values(self, column):
+        """컬럼에 있는 값 목록 (결측 제외, 정렬됨). 필터 위젯의 선택지로 사용."""
+        return list(self._bitmaps.get(column, {}))
+
+    def bitmap(self, column, values):
+        """values 중 하나를 가진 행의 비트셋 (OR). 색인에 없는 값은 무시."""
+        result = np.zeros((self.n_rows + 7) // 8, dtype=np.uint8)
+        bitmaps = self._bitmaps.get(column, {})
+        for value in values:
+            if value in bitmaps:
+                np.bitwise_or(result, bitmaps[value], out=result)
+        return result
+
+    def mask(self, column, values):
+        """
+        values 중 하나를 가진 행의 bool 마스크 (isin과 같음).
+        values가 비어 있으면 필터를 적용하지 않는다는 뜻으로 None을 반환.
+        """
+        if not values:
+            return None
+        return np.unpackbits(self.bitmap(column, values), count=self.n_rows).astype(bool)
+
+    def rows(self, column, values):
+        """values 중 하나를 가진 행 번호 배열 (오름차순)."""
+        return np.flatnonzero(np.unpackbits(self.bitmap(column, values), count=self.n_rows))
+
+    def count(self, column, values):
+        """values 중 하나를 가진 행 수."""
+        return int(np.unpackbits(self.bitmap(column, values), count=self.n_rows).sum())
+
+
+def combine_masks(*masks):
+    """bool 마스크들의 AND. None(필터 없음)은 건너뛰며, 모두 None이면 None."""
+    result = None
+    for mask in masks:
+        if mask is not None:
+            result = mask if result is None else result & mask
+    return result
@@ -0,0 +1,85 @@
+# utils/cube.py
+"""
+분석 카테고리(장르/전개/등장인물/주제/배경/분위기)별 라벨 분포 큐브.
+
+(분석 카테고리, 라벨) → 도서 수를 데이터셋 버전마다 한 번만 집계하고, 표시용 라벨(이모지 + 한글명)도
+행마다가 아니라 고유 라벨마다 한 번만 만들어 둠. success, primary_genre 같은 조각(slice) 컬럼 값별 분포도
+같이 집계하므로, 카테고리나 조각을 바꿔도 미리 만든 표를 꺼내기만 함.
+"""
+import pandas as pd
+
+# 드릴다운에 사용하는 조각 컬럼 (있는 컬럼만)
+SLICE_COLUMNS = ["success", "primary_genre"]
+DISTRIBUTION_COLUMNS = ["label", "emoji", "name", "display", "count"]
+
+
+def _empty_distribution():
+    return pd.DataFrame({
+        "label": pd.Series(dtype="object"), "emoji": pd.Series(dtype="object"),
+        "name": pd.Series(dtype="object"), "display": pd.Series(dtype="object"),
+        "count": pd.Series(dtype="int64"),
+    })
+
+
+class DistributionCube:
+    """
+    facets: {분석 카테고리: {"col": 컬럼명, "emoji": {라벨: 이모지}, "kor": {라벨: 한글명}}} (페이지의 analysis_map 형태).
+    emoji/kor에 없는 라벨은 default_emoji와 원래 라벨을 사용.
+    """
+
+    def __init__(self, df, facets, slices=SLICE_COLUMNS, default_emoji=""):
+        self.facets = list(facets)
+        self.slices = [c for c in slices if c in df.columns]
+        self._tables = {}
+        self._merged = {}
+        self._slice_values = {}
+        for column in self.slices:
+            self._slice_values[column] = pd.Series(df[column].dropna().unique()).sort_values().tolist()
+        for facet, config in facets.items():
+            column = config.get("col")
+            if column not in df.columns:
+                continue
+            labels = df[column].astype("string")
+            tables = {(None, None): labels.value_counts()}
+            for slice_column in self.slices:
+                # 조각 값별 분포를 groupby 한 번으로 집계
+                grouped = labels.groupby(df[slice_column], observed=True, sort=False).value_counts()
+                for value, counts in grouped.groupby(level=0, observed=True, sort=False):
+                    tables[(slice_column, value)] = counts.droplevel(0)
+            # 표시용 라벨은 데이터에 나온 고유 라벨마다 한 번만 만듦
+            emoji_map, kor_map = config.get("emoji") or {}, config.get("kor") or {}
+            unique_labels = tables[(None, None)].index
+            emoji = {label: emoji_map.get(label, default_emoji) for label in unique_labels}
+            name = {label: kor_map.get(label, label) for label in unique_labels}
+            for key, counts in tables.items():
+                table = pd.DataFrame({
+                    "label": counts.index.astype(object),
+                    "emoji": counts.index.map(emoji).astype(object),
+                    "name": counts.index.map(name).astype(object),
+                    "count": counts.to_numpy(dtype="int64"),
+                })
+                table["display"] = table["emoji"] + " " + table["name"]
+                table = table.sort_values("count", ascending=False, kind="stable").reset_index(drop=True)
+                self._tables[(facet,) + key] = table[DISTRIBUTION_COLUMNS]
+                # 표시용 라벨이 같은 라벨끼리 합친 분포 (서로 다른 라벨이 같은 이름으로 표시될 때)
+                merged = table.groupby("display", sort=False, as_index=False).agg(
+                    label=("label", "first"), emoji=("emoji", "first"), name=("name", "first"), count=("count", "sum"))
+                self._merged[(facet,) + key] = (
+                    merged.sort_values("count", ascending=False, kind="stable").reset_index(drop=True)[DISTRIBUTION_COLUMNS]
+                )
+
+    def slice_values(self, slice_column):
+        """조각 컬럼의 값 목록 (정렬). 모르는 컬럼이면 빈 목록."""
+        return list(self._slice_values.get(slice_column, []))
+
+    def distribution(self, facet, slice_column=None, slice_value=None, merge_display=False):
+        """
+        분석 카테고리의 라벨 분포 DataFrame (label, emoji, name, display, count; 도서 수 내림차순, 결측 제외).
+        slice_column/slice_value를 주면 그 조각의 분포. merge_display=True면 표시용 라벨이 같은 행을 합침.
+        반환값은 캐시된 표이므로 수정하지 말 것. 데이터가 없으면 빈 DataFrame.
+        """
+        if slice_column is None:
+            slice_value = None
+        tables = self._merged if merge_display else self._tables
+        table = tables.get((facet, slice_column, slice_value))
+        return table if table is not None else _empty_distribution()
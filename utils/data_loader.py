@@ -1,8 +1,22 @@
 # utils/data_loader.py
+import hashlib
+import json
+import logging
+import os
+import unicodedata
+
 import pandas as pd
 import streamlit as st
-import gdown
-import os
+
+from utils.prefetch import Prefetcher
+from utils.schemas import apply_schema, read_csv_with_schema, schema_fingerprint
+from utils.sources import source_from_env
+
+# 공유 DataFrame의 얕은 복사본(뷰)을 안전하게 나눠주기 위해 Copy-on-Write를 켬.
+# 페이지에서 컬럼을 추가/수정하면 그 세션의 뷰만 복사되고 공유 원본은 바뀌지 않음.
+pd.set_option("mode.copy_on_write", True)
+
+logger = logging.getLogger(__name__)
 
 # Google Drive 파일 매핑 (파일명: 공유 링크)
 GOOGLE_DRIVE_LINKS = {
@@ -15,25 +29,305 @@ GOOGLE_DRIVE_LINKS = {
     "흥행예측도서_ranked.csv": "https://drive.google.com/file/d/101J67nfFOxgWMQb8M57BFQO6I1Pogjjf/view?usp=drive_link"
 }
 
-@st.cache_data
-def load_data(file_name):
+# 대시보드가 사용하는 데이터셋 파일 목록
+DATASET_FILES = list(GOOGLE_DRIVE_LINKS)
+
+# 스냅샷(파싱된 CSV의 Parquet 사본) 저장 위치
+SNAPSHOT_DIR = os.path.join("data", ".snapshots")
+# 스냅샷 포맷이 바뀌면 올려서 기존 스냅샷을 무효화
+SNAPSHOT_FORMAT_VERSION = 2
+
+# 스냅샷을 비압축 Arrow IPC(Feather) 파일로 저장해 메모리 매핑으로 읽을 대용량 데이터셋.
+# 여러 워커가 OS 페이지 캐시를 공유하고, 접근한 컬럼만 실제 메모리에 올라옴.
+# KNOVEL_MMAP_DATASETS 환경변수(쉼표 구분 파일명, "none"이면 사용 안 함)로 변경 가능.
+MMAP_DATASETS = {"reviews_final_with_clusters.csv", "nyt_bestseller_with_keyword.csv"}
+
+
+def _mmap_datasets():
+    spec = os.environ.get("KNOVEL_MMAP_DATASETS")
+    if spec is None:
+        return MMAP_DATASETS
+    if spec.strip().lower() in ("", "none"):
+        return set()
+    return {name.strip() for name in spec.split(",") if name.strip()}
+
+
+def is_mmap_dataset(file_name):
+    return os.path.basename(file_name) in _mmap_datasets()
+
+
+def _file_sha256(path, chunk_size=1 << 20):
+    """파일 내용의 SHA-256 해시를 반환."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _snapshot_paths(file_path):
+    """원본 CSV 경로에 대응하는 (스냅샷 경로, 메타데이터 경로)를 반환."""
+    stem = os.path.splitext(os.path.basename(file_path))[0]
+    base = os.path.join(SNAPSHOT_DIR, stem)
+    extension = ".arrow" if is_mmap_dataset(file_path) else ".parquet"
+    return base + extension, base + ".meta.json"
+
+
+def _read_mmap_table(snapshot_path, columns=None):
+    """Arrow IPC 스냅샷을 메모리 매핑으로 열어 pyarrow Table로 반환 (데이터 복사 없음)."""
+    import pyarrow as pa
+
+    table = pa.ipc.open_file(pa.memory_map(snapshot_path, "r")).read_all()
+    if columns is not None:
+        table = table.select([c for c in columns if c in table.column_names])
+    return table
+
+
+def _mmap_table_to_pandas(table):
+    # split_blocks: 결측 없는 수치형 컬럼은 매핑된 버퍼를 그대로 사용,
+    # string[pyarrow] 컬럼은 매핑된 Arrow 배열을 감싸기만 하므로 복사가 일어나지 않음
+    return table.to_pandas(split_blocks=True)
+
+
+def _read_meta(meta_path):
+    try:
+        with open(meta_path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_meta(meta_path, meta):
+    tmp_path = meta_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False)
+    os.replace(tmp_path, meta_path)
+
+
+# 원본 파일 경로 → (크기, 수정시각, SHA-256). 스냅샷 메타가 없을 때(저장 실패 등)도 매번 해시하지 않도록 보관
+_SHA256_CACHE = {}
+
+
+def _source_fingerprint(file_path, meta):
     """
-    Google Drive에서 파일을 다운로드하여 DataFrame으로 반환.
-    파일이 이미 있으면 재다운로드하지 않음.
+    원본 파일의 (크기, 수정시각, 해시) 지문을 계산.
+    크기와 수정시각이 메타데이터나 메모리에 보관한 값과 같으면 해시 계산을 생략하고 기존 값을 재사용.
+    """
+    stat = os.stat(file_path)
+    fingerprint = {
+        "format_version": SNAPSHOT_FORMAT_VERSION,
+        "schema": schema_fingerprint(file_path),
+        "source_size": stat.st_size,
+        "source_mtime_ns": stat.st_mtime_ns,
+    }
+    if (
+        meta
+        and meta.get("format_version") == SNAPSHOT_FORMAT_VERSION
+        and meta.get("source_size") == stat.st_size
+        and meta.get("source_mtime_ns") == stat.st_mtime_ns
+    ):
+        fingerprint["source_sha256"] = meta.get("source_sha256")
+        return fingerprint
+    path = os.path.abspath(file_path)
+    cached = _SHA256_CACHE.get(path)
+    if cached is not None and cached[:2] == (stat.st_size, stat.st_mtime_ns):
+        fingerprint["source_sha256"] = cached[2]
+    else:
+        fingerprint["source_sha256"] = _file_sha256(file_path)
+        _SHA256_CACHE[path] = (stat.st_size, stat.st_mtime_ns, fingerprint["source_sha256"])
+    return fingerprint
+
+
+def _valid_snapshot(file_path):
+    """
+    유효한 스냅샷이 있으면 (스냅샷 경로, 지문)을, 없으면 (None, 지문)을 반환.
+    내용 해시가 같다면 mtime만 바뀐 경우에도 스냅샷을 재사용.
+    """
+    snapshot_path, meta_path = _snapshot_paths(file_path)
+    meta = _read_meta(meta_path)
+    fingerprint = _source_fingerprint(file_path, meta)
+    if (
+        meta is None
+        or not os.path.exists(snapshot_path)
+        or meta.get("format_version") != SNAPSHOT_FORMAT_VERSION
+        or meta.get("schema") != fingerprint["schema"]
+        or meta.get("source_sha256") != fingerprint["source_sha256"]
+    ):
+        return None, fingerprint
+    if meta != fingerprint:
+        # 내용은 같고 크기/mtime만 갱신된 경우 다음 로드에서 해시 계산을 생략하도록 메타만 갱신
+        _write_meta(meta_path, fingerprint)
+    return snapshot_path, fingerprint
+
+
+def _read_snapshot(file_path):
+    """유효한 스냅샷이 있으면 (DataFrame, 지문)을, 없거나 읽지 못하면 (None, 지문)을 반환."""
+    snapshot_path, fingerprint = _valid_snapshot(file_path)
+    if snapshot_path is None:
+        return None, fingerprint
+    try:
+        if snapshot_path.endswith(".arrow"):
+            return _mmap_table_to_pandas(_read_mmap_table(snapshot_path)), fingerprint
+        # Parquet은 문자열 범주만 범주형으로 되살리므로 숫자 범주(cluster 등)는 스키마로 다시 맞춤
+        return apply_schema(pd.read_parquet(snapshot_path), file_path), fingerprint
+    except Exception:
+        return None, fingerprint
+
+
+def _write_snapshot(file_path, df, fingerprint):
+    """파싱한 DataFrame을 Parquet 스냅샷으로 저장. 실패해도 로드는 계속 진행."""
+    snapshot_path, meta_path = _snapshot_paths(file_path)
+    try:
+        os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+        tmp_path = snapshot_path + ".tmp"
+        if snapshot_path.endswith(".arrow"):
+            # 메모리 매핑으로 바로 읽을 수 있도록 비압축으로 저장
+            df.reset_index(drop=True).to_feather(tmp_path, compression="uncompressed")
+        else:
+            df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, snapshot_path)
+        _write_meta(meta_path, fingerprint)
+    except Exception as e:
+        # pyarrow 미설치, 직렬화 불가 컬럼 등: 스냅샷 없이 CSV 경로로 계속 동작
+        logger.warning("스냅샷 저장 실패 (%s): %s", os.path.basename(file_path), e)
+
+
+def _normalize_name(file_name):
+    """
+    'data/xxx.csv'처럼 폴더를 포함해 호출해도 같은 파일을 가리키도록 파일명만 사용하고,
+    macOS에서 저장된 소스의 NFD 한글 파일명도 같은 키가 되도록 NFC로 정규화.
+    """
+    return unicodedata.normalize("NFC", os.path.basename(file_name))
+
+
+@st.cache_resource
+def get_prefetcher():
+    """
+    프로세스 전체에서 공유하는 Prefetcher.
+    처음 호출될 때 DATASET_FILES의 모든 파일을 백그라운드에서 동시에 내려받기 시작.
+    데이터 소스는 KNOVEL_DATA_SOURCE 환경변수로 선택 (기본값: Google Drive, utils.sources 참고).
+    """
+    source = source_from_env(GOOGLE_DRIVE_LINKS)
+    return Prefetcher(source, DATASET_FILES, data_dir="data").start()
+
+
+def dataset_version(file_name):
+    """
+    데이터셋 내용의 버전(원본 CSV의 SHA-256)을 반환.
+    파생 인덱스/캐시의 키로 사용. 파일이 없으면 None.
+    """
+    file_name = _normalize_name(file_name)
+    file_path = os.path.join("data", file_name)
+    if not os.path.exists(file_path):
+        return None
+    _, meta_path = _snapshot_paths(file_path)
+    return _source_fingerprint(file_path, _read_meta(meta_path))["source_sha256"]
+
+
+# 공유 저장소에 올라간 데이터셋별 메모리 사용량 (바이트)
+_SHARED_BYTES = {}
+
+
+def _download(file_name):
+    """
+    data 폴더에 파일이 없으면 데이터 소스에서 받아 경로를 반환.
+    등록되지 않은 파일명이거나 다운로드에 실패하면 오류를 표시하고 None (다음 호출에서 다시 시도).
     """
     # data 폴더가 없으면 생성
     os.makedirs("data", exist_ok=True)
     file_path = os.path.join("data", file_name)
-    # 파일이 없으면 Google Drive에서 다운로드
-    if not os.path.exists(file_path):
-        url = GOOGLE_DRIVE_LINKS.get(file_name)
-        if url is None:
-            st.error(f"Google Drive 링크가 등록되지 않은 파일명입니다: {file_name}")
-            return pd.DataFrame()
-        with st.spinner(f"{file_name} 다운로드 중..."):
-            gdown.download(url, file_path, quiet=False, fuzzy=True)
+    if os.path.exists(file_path):
+        return file_path
+    if file_name not in DATASET_FILES:
+        st.error(f"등록되지 않은 데이터셋 파일명입니다: {file_name}")
+        return None
+    with st.spinner(f"{file_name} 다운로드 중..."):
+        try:
+            get_prefetcher().wait(file_name)
+        except Exception as e:
+            st.error(f"{file_name} 다운로드 중 오류 발생: {e}")
+            return None
+    return file_path
+
+
+def _parse_csv(file_path, fingerprint):
+    """CSV를 스키마대로 파싱하고 스냅샷으로 저장. 파싱에 실패하면 오류를 표시하고 None."""
     try:
-        return pd.read_csv(file_path)
+        df = read_csv_with_schema(file_path)
     except Exception as e:
         st.error(f"CSV 파일을 읽는 중 오류 발생: {e}")
+        return None
+    _write_snapshot(file_path, df, fingerprint)
+    return df
+
+
+def _ensure_snapshot(file_path):
+    """
+    공유 DataFrame을 만들지 않고 스냅샷만 준비해 경로를 반환.
+    스냅샷이 없으면 CSV를 한 번 파싱해 저장하고 파싱 결과는 보관하지 않음. 파싱/저장에 실패하면 None.
+    """
+    snapshot_path, fingerprint = _valid_snapshot(file_path)
+    if snapshot_path is None and _parse_csv(file_path, fingerprint) is not None:
+        snapshot_path, _ = _valid_snapshot(file_path)
+    return snapshot_path
+
+
+@st.cache_resource(show_spinner=False, max_entries=16)
+def _load_shared(file_name, version):
+    """
+    데이터셋을 프로세스당 한 번만 읽어 모든 세션이 공유하는 DataFrame으로 보관.
+    st.cache_data와 달리 세션마다 pickle 복사본을 만들지 않음.
+    version(dataset_version)은 캐시 키로만 사용하며, 원본이 바뀌면 다음 호출에서 다시 읽음.
+    """
+    file_path = os.path.join("data", file_name)
+    df, fingerprint = _read_snapshot(file_path)
+    if df is None:
+        df = _parse_csv(file_path, fingerprint)
+        if df is None:
+            return pd.DataFrame()
+    _SHARED_BYTES[file_name] = int(df.memory_usage(deep=True).sum())
+    return df
+
+
+@st.cache_resource(show_spinner=False, max_entries=16)
+def _load_columns_shared(file_name, columns, version):
+    if is_mmap_dataset(file_name):
+        # 공유 DataFrame 없이 스냅샷을 메모리 매핑해 요청한 컬럼만 꺼냄 (접근한 페이지만 메모리에 올라옴)
+        snapshot_path = _ensure_snapshot(os.path.join("data", file_name))
+        if snapshot_path is not None and snapshot_path.endswith(".arrow"):
+            return _mmap_table_to_pandas(_read_mmap_table(snapshot_path, columns))
+    df = _load_shared(file_name, version)
+    return df[[c for c in columns if c in df.columns]]
+
+
+def load_columns(file_name, columns):
+    """
+    데이터셋의 일부 컬럼만 DataFrame으로 반환 (없는 컬럼은 제외).
+    메모리 매핑 데이터셋은 전체 테이블을 만들지 않고 요청한 컬럼의 페이지만 읽으며, 그 외에는 공유 DataFrame에서 선택.
+    행 순서는 load_data(file_name)와 같고, 프로세스에서 공유하는 DataFrame의 얕은 복사본을 반환.
+    """
+    file_name = _normalize_name(file_name)
+    if _download(file_name) is None:
+        return pd.DataFrame()
+    return _load_columns_shared(file_name, tuple(columns), dataset_version(file_name)).copy(deep=False)
+
+
+def shared_memory_report():
+    """공유 저장소에 올라간 {파일명: 바이트}. 세션 수와 무관하게 일정해야 함 (python -m utils.benchmark sessions)."""
+    return dict(_SHARED_BYTES)
+
+
+def load_data(file_name):
+    """
+    데이터 소스(기본값: Google Drive)에서 파일을 다운로드하여 DataFrame으로 반환.
+    파일이 이미 있으면 재다운로드하지 않음.
+    다운로드는 공유 Prefetcher가 모든 파일을 동시에 받으며, 여기서는 요청한 파일만 기다림.
+    CSV는 utils.schemas에 선언된 dtype(범주형, Arrow 문자열, 다운캐스트 수치형)으로 읽음.
+    처음 읽은 CSV는 Parquet 스냅샷으로 저장하고, 이후에는 원본의
+    크기/수정시각/내용 해시와 스키마가 같을 때 스냅샷을 대신 읽음.
+    반환값은 프로세스 공유 DataFrame의 얕은 복사본(Copy-on-Write 뷰)으로, 데이터를 복사하지 않음.
+    """
+    file_name = _normalize_name(file_name)
+    if _download(file_name) is None:
         return pd.DataFrame()
+    return _load_shared(file_name, dataset_version(file_name)).copy(deep=False)
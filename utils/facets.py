@@ -0,0 +1,89 @@
+# utils/facets.py
+"""
+NYT 스토리 요소 컬럼(plot_elements 등)의 {라벨: 가중치} 문자열을 행마다 한 번만 파싱해
+(book, facet, label, weight) 형태의 긴(long) 테이블로 만들고,
+대표값(primary_*)과 상위 k개 요소를 벡터 연산으로 계산.
+"""
+import ast
+import json
+
+import numpy as np
+import pandas as pd
+
+
+def parse_mapping(text):
+    """
+    '{"survival": 0.8}' 또는 "{'survival': 0.8, \"hero's journey\": 0.2}" 같은 문자열을 dict로 변환.
+    JSON을 먼저 시도하고, 작은따옴표(파이썬 repr) 형식은 ast.literal_eval로 처리하므로
+    키 안의 아포스트로피도 깨지지 않음. 해석할 수 없으면 None.
+    """
+    if not isinstance(text, str):
+        return None
+    try:
+        value = json.loads(text)
+    except ValueError:
+        try:
+            value = ast.literal_eval(text)
+        except (ValueError, SyntaxError):
+            return None
+    return value if isinstance(value, dict) else None
+
+
+def explode_facets(df, columns):
+    """
+    columns의 각 셀을 한 번씩만 파싱해 긴 테이블을 반환.
+    - book: df에서의 행 위치 (int32)
+    - facet: 원본 컬럼명 (category)
+    - label: 요소 라벨 (category)
+    - weight: 가중치 (float32). 수치로 바꿀 수 없는 항목은 제외
+    """
+    columns = [c for c in columns if c in df.columns]
+    books, facets, labels, weights = [], [], [], []
+    cells = zip(*(df[c].tolist() for c in columns)) if columns else ()
+    for book, row in enumerate(cells):
+        for facet, text in zip(columns, row):
+            mapping = parse_mapping(text)
+            if not mapping:
+                continue
+            for label, weight in mapping.items():
+                try:
+                    weight = float(weight)
+                except (TypeError, ValueError):
+                    continue
+                books.append(book)
+                facets.append(facet)
+                labels.append(str(label))
+                weights.append(weight)
+    return pd.DataFrame({
+        "book": np.asarray(books, dtype="int32"),
+        "facet": pd.Categorical(facets, categories=columns),
+        "label": pd.Categorical(labels),
+        "weight": np.asarray(weights, dtype="float32"),
+    })
+
+
+def top_k_facets(long_df, k=3):
+    """
+    책·요소별 가중치 상위 k개 행. rank 컬럼(1부터)을 추가해 반환.
+    가중치가 같으면 원래 순서(문자열 안의 순서)를 유지.
+    """
+    ordered = long_df.sort_values(["book", "facet", "weight"], ascending=[True, True, False], kind="stable")
+    rank = ordered.groupby(["book", "facet"], observed=True).cumcount() + 1
+    top = ordered[rank <= k].copy()
+    top["rank"] = rank[rank <= k].astype("int8")
+    return top.reset_index(drop=True)
+
+
+def primary_facets(long_df, n_books, column_names):
+    """
+    책마다 요소별 최댓값 라벨(argmax)을 구해 {새 컬럼명: 원본 컬럼명} 순서의 DataFrame으로 반환.
+    column_names: {새 컬럼명(primary_*): 원본 컬럼명}. 값이 없는 책은 결측.
+    """
+    top = top_k_facets(long_df, k=1)
+    result = pd.DataFrame(index=pd.RangeIndex(n_books))
+    for new, old in column_names.items():
+        rows = top[top["facet"] == old]
+        column = pd.Series(None, index=result.index, dtype="object")
+        column.iloc[rows["book"].to_numpy()] = rows["label"].astype(str).to_numpy()
+        result[new] = column
+    return result
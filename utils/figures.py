@@ -0,0 +1,163 @@
+# utils/figures.py
+"""
+Plotly 차트 figure 캐시.
+
+테마와 무관한 figure를 (데이터셋 버전, 분석 카테고리, 차트 종류) 키마다 한 번만 만들어 JSON 문자열로 보관하고,
+테마(Light/Dark)는 꺼낼 때 레이아웃/trace 속성을 덮어쓰는 것으로만 적용.
+표와 무관한 클릭 등으로 재실행될 때 바뀌지 않은 차트는 JSON을 dict로 읽는 비용만 듦.
+적중/미적중 횟수를 세어 stats()로 확인할 수 있음 (KNOVEL_FIGURE_STATS=1이면 페이지 하단에 표시).
+chart_tabs()는 st.tabs와 달리 선택한 탭의 차트만 계산해 보내도록 탭 선택만 돌려줌.
+"""
+import copy
+import json
+import os
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
+import plotly.io as pio
+import streamlit as st
+
+# 프로세스 전체에서 보관할 figure 수 (오래 쓰지 않은 것부터 버림)
+MAX_FIGURES = 256
+# 테마별 Plotly 템플릿과 배경/글자색
+THEME_TEMPLATES = {"Light": "plotly_white", "Dark": "plotly_dark"}
+THEME_COLORS = {
+    "Light": {"background": "white", "text": "black"},
+    "Dark": {"background": "#262730", "text": "white"},
+}
+
+
+def _merge(base, overlay):
+    """overlay의 값을 base에 재귀적으로 덮어씀 (dict끼리만 합치고 나머지는 교체)."""
+    for key, value in overlay.items():
+        if isinstance(value, dict) and isinstance(base.get(key), dict):
+            _merge(base[key], value)
+        else:
+            base[key] = copy.deepcopy(value)
+    return base
+
+
+@lru_cache(maxsize=None)
+def _template(name):
+    return pio.templates[name].to_plotly_json()
+
+
+def theme_layout(theme, colors=True):
+    """
+    테마 레이아웃 덮어쓰기 dict. colors=True면 배경/제목/범례/축 글자색까지 THEME_COLORS로 맞추고,
+    False면 템플릿만 바꿈.
+    """
+    layout = {"template": _template(THEME_TEMPLATES.get(theme, "plotly_white"))}
+    if colors:
+        palette = THEME_COLORS.get(theme, THEME_COLORS["Light"])
+        text = {"font": {"color": palette["text"]}}
+        layout.update(
+            paper_bgcolor=palette["background"],
+            plot_bgcolor=palette["background"],
+            font={"color": palette["text"]},
+            title=text,
+            legend=text,
+            xaxis={"tickfont": {"color": palette["text"]}, "title": text},
+            yaxis={"tickfont": {"color": palette["text"]}, "title": text},
+        )
+    return layout
+
+
+def themed(spec, layout=None, traces=None):
+    """
+    캐시에서 꺼낸 figure dict에 레이아웃(layout)과 모든 trace 공통 속성(traces) 덮어쓰기를 적용.
+    layout의 template은 합치지 않고 통째로 바꿈.
+    """
+    if layout:
+        layout = dict(layout)
+        template = layout.pop("template", None)
+        _merge(spec.setdefault("layout", {}), layout)
+        if template is not None:
+            spec["layout"]["template"] = template
+    if traces:
+        for trace in spec.get("data", []):
+            _merge(trace, traces)
+    return spec
+
+
+class FigureCache:
+    """키별 figure JSON을 보관하는 LRU 캐시. 여러 세션(스레드)에서 함께 사용."""
+
+    def __init__(self, max_entries=MAX_FIGURES):
+        self.max_entries = max_entries
+        self._specs = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, build):
+        """
+        key의 figure dict (매번 새 dict라 덮어써도 됨). 없으면 build()로 만든 figure를 JSON으로 저장.
+        build()가 None을 반환하면 저장하지 않고 None.
+        """
+        with self._lock:
+            spec = self._specs.get(key)
+            if spec is not None:
+                self._specs.move_to_end(key)
+                self.hits += 1
+        if spec is None:
+            fig = build()
+            if fig is None:
+                return None
+            spec = fig.to_json()
+            with self._lock:
+                self.misses += 1
+                self._specs[key] = spec
+                while len(self._specs) > self.max_entries:
+                    self._specs.popitem(last=False)
+        return json.loads(spec)
+
+    def stats(self):
+        """적중/미적중 횟수, 적중률, 보관 중인 figure 수."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "entries": len(self._specs),
+            }
+
+    def clear(self):
+        with self._lock:
+            self._specs.clear()
+            self.hits = self.misses = 0
+
+
+def _keep_selection(key, last_key):
+    # 선택된 탭을 다시 눌러 선택이 해제되면 직전 탭으로 되돌림
+    if st.session_state.get(key) is None:
+        st.session_state[key] = st.session_state.get(last_key)
+
+
+def chart_tabs(labels, key):
+    """
+    st.tabs 대신 쓰는 지연 탭. st.tabs는 보이지 않는 탭의 내용도 모두 계산해 보내지만,
+    여기서는 선택한 탭 이름만 반환하므로 호출한 쪽에서 그 탭의 차트만 그리면 됨.
+    """
+    last_key = f"{key}_last"
+    if st.session_state.get(key) not in labels:
+        st.session_state[key] = st.session_state.get(last_key) if st.session_state.get(last_key) in labels else labels[0]
+    selected = st.segmented_control(
+        "차트 종류", labels, key=key, label_visibility="collapsed",
+        on_change=_keep_selection, args=(key, last_key),
+    )
+    st.session_state[last_key] = selected
+    return selected
+
+
+def show_cache_stats(cache):
+    """KNOVEL_FIGURE_STATS=1이면 figure 캐시 적중률을 캡션으로 표시."""
+    if os.environ.get("KNOVEL_FIGURE_STATS") != "1":
+        return
+    stats = cache.stats()
+    st.caption(
+        f"figure 캐시: 적중 {stats['hits']:,} / 미적중 {stats['misses']:,} "
+        f"(적중률 {stats['hit_rate']:.0%}, 보관 {stats['entries']:,}개)"
+    )
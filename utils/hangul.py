@@ -0,0 +1,62 @@
+# utils/hangul.py
+"""
+한글 자모 분해와 초성 추출.
+
+완성형 음절(가~힣)을 호환 자모(ㄱ, ㅏ, ...)로 풀어 검색 색인에 사용.
+겹받침(ㄳ, ㄺ 등)과 이중모음(ㅘ, ㅢ 등)도 기본 자모로 나누므로,
+입력 중인 글자('작벼' → '작별')나 받침이 덜 입력된 글자('달' → '닭')도 자모 문자열의 부분 문자열로 찾을 수 있음.
+변환은 음절 전체에 대해 미리 만든 str.translate 표로 처리.
+"""
+import unicodedata
+
+HANGUL_FIRST, HANGUL_LAST = 0xAC00, 0xD7A3
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JUNGSEONG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+JONGSEONG = ["", "ㄱ", "ㄲ", "ㄳ", "ㄴ", "ㄵ", "ㄶ", "ㄷ", "ㄹ", "ㄺ", "ㄻ", "ㄼ", "ㄽ", "ㄾ", "ㄿ", "ㅀ",
+             "ㅁ", "ㅂ", "ㅄ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ"]
+
+# 겹받침/이중모음 → 입력 순서대로의 기본 자모
+COMPOUND_JAMO = {
+    "ㄳ": "ㄱㅅ", "ㄵ": "ㄴㅈ", "ㄶ": "ㄴㅎ", "ㄺ": "ㄹㄱ", "ㄻ": "ㄹㅁ", "ㄼ": "ㄹㅂ", "ㄽ": "ㄹㅅ",
+    "ㄾ": "ㄹㅌ", "ㄿ": "ㄹㅍ", "ㅀ": "ㄹㅎ", "ㅄ": "ㅂㅅ",
+    "ㅘ": "ㅗㅏ", "ㅙ": "ㅗㅐ", "ㅚ": "ㅗㅣ", "ㅝ": "ㅜㅓ", "ㅞ": "ㅜㅔ", "ㅟ": "ㅜㅣ", "ㅢ": "ㅡㅣ",
+}
+
+
+def _split(jamo):
+    return "".join(COMPOUND_JAMO.get(j, j) for j in jamo)
+
+
+def _build_tables():
+    jamo_table, choseong_table = {}, {}
+    for code in range(HANGUL_FIRST, HANGUL_LAST + 1):
+        offset = code - HANGUL_FIRST
+        cho, jung, jong = offset // (21 * 28), offset // 28 % 21, offset % 28
+        jamo_table[code] = _split(CHOSEONG[cho] + JUNGSEONG[jung] + JONGSEONG[jong])
+        choseong_table[code] = CHOSEONG[cho]
+    for compound, parts in COMPOUND_JAMO.items():
+        jamo_table[ord(compound)] = parts
+    return jamo_table, choseong_table
+
+
+_JAMO_TABLE, _CHOSEONG_TABLE = _build_tables()
+
+
+def decompose(text):
+    """문자열의 완성형 음절을 기본 자모로 분해. 한글이 아닌 문자는 그대로 둠."""
+    if not isinstance(text, str):
+        return ""
+    return unicodedata.normalize("NFC", text).translate(_JAMO_TABLE)
+
+
+def choseong(text):
+    """문자열의 완성형 음절을 초성으로 바꿈 ('불편한 편의점' → 'ㅂㅍㅎ ㅍㅇㅈ'). 그 외 문자는 그대로 둠."""
+    if not isinstance(text, str):
+        return ""
+    return unicodedata.normalize("NFC", text).translate(_CHOSEONG_TABLE)
+
+
+def is_choseong_query(text):
+    """공백을 제외한 모든 글자가 자음(초성)인 검색어인지 ('ㅂㅈㄹ' 등)."""
+    letters = [c for c in unicodedata.normalize("NFC", text or "") if not c.isspace()]
+    return bool(letters) and all(c in CHOSEONG for c in letters)
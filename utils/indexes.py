@@ -0,0 +1,250 @@
+# utils/indexes.py
+"""
+데이터셋에서 파생되는 검색/조회용 인덱스를 프로세스 전체에서 공유.
+인덱스는 데이터셋 버전(dataset_version)을 키로 캐시되므로, 원본 CSV가 바뀌면 다음 호출에서 다시 만들어짐.
+"""
+import hashlib
+import logging
+import os
+
+import streamlit as st
+
+from utils.ann import AnnIndex
+from utils.bitmaps import BitmapIndex
+from utils.cube import DistributionCube
+from utils.data_loader import _normalize_name, dataset_version, load_columns, load_data
+from utils.figures import FigureCache
+from utils.metrics import DatasetMetrics, dashboard_kpis as compute_dashboard_kpis
+from utils.pairing import PAIRING_NYT_COLUMNS, REVIEW_COLUMNS, PersonaPairing
+from utils.preprocess import ENRICHERS, REFERENCES, load_enriched
+from utils.search import BookSearchIndex
+from utils.similarity import TEXT_COLUMNS
+from utils.sorting import SortIndex
+from utils.stability import stability_frame, stability_workers
+from utils.topsis import CRITERIA, score_frame
+
+logger = logging.getLogger(__name__)
+
+
+@st.cache_resource(show_spinner=False, max_entries=16)
+def _enriched_data(file_name, versions):
+    return load_enriched(file_name)
+
+
+def enriched_data(file_name):
+    """
+    전처리 파생 컬럼(utils.preprocess, 새 도서의 NYT 유사도 등)을 포함한 데이터셋. 전처리 대상이 아니면 load_data()와 같음.
+    프로세스에서 공유하는 DataFrame의 얕은 복사본이며, 행 순서는 load_data(file_name)와 같음.
+    """
+    file_name = _normalize_name(file_name)
+    if file_name not in ENRICHERS:
+        return load_data(file_name)
+    versions = tuple(dataset_version(f) for f in (file_name, REFERENCES.get(file_name)) if f)
+    return _enriched_data(file_name, versions).copy(deep=False)
+
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def _book_search_index(file_name, columns, version):
+    return BookSearchIndex.from_frame(enriched_data(file_name), columns)
+
+
+def book_search_index(file_name, columns):
+    """
+    데이터셋 columns에 대한 한글 인식 검색 인덱스 (자모/초성/오타 허용, utils.search.BookSearchIndex).
+    search()가 돌려주는 행 번호는 load_data(file_name)의 위치(iloc)와 같음.
+    """
+    file_name = _normalize_name(file_name)
+    return _book_search_index(file_name, tuple(columns), dataset_version(file_name))
+
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def _sort_index(file_name, columns, version):
+    return SortIndex(enriched_data(file_name), columns)
+
+
+def sort_index(file_name, columns):
+    """
+    데이터셋 columns별로 미리 계산한 정렬 순서 (utils.sorting.SortIndex).
+    order()가 돌려주는 행 번호는 load_data(file_name)의 위치(iloc)와 같음.
+    """
+    file_name = _normalize_name(file_name)
+    return _sort_index(file_name, tuple(columns), dataset_version(file_name))
+
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def _bitmap_index(file_name, columns, version):
+    return BitmapIndex(enriched_data(file_name), columns)
+
+
+def bitmap_index(file_name, columns):
+    """
+    데이터셋 범주형 columns에 대한 비트맵 필터 인덱스 (utils.bitmaps.BitmapIndex).
+    mask()/rows()의 행 번호는 load_data(file_name)의 위치(iloc)와 같음.
+    """
+    file_name = _normalize_name(file_name)
+    return _bitmap_index(file_name, tuple(columns), dataset_version(file_name))
+
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def _row_lookup(file_name, column, version):
+    values = enriched_data(file_name)[column]
+    lookup = {}
+    for row, value in enumerate(values.tolist()):
+        lookup.setdefault(value, row)
+    return lookup
+
+
+def row_lookup(file_name, column):
+    """데이터셋 column 값 → 처음 나오는 행 번호(iloc) dict. ISBN 등 키로 한 행을 바로 찾을 때 사용."""
+    file_name = _normalize_name(file_name)
+    return _row_lookup(file_name, column, dataset_version(file_name))
+
+
+@st.cache_resource(show_spinner=False, max_entries=32)
+def _topsis_ranking(file_name, criteria, weights, version):
+    scores = score_frame(enriched_data(file_name), weights, list(criteria))
+    return scores, SortIndex(scores, scores.columns)
+
+
+def topsis_ranking(file_name, weights, criteria=CRITERIA):
+    """
+    사용자 가중치로 다시 계산한 fuzzy TOPSIS 점수/순위와 그 정렬 순서 (utils.topsis.score_frame).
+    (DataFrame[fuzzy_topsis_score, fuzzy_rank], SortIndex)를 반환하며 행 순서는 load_data(file_name)와 같음.
+    """
+    file_name = _normalize_name(file_name)
+    return _topsis_ranking(file_name, tuple(criteria), tuple(float(w) for w in weights), dataset_version(file_name))
+
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def _rank_stability(file_name, criteria, weights, n_samples, concentration, version):
+    return stability_frame(enriched_data(file_name), weights, list(criteria),
+                           n_samples=n_samples, concentration=concentration, workers=stability_workers())
+
+
+def rank_stability(file_name, weights, n_samples, concentration, criteria=CRITERIA):
+    """
+    가중치 weights 주변의 Monte-Carlo 순위 분포 요약 (utils.stability.stability_frame).
+    DataFrame[rank_p05, rank_median, rank_p95]을 반환하며 행 순서는 load_data(file_name)와 같음.
+    """
+    file_name = _normalize_name(file_name)
+    return _rank_stability(file_name, tuple(criteria), tuple(float(w) for w in weights),
+                           int(n_samples), float(concentration), dataset_version(file_name))
+
+
+# 근사 최근접 이웃 인덱스 저장 위치 (원본 데이터셋 버전별 파일)
+ANN_DIR = os.path.join("data", ".ann")
+
+
+def ann_path(file_name, columns, version):
+    """데이터셋 버전과 사용 컬럼별 ANN 인덱스 파일 경로."""
+    columns_key = hashlib.sha256(",".join(columns).encode("utf-8")).hexdigest()[:8]
+    stem = os.path.splitext(os.path.basename(file_name))[0]
+    return os.path.join(ANN_DIR, f"{stem}-{version[:16]}-{columns_key}.npz")
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def _ann_index(file_name, columns, version):
+    path = ann_path(file_name, columns, version) if version else None
+    if path and os.path.exists(path):
+        try:
+            return AnnIndex.load(path)
+        except Exception as e:
+            logger.warning("ANN 인덱스를 읽지 못해 다시 만듦 (%s): %s", path, e)
+    index = AnnIndex.from_frame(load_data(file_name), list(columns))
+    if path and len(index):
+        try:
+            index.save(path)
+        except Exception as e:
+            logger.warning("ANN 인덱스 저장 실패 (%s): %s", path, e)
+    return index
+
+
+def ann_index(file_name, columns=TEXT_COLUMNS):
+    """
+    데이터셋(기준 문서) columns에 대한 근사 최근접 이웃 인덱스 (utils.ann.AnnIndex).
+    데이터셋 버전별로 data/.ann에 저장해 두고 다음 실행에서는 학습 없이 읽음.
+    search()가 돌려주는 번호는 load_data(file_name)의 위치(iloc)와 같음.
+    """
+    file_name = _normalize_name(file_name)
+    return _ann_index(file_name, tuple(columns), dataset_version(file_name))
+
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def _persona_pairing(korean_file, nyt_file, columns, korean_version, nyt_version):
+    # 리뷰 데이터셋 버전은 키에 넣지 않음: 리뷰가 바뀌면 같은 객체가 sync()로 바뀐 군집만 갱신
+    # NYT 도서는 프로필 벡터화와 결과 표시에 쓰는 컬럼만 읽음 (메모리 매핑 데이터셋)
+    nyt_columns = list(dict.fromkeys([*columns, *PAIRING_NYT_COLUMNS]))
+    return PersonaPairing(ann_index(korean_file, columns), load_data(korean_file),
+                          load_columns(nyt_file, nyt_columns), columns)
+
+
+def persona_pairing(reviews_file, korean_file, nyt_file, columns=TEXT_COLUMNS):
+    """
+    리뷰 군집별 독서 프로필로 찾은 한국 도서 페어링 (utils.pairing.PersonaPairing).
+    리뷰 데이터셋이 바뀌었으면 반환 전에 새 리뷰를 반영.
+    리뷰에 페어링에 필요한 컬럼(REVIEW_COLUMNS)이 없으면 인덱스를 만들지 않고 None.
+    """
+    korean_file, nyt_file = _normalize_name(korean_file), _normalize_name(nyt_file)
+    reviews_file = _normalize_name(reviews_file)
+    df_reviews = load_columns(reviews_file, ("review_id", *REVIEW_COLUMNS))
+    if not set(REVIEW_COLUMNS).issubset(df_reviews.columns):
+        return None
+    pairing = _persona_pairing(korean_file, nyt_file, tuple(columns),
+                               dataset_version(korean_file), dataset_version(nyt_file))
+    pairing.sync(df_reviews, dataset_version(reviews_file))
+    return pairing
+
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def _dataset_metrics(file_name, version):
+    return DatasetMetrics.from_spec(enriched_data(file_name), file_name)
+
+
+def dataset_metrics(file_name):
+    """데이터셋의 전체/세그먼트별 KPI 집계 (utils.metrics.DatasetMetrics, 컬럼은 METRIC_SPECS)."""
+    file_name = _normalize_name(file_name)
+    return _dataset_metrics(file_name, dataset_version(file_name))
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def _dashboard_kpis(ranked_file, translated_file, korean_file, versions):
+    df_ranked, df_korean = enriched_data(ranked_file), load_data(korean_file)
+    not_hit_salespoint = float("nan")
+    if {"ISBN", "salespoint"}.issubset(df_korean.columns) and "ISBN" in df_ranked.columns:
+        not_hit_salespoint = df_korean["salespoint"][~df_korean["ISBN"].isin(df_ranked["ISBN"])].mean()
+    return compute_dashboard_kpis(dataset_metrics(ranked_file), dataset_metrics(translated_file),
+                                  dataset_metrics(korean_file), not_hit_salespoint)
+
+
+def dashboard_kpis(ranked_file="흥행예측도서_ranked.csv", translated_file="trans_final_with_url.csv",
+                   korean_file="book_korean.csv"):
+    """세 페이지의 KPI 카드 값 dict (utils.metrics.dashboard_kpis). 세 데이터셋 버전 조합별로 한 번만 계산."""
+    files = [_normalize_name(f) for f in (ranked_file, translated_file, korean_file)]
+    return _dashboard_kpis(*files, tuple(dataset_version(f) for f in files))
+
+
+@st.cache_resource(show_spinner=False)
+def figure_cache():
+    """프로세스 전체에서 공유하는 Plotly figure 캐시 (utils.figures.FigureCache). 키에 데이터셋 버전을 넣어 사용."""
+    return FigureCache()
+
+
+def figure_key(chart, file_name, *parts):
+    """figure_cache()의 키: (차트 종류, 파일명, 데이터셋 버전, *parts). 원본 데이터셋이 바뀌면 다른 키가 됨."""
+    file_name = _normalize_name(file_name)
+    return (chart, file_name, dataset_version(file_name), *parts)
+
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def _distribution_cube(file_name, facets, default_emoji, version):
+    # 파생 컬럼(primary_* 등)이 전처리 산출물에 있는 데이터셋은 산출물에서 읽음
+    return DistributionCube(enriched_data(file_name), facets, default_emoji=default_emoji)
+
+
+def distribution_cube(file_name, facets, default_emoji=""):
+    """
+    분석 카테고리별 라벨 분포 큐브 (utils.cube.DistributionCube).
+    facets는 페이지의 analysis_map 형태이며, 데이터셋 버전과 facets 내용별로 한 번만 집계.
+    """
+    file_name = _normalize_name(file_name)
+    return _distribution_cube(file_name, facets, default_emoji, dataset_version(file_name))
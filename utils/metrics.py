@@ -0,0 +1,149 @@
+# utils/metrics.py
+"""
+대시보드 핵심 지표(KPI) 집계.
+
+데이터셋마다 지표에 쓰이는 컬럼의 합계/개수/고유 값 수를 세그먼트(흥행 여부 등)별로 groupby 한 번에 구하고,
+전체 값은 세그먼트 집계를 다시 더해 얻으므로 전체·세그먼트별 평균을 위해 데이터를 다시 훑지 않음.
+(고유 값 수는 세그먼트끼리 겹칠 수 있어 전체 값을 따로 셈)
+페이지는 utils.indexes.dashboard_kpis()로 데이터셋 버전별로 한 번만 계산한 값을 읽음.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+# 데이터셋별 집계 대상: mean(평균을 낼 수치 컬럼), distinct(고유 값 수를 셀 컬럼), segments(세그먼트 컬럼)
+METRIC_SPECS = {
+    "흥행예측도서_ranked.csv": {
+        "mean": ["salespoint", "nyb_max_s", "fuzzy_topsis_score"],
+        "distinct": ["ISBN"],
+    },
+    "trans_final_with_url.csv": {
+        "mean": ["salespoint", "top_1_similarity", "nyb_max_s", "amazon_rating_clean", "amazon_review_count"],
+        "distinct": ["ISBN_K", "ISBN"],
+        "segments": ["success"],
+    },
+    "book_korean.csv": {
+        "mean": ["salespoint", "max_imdb_similarity"],
+        "distinct": ["ISBN"],
+    },
+}
+
+# 전체 집계를 나타내는 내부 세그먼트 이름
+_ALL = None
+
+
+class DatasetMetrics:
+    """
+    한 데이터셋의 전체/세그먼트별 행 수, 평균, 고유 값 수.
+    세그먼트 값이 결측인 행은 전체 집계에는 포함되고 세그먼트 집계에서는 빠짐.
+    """
+
+    def __init__(self, df, mean=(), distinct=(), segments=()):
+        self.mean_columns = [c for c in mean if c in df.columns]
+        self.distinct_columns = [c for c in distinct if c in df.columns]
+        self.n_rows = len(df)
+        values = df[self.mean_columns].astype("float64")
+        self._sums, self._counts, self._distinct = {}, {}, {}
+        for segment in [c for c in segments if c in df.columns]:
+            # 세그먼트 값이 결측인 행도 한 그룹으로 모아 두어야 전체 합계를 재구성할 수 있음
+            groups = values.groupby(df[segment], observed=True, dropna=False)
+            self._sums[segment] = groups.sum()
+            self._counts[segment] = groups.count().assign(_rows=groups.size())
+            self._distinct[segment] = (
+                df[self.distinct_columns].groupby(df[segment], observed=True).nunique()
+                if self.distinct_columns else pd.DataFrame()
+            )
+        if self._sums:
+            first = next(iter(self._sums))
+            self._total_sums = self._sums[first].sum()
+            self._total_counts = self._counts[first].sum()
+        else:
+            self._total_sums = values.sum()
+            self._total_counts = values.count()
+            self._total_counts["_rows"] = len(df)
+        self._total_distinct = {c: int(df[c].nunique()) for c in self.distinct_columns}
+
+    @classmethod
+    def from_spec(cls, df, file_name):
+        """METRIC_SPECS에 선언된 컬럼으로 집계."""
+        spec = METRIC_SPECS.get(os.path.basename(file_name), {})
+        return cls(df, spec.get("mean", ()), spec.get("distinct", ()), spec.get("segments", ()))
+
+    @staticmethod
+    def _lookup(table, segment, value, column):
+        frame = table[segment]
+        if column not in frame.columns or value not in frame.index:
+            return np.nan
+        return frame.at[value, column]
+
+    def count(self, segment=_ALL, value=None):
+        """행 수 (segment를 주면 segment == value인 행 수)."""
+        if segment is _ALL:
+            return self.n_rows
+        if segment not in self._counts:
+            return 0
+        result = self._lookup(self._counts, segment, value, "_rows")
+        return 0 if pd.isna(result) else int(result)
+
+    def mean(self, column, segment=_ALL, value=None):
+        """column의 평균 (결측 제외). 값이 없거나 모르는 컬럼/세그먼트면 NaN."""
+        if segment is _ALL:
+            total, n = self._total_sums.get(column, np.nan), self._total_counts.get(column, 0)
+        elif segment in self._sums:
+            total = self._lookup(self._sums, segment, value, column)
+            n = self._lookup(self._counts, segment, value, column)
+        else:
+            return np.nan
+        return float(total / n) if not pd.isna(n) and n > 0 else np.nan
+
+    def nunique(self, column, segment=_ALL, value=None):
+        """column의 고유 값 수 (결측 제외)."""
+        if segment is _ALL:
+            return self._total_distinct.get(column, 0)
+        if segment not in self._distinct:
+            return 0
+        result = self._lookup(self._distinct, segment, value, column)
+        return 0 if pd.isna(result) else int(result)
+
+
+def _ratio(part, whole):
+    return part / whole * 100 if whole else 0.0
+
+
+def dashboard_kpis(ranked, translated, korean, not_hit_salespoint=np.nan):
+    """
+    세 페이지의 KPI 카드 값 dict.
+    ranked / translated / korean: 흥행예측도서, 번역도서, 한국도서의 DatasetMetrics.
+    not_hit_salespoint: 한국도서 중 흥행예측도서에 없는 도서의 평균 판매지수 (데이터셋 간 비교라 따로 계산해 전달).
+    """
+    translated_count = translated.nunique("ISBN_K")
+    untranslated_count = korean.nunique("ISBN")
+    success_count = ranked.nunique("ISBN")
+    trans_success = translated.nunique("ISBN", "success", 1)
+    trans_fail = translated.nunique("ISBN", "success", 0)
+    return {
+        "translated_count": translated_count,
+        "untranslated_count": untranslated_count,
+        "total_books": translated_count + untranslated_count,
+        "translation_percentage": _ratio(translated_count, translated_count + untranslated_count),
+        "success_count": success_count,
+        "success_percentage": _ratio(success_count, success_count + untranslated_count),
+        "avg_final_score": ranked.mean("fuzzy_topsis_score"),
+        "success_salespoint": ranked.mean("salespoint"),
+        "success_nyb_max_s": ranked.mean("nyb_max_s"),
+        "avg_salespoint": translated.mean("salespoint"),
+        "avg_similarity": translated.mean("top_1_similarity"),
+        "avg_sim_success": translated.mean("nyb_max_s", "success", 1),
+        "avg_sim_fail": translated.mean("nyb_max_s", "success", 0),
+        "avg_rating_success": translated.mean("amazon_rating_clean", "success", 1),
+        "avg_rating_fail": translated.mean("amazon_rating_clean", "success", 0),
+        "review_count_success": translated.mean("amazon_review_count", "success", 1),
+        "review_count_fail": translated.mean("amazon_review_count", "success", 0),
+        "trans_success": trans_success,
+        "trans_fail": trans_fail,
+        "trans_success_percentage": _ratio(trans_success, trans_success + trans_fail),
+        "book_kor_salespoint": korean.mean("salespoint"),
+        "book_korean_imdb_maxs": korean.mean("max_imdb_similarity"),
+        "avg_salespoint_miss": not_hit_salespoint,
+    }
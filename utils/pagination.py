@@ -0,0 +1,96 @@
+# utils/pagination.py
+"""
+서버 측 페이지 나누기.
+
+정렬·필터가 끝난 행 번호 배열에서 현재 페이지 부분만 표시용 DataFrame으로 만들어
+브라우저로 보내는 데이터 양이 전체 목록 크기와 관계없이 한 페이지로 일정하게 유지되도록 함.
+이웃 페이지의 표시용 DataFrame은 미리 만들어 세션별 캐시에 보관하므로 이전/다음 이동이 바로 그려짐.
+"""
+from collections import OrderedDict
+
+import streamlit as st
+
+DEFAULT_PAGE_SIZE = 20
+# 세션마다 보관할 표시용 페이지 DataFrame 수 (현재 페이지 + 이웃 페이지 + 최근 페이지)
+PAGE_CACHE_SIZE = 8
+
+
+def page_count(n_rows, page_size=DEFAULT_PAGE_SIZE):
+    """전체 페이지 수. 행이 없어도 1."""
+    return max(1, -(-n_rows // page_size))
+
+
+def page_rows(rows, page, page_size=DEFAULT_PAGE_SIZE):
+    """행 번호 배열에서 page(1부터) 페이지에 해당하는 부분 (복사 없는 뷰)."""
+    start = (page - 1) * page_size
+    return rows[start:start + page_size]
+
+
+def _move_page(state_key, step):
+    st.session_state[state_key] = st.session_state.get(state_key, 1) + step
+
+
+def page_navigator(n_rows, key, page_size=DEFAULT_PAGE_SIZE, signature=None):
+    """
+    이전/다음 버튼과 현재 위치를 그리고 현재 페이지 번호(1부터)를 반환.
+    signature(검색어·정렬·필터 조합 등)가 바뀌면 1페이지로 돌아감.
+    """
+    state_key, signature_key = f"{key}_page", f"{key}_signature"
+    if st.session_state.get(signature_key) != signature:
+        st.session_state[signature_key] = signature
+        st.session_state[state_key] = 1
+    n_pages = page_count(n_rows, page_size)
+    page = min(max(st.session_state.get(state_key, 1), 1), n_pages)
+    st.session_state[state_key] = page
+
+    first = (page - 1) * page_size + 1 if n_rows else 0
+    last = min(page * page_size, n_rows)
+    col_prev, col_info, col_next = st.columns([1, 3, 1])
+    with col_prev:
+        st.button("◀ 이전", key=f"{key}_prev", disabled=page <= 1,
+                  on_click=_move_page, args=(state_key, -1), use_container_width=True)
+    with col_info:
+        st.markdown(
+            f"<div style='text-align: center; padding-top: 0.4rem;'>"
+            f"{page:,} / {n_pages:,} 페이지 · 전체 {n_rows:,}권 중 {first:,}–{last:,}</div>",
+            unsafe_allow_html=True,
+        )
+    with col_next:
+        st.button("다음 ▶", key=f"{key}_next", disabled=page >= n_pages,
+                  on_click=_move_page, args=(state_key, 1), use_container_width=True)
+    return page
+
+
+class PageCache:
+    """
+    세션별로 최근 페이지의 표시용 DataFrame을 보관하는 작은 LRU 캐시.
+    키는 (signature, 페이지 번호)이며, build(page)로 없는 페이지를 만듦.
+    """
+
+    def __init__(self, capacity=PAGE_CACHE_SIZE):
+        self.capacity = capacity
+        self._frames = OrderedDict()
+
+    def get(self, signature, page, build):
+        key = (signature, page)
+        if key in self._frames:
+            self._frames.move_to_end(key)
+            return self._frames[key]
+        frame = self._frames[key] = build(page)
+        while len(self._frames) > self.capacity:
+            self._frames.popitem(last=False)
+        return frame
+
+    def prefetch(self, signature, page, n_pages, build):
+        """page의 이전/다음 페이지를 미리 만들어 둠."""
+        for neighbour in (page + 1, page - 1):
+            if 1 <= neighbour <= n_pages:
+                self.get(signature, neighbour, build)
+
+
+def page_cache(key):
+    """세션에 보관된 PageCache (없으면 생성)."""
+    cache_key = f"{key}_page_cache"
+    if cache_key not in st.session_state:
+        st.session_state[cache_key] = PageCache()
+    return st.session_state[cache_key]
@@ -0,0 +1,131 @@
+# utils/pairing.py
+"""
+독자 페르소나(리뷰 군집)별 추천 도서 페어링.
+
+군집마다 리뷰한 NYT 도서의 TF-IDF 벡터를 리뷰 수로 가중 평균해 독서 프로필 벡터(군집 중심점)를 만들고,
+흥행예측도서 근사 최근접 이웃 인덱스(utils.ann)에서 프로필과 가장 비슷한 한국 도서를 찾음.
+찾은 한국 도서마다 그 군집이 읽은 NYT 도서 중 가장 비슷한 한 권을 짝지어 cluster_Similarity.csv와 같은 형태로 반환.
+
+군집별 (NYT 도서별 리뷰 수)만 누적하므로, 리뷰가 뒤에 추가되면 새 리뷰만 세어
+바뀐 군집의 프로필과 추천 결과만 다시 계산함.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from utils.similarity import TEXT_COLUMNS, document_texts
+
+# 군집별로 미리 찾아 두는 추천 도서 수 (화면에서는 페이지로 나눠 표시)
+PAIRING_LIMIT = 50
+# cluster_Similarity.csv와 같은 컬럼 구성
+PAIRING_COLUMNS = ["cluseter Index", "nyt_title", "nyt_image_url", "nyt_genre",
+                   "pred_title", "korean_image_url", "pred_genre", "Similarity"]
+# 프로필을 만드는 데 필요한 리뷰 컬럼 (리뷰한 NYT 도서 제목, 군집)
+REVIEW_COLUMNS = ("title", "cluster")
+# 추천 결과에 표시하는 NYT 도서 컬럼
+PAIRING_NYT_COLUMNS = ("title", "book_image", "primary_genre")
+
+
+class PersonaPairing:
+    """
+    군집별 독서 프로필과 추천 결과를 보관하고 리뷰 추가 시 바뀐 군집만 갱신.
+    korean_index: 흥행예측도서의 AnnIndex, df_korean: 같은 행 순서의 흥행예측도서 DataFrame.
+    """
+
+    def __init__(self, korean_index, df_korean, df_nyt, columns=TEXT_COLUMNS, limit=PAIRING_LIMIT):
+        self.korean_index = korean_index
+        self.df_korean = df_korean
+        self.df_nyt = df_nyt
+        self.limit = limit
+        # NYT 도서를 한국 도서 인덱스의 어휘로 벡터화 (프로필과 한국 도서가 같은 공간에 있도록)
+        self.nyt_matrix = korean_index.vectorizer.transform(document_texts(df_nyt, columns))
+        self.title_rows = {}
+        for row, title in enumerate(df_nyt["title"].tolist() if "title" in df_nyt.columns else []):
+            self.title_rows.setdefault(title, row)
+        self._counts = {}
+        self._results = {}
+        self._seen_ids = []
+        self.version = None
+        self._lock = threading.Lock()
+
+    def _add(self, df_reviews):
+        """리뷰를 군집별 NYT 도서 리뷰 수에 더하고 바뀐 군집 집합을 반환."""
+        rows = df_reviews["title"].map(self.title_rows)
+        known = rows.notna().to_numpy()
+        clusters = df_reviews["cluster"].to_numpy()[known]
+        rows = rows.to_numpy()[known].astype(np.int64)
+        changed = set()
+        for cluster in pd.unique(clusters):
+            in_cluster = clusters == cluster
+            counts = self._counts.setdefault(cluster, np.zeros(self.nyt_matrix.shape[0]))
+            counts += np.bincount(rows[in_cluster], minlength=counts.size)
+            changed.add(cluster)
+        return changed
+
+    def sync(self, df_reviews, version=None):
+        """
+        리뷰 목록과 상태를 맞춤. 이전에 본 리뷰가 그대로 앞에 있으면 뒤에 추가된 리뷰만 더하고,
+        아니면 처음부터 다시 셈. 프로필이 바뀐 군집의 추천 결과는 버림.
+        version(리뷰 데이터셋 버전)이 지난번과 같으면 아무것도 하지 않음.
+        """
+        if not set(REVIEW_COLUMNS).issubset(df_reviews.columns):
+            return
+        with self._lock:
+            if version is not None and version == self.version:
+                return
+            ids = df_reviews["review_id"].tolist() if "review_id" in df_reviews.columns else list(range(len(df_reviews)))
+            n_seen = len(self._seen_ids)
+            if len(ids) >= n_seen and ids[:n_seen] == self._seen_ids:
+                changed = self._add(df_reviews.iloc[n_seen:])
+            else:
+                self._counts, self._results = {}, {}
+                changed = self._add(df_reviews)
+            self._seen_ids = ids
+            self.version = version
+            for cluster in changed:
+                self._results.pop(cluster, None)
+
+    def clusters(self):
+        return list(self._counts)
+
+    def profile(self, cluster):
+        """군집의 독서 프로필 벡터 (1, 어휘 수) CSR, L2 정규화. 리뷰가 없으면 None."""
+        counts = self._counts.get(cluster)
+        if counts is None or not counts.any():
+            return None
+        weights = sp.csr_matrix(counts / counts.sum())
+        profile = weights @ self.nyt_matrix
+        norm = np.sqrt(profile.multiply(profile).sum())
+        return profile / norm if norm > 0 else None
+
+    def _pairings(self, cluster):
+        profile = self.profile(cluster)
+        if profile is None:
+            return pd.DataFrame(columns=PAIRING_COLUMNS)
+        rows, _ = self.korean_index.search_matrix(sp.csr_matrix(profile), k=self.limit)
+        rows = rows[0][rows[0] >= 0]
+        # 한국 도서마다 군집이 읽은 NYT 도서 중 가장 비슷한 한 권과 짝지음
+        read_rows = np.flatnonzero(self._counts[cluster])
+        similarity = (self.korean_index.matrix[rows] @ self.nyt_matrix[read_rows].T).toarray()
+        best = similarity.argmax(axis=1)
+        nyt = self.df_nyt.iloc[read_rows[best]]
+        korean = self.df_korean.iloc[rows]
+        return pd.DataFrame({
+            "cluseter Index": cluster,
+            "nyt_title": nyt["title"].to_numpy(),
+            "nyt_image_url": nyt["book_image"].to_numpy(),
+            "nyt_genre": nyt["primary_genre"].to_numpy(),
+            "pred_title": korean["제목"].to_numpy(),
+            "korean_image_url": korean["image_url"].to_numpy(),
+            "pred_genre": korean["primary_genre"].to_numpy(),
+            "Similarity": similarity[np.arange(rows.size), best].astype("float32"),
+        })
+
+    def pairings(self, cluster):
+        """군집의 추천 페어링 DataFrame (PAIRING_COLUMNS, 최대 limit행, 프로필 유사도순). 결과는 리뷰가 바뀔 때까지 재사용."""
+        with self._lock:
+            if cluster not in self._results:
+                self._results[cluster] = self._pairings(cluster)
+            return self._results[cluster]
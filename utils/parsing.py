@@ -0,0 +1,43 @@
+# utils/parsing.py
+"""
+문자열 컬럼을 수치형으로 바꾸는 벡터화 파서.
+행마다 파이썬 함수를 호출하지 않고 pandas 문자열/수치 연산으로 처리하며,
+값이 있었지만 해석하지 못한 행의 수를 함께 반환.
+"""
+import pandas as pd
+
+
+def _count_failures(source, parsed):
+    """원본에 값이 있었는데 결과가 결측인 행의 수."""
+    return int((source.notna() & parsed.isna()).sum())
+
+
+def _first_token(series, strip_thousands=False):
+    text = series.astype("string[pyarrow]")
+    if strip_thousands:
+        text = text.str.replace(",", "", regex=False)
+    # 첫 공백 앞의 토큰 ("4.6 out of 5 stars" → "4.6", "12,345 ratings" → "12345")
+    return text.str.strip().str.split(" ", n=1).str[0]
+
+
+def parse_leading_float(series, dtype="float32"):
+    """'4.6 out of 5 stars' 같은 문자열의 첫 토큰을 실수로 변환. (값, 실패 행 수)를 반환."""
+    parsed = pd.to_numeric(_first_token(series), errors="coerce").astype(dtype)
+    return parsed, _count_failures(series, parsed)
+
+
+def parse_leading_int(series, dtype="Int32"):
+    """'12,345 ratings' 같은 문자열의 첫 토큰을 정수로 변환 (천 단위 쉼표 제거). (값, 실패 행 수)를 반환."""
+    parsed = pd.to_numeric(_first_token(series, strip_thousands=True), errors="coerce")
+    # 소수점이 있는 값은 원래 int() 변환에서도 실패하던 값이므로 실패로 처리
+    parsed = parsed.where(parsed.isna() | (parsed == parsed.round()))
+    parsed = parsed.astype(dtype)
+    return parsed, _count_failures(series, parsed)
+
+
+def parse_numeric(series, dtype=None):
+    """pd.to_numeric(errors='coerce')와 같되 실패 행 수를 함께 반환."""
+    parsed = pd.to_numeric(series, errors="coerce")
+    if dtype is not None:
+        parsed = parsed.astype(dtype)
+    return parsed, _count_failures(series, parsed)
@@ -0,0 +1,111 @@
+# utils/prefetch.py
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# 동시에 내려받을 최대 파일 수
+DEFAULT_MAX_WORKERS = 4
+
+logger = logging.getLogger(__name__)
+
+
+class FileProgress:
+    """파일 하나의 다운로드 진행 상태."""
+
+    def __init__(self, name):
+        self.name = name
+        self.state = "pending"  # pending / downloading / done / error
+        self.bytes_done = 0
+        self.bytes_total = None
+        self.error = None
+
+    @property
+    def fraction(self):
+        if self.state == "done":
+            return 1.0
+        if not self.bytes_total:
+            return 0.0
+        return min(self.bytes_done / self.bytes_total, 1.0)
+
+    def __repr__(self):
+        return f"FileProgress({self.name!r}, {self.state}, {self.bytes_done}/{self.bytes_total})"
+
+
+class Prefetcher:
+    """
+    source(utils.sources.DatasetSource)에서 names의 모든 파일을 제한된 스레드 풀로 동시에 내려받음.
+    재검증하지 않는 소스라면 이미 있는 파일은 건너뛰며, wait(파일명)은 해당 파일만 기다림.
+    """
+
+    def __init__(self, source, names, data_dir="data", max_workers=DEFAULT_MAX_WORKERS):
+        self.source = source
+        self.names = list(names)
+        self.data_dir = data_dir
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="prefetch")
+        self._lock = threading.Lock()
+        self._futures = {}
+        self._progress = {name: FileProgress(name) for name in self.names}
+
+    def path(self, name):
+        return os.path.join(self.data_dir, name)
+
+    def start(self, names=None):
+        """names(기본값: 전체)의 다운로드를 예약. 이미 예약된 파일은 무시."""
+        os.makedirs(self.data_dir, exist_ok=True)
+        for name in names if names is not None else self.names:
+            self._submit(name)
+        return self
+
+    def _submit(self, name):
+        with self._lock:
+            future = self._futures.get(name)
+            if future is None:
+                future = self._executor.submit(self._fetch, name)
+                self._futures[name] = future
+            return future
+
+    def _fetch(self, name):
+        dest = self.path(name)
+        progress = self._progress[name]
+        exists = os.path.exists(dest)
+        if exists and not self.source.revalidates:
+            size = os.path.getsize(dest)
+            progress.bytes_done = progress.bytes_total = size
+            progress.state = "done"
+            return dest
+
+        def on_progress(done, total):
+            progress.bytes_done = done
+            progress.bytes_total = total
+
+        progress.state = "downloading"
+        try:
+            self.source.fetch(name, dest, on_progress)
+        except Exception as e:
+            if exists:
+                # 재검증에 실패해도 기존 파일로 계속 동작
+                logger.warning("%s 재검증 실패, 기존 파일 사용: %s", name, e)
+                progress.state = "done"
+                return dest
+            progress.state = "error"
+            progress.error = e
+            with self._lock:
+                # 실패한 파일은 다음 wait()에서 다시 시도할 수 있도록 비움
+                self._futures.pop(name, None)
+            raise
+        progress.state = "done"
+        return dest
+
+    def wait(self, name, timeout=None):
+        """name 파일이 준비될 때까지 기다린 뒤 경로를 반환. 실패 시 예외를 다시 발생."""
+        if name not in self._progress:
+            raise KeyError(name)
+        return self._submit(name).result(timeout=timeout)
+
+    def progress(self):
+        """{파일명: FileProgress} 스냅샷."""
+        return dict(self._progress)
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
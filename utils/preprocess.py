@@ -0,0 +1,276 @@
+# utils/preprocess.py
+"""
+오프라인 전처리 단계: 파생 컬럼을 한 번만 계산해 버전별 산출물로 저장.
+
+    python -m utils.preprocess [--data-dir data]
+
+대시보드는 load_enriched()로 산출물을 바로 읽으므로 페이지 첫 로딩 시 파싱 작업이 없음.
+산출물이 없거나 원본이 바뀐 경우에만 그 자리에서 계산하고 산출물을 다시 저장.
+"""
+import argparse
+import json
+import logging
+import os
+
+import pandas as pd
+
+from utils.facets import explode_facets, primary_facets
+from utils.parsing import parse_leading_float, parse_leading_int, parse_numeric
+from utils.reviews import explode_review_keywords
+from utils.schemas import read_csv_with_schema
+from utils.similarity import SimilarityIndex, similarity_frame
+
+# 파생 컬럼 계산 방식이 바뀌면 올림 (이전 버전 산출물은 자동으로 무시됨)
+PREPROCESS_VERSION = 6
+MANIFEST_NAME = "manifest.json"
+# 오프라인 유사도가 없는 도서에 대해 로컬에서 계산한 유사도 컬럼의 접미사
+LOCAL_SUFFIX = "_local"
+
+logger = logging.getLogger(__name__)
+
+# NYT 스토리 요소 JSON 컬럼 → 대표값(primary_*) 컬럼
+STORY_ELEMENT_COLUMNS = {
+    'primary_plot': 'plot_elements',
+    'primary_character': 'character_types',
+    'primary_theme': 'theme_categories',
+    'primary_setting': 'setting_categories',
+    'primary_tone': 'tone_categories',
+}
+
+
+def enrich_nyt(df_nyt):
+    """
+    NYT 베스트셀러: 평점/리뷰 수/순위/등재 주수 수치화 및 스토리 요소 대표값 추출.
+    해석하지 못한 행 수는 df.attrs["parse_failures"]에 {컬럼: 행 수}로 기록.
+    스토리 요소 문자열은 행마다 한 번만 파싱해 긴 테이블(nyt_story_elements)로도 반환.
+    """
+    if df_nyt.empty:
+        return {"nyt_bestseller_with_keyword": df_nyt}
+
+    numeric_columns = {
+        'amazon_rating_numeric': (parse_leading_float, 'amazon_rating'),
+        'review_count_numeric': (parse_leading_int, 'amazon_review_count'),
+        'rank_numeric': (parse_numeric, 'rank'),
+        'weeks_on_list_numeric': (parse_numeric, 'weeks_on_list'),
+    }
+    failures = {}
+    for new, (parse, old) in numeric_columns.items():
+        df_nyt[new], failures[new] = parse(df_nyt[old])
+        if failures[new]:
+            logger.warning("%s: %s행을 해석하지 못해 결측으로 처리", old, f"{failures[new]:,}")
+    df_nyt.attrs["parse_failures"] = failures
+
+    story_elements = explode_facets(df_nyt, STORY_ELEMENT_COLUMNS.values())
+    primary = primary_facets(story_elements, len(df_nyt), STORY_ELEMENT_COLUMNS)
+    for new in STORY_ELEMENT_COLUMNS:
+        df_nyt[new] = primary[new].to_numpy()
+    return {"nyt_bestseller_with_keyword": df_nyt, "nyt_story_elements": story_elements}
+
+
+def enrich_reviews(df_reviews):
+    """리뷰: parsed_keywords를 한 번만 파싱해 (review_id, cluster, category, label) 긴 테이블로 변환."""
+    return {"review_keywords": explode_review_keywords(df_reviews)}
+
+
+def fill_similarity(df, df_reference, columns):
+    """
+    NYT 베스트셀러(df_reference)와의 유사도 컬럼(columns, similarity_frame()의 컬럼 이름) 중
+    값이 비어 있는 도서(새로 추가된 도서)만 로컬 TF-IDF 유사도로 계산해 별도 컬럼({컬럼}_local)에 저장.
+    오프라인 값과 척도가 달라 원래 컬럼(KPI, 정렬, TOPSIS 기준)에는 섞지 않으며, 원래 컬럼이 없으면 빈 값으로 만듦.
+    비어 있는 값이 없으면 유사도 인덱스도 만들지 않음. 계산한 행 수는 df.attrs["similarity_filled"]에 기록.
+    """
+    for col in columns:
+        if col not in df.columns:
+            df[col] = pd.Series(float("nan"), index=df.index, dtype="float32")
+    missing = df[columns].isna().any(axis=1)
+    df.attrs["similarity_filled"] = 0
+    if not missing.any() or df_reference.empty:
+        return df
+    # 기준 행렬은 한 번만 만들고, 비어 있는 도서만 벡터화해 곱함
+    scores = similarity_frame(df[missing], SimilarityIndex.from_frame(df_reference))
+    for col in columns:
+        df[col + LOCAL_SUFFIX] = scores[col].where(df.loc[missing, col].isna()).reindex(df.index).astype("float32")
+    df.attrs["similarity_filled"] = int(missing.sum())
+    return df
+
+
+def enrich_translated(df_trans, df_nyt):
+    """번역 도서: 비어 있는 NYT 베스트셀러 유사도(nyb_max_s, top_1_similarity)를 로컬에서 계산해 *_local 컬럼에 저장."""
+    return {"trans_final_with_url": fill_similarity(df_trans, df_nyt, ["nyb_max_s", "top_1_similarity"])}
+
+
+def enrich_ranked(df_ranked, df_nyt):
+    """흥행예측도서: 비어 있는 NYT 베스트셀러 최대 유사도(nyb_max_s)를 로컬에서 계산해 nyb_max_s_local에 저장."""
+    return {"흥행예측도서_ranked": fill_similarity(df_ranked, df_nyt, ["nyb_max_s"])}
+
+
+# 원본 파일명 → 전처리 함수 ({산출물 이름: DataFrame}을 반환)
+ENRICHERS = {
+    "nyt_bestseller_with_keyword.csv": enrich_nyt,
+    "reviews_final_with_clusters.csv": enrich_reviews,
+    "trans_final_with_url.csv": enrich_translated,
+    "흥행예측도서_ranked.csv": enrich_ranked,
+}
+
+# 전처리에 다른 데이터셋(유사도의 기준 코퍼스)이 필요한 원본 파일명 → 참조 데이터셋 파일명.
+# 전처리 함수의 두 번째 인자로 넘기며, 참조 데이터셋이 바뀌어도 산출물을 다시 만듦
+REFERENCES = {
+    "trans_final_with_url.csv": "nyt_bestseller_with_keyword.csv",
+    "흥행예측도서_ranked.csv": "nyt_bestseller_with_keyword.csv",
+}
+
+# 산출물 이름 → (원본 파일명, 포맷)
+# 기본은 메모리 매핑 가능한 Arrow, 중첩 객체 컬럼이 있는 산출물만 pickle
+ARTIFACTS = {
+    "nyt_bestseller_with_keyword": ("nyt_bestseller_with_keyword.csv", "arrow"),
+    "nyt_story_elements": ("nyt_bestseller_with_keyword.csv", "arrow"),
+    "review_keywords": ("reviews_final_with_clusters.csv", "arrow"),
+    "trans_final_with_url": ("trans_final_with_url.csv", "arrow"),
+    "흥행예측도서_ranked": ("흥행예측도서_ranked.csv", "arrow"),
+}
+
+
+def source_version(source_sha256, reference_sha256):
+    """참조 데이터셋이 있는 산출물의 원본 버전: 원본과 참조 데이터셋의 해시를 '+'로 이은 값. 하나라도 없으면 None."""
+    if source_sha256 is None or reference_sha256 is None:
+        return None
+    return f"{source_sha256}+{reference_sha256}"
+
+
+def _version_dir(data_dir):
+    return os.path.join(data_dir, "enriched", f"v{PREPROCESS_VERSION}")
+
+
+def artifact_path(name, data_dir="data"):
+    """산출물 이름에 대응하는 파일 경로."""
+    extension = ".arrow" if ARTIFACTS[name][1] == "arrow" else ".pkl"
+    return os.path.join(_version_dir(data_dir), name + extension)
+
+
+def _read_manifest(data_dir):
+    try:
+        with open(os.path.join(_version_dir(data_dir), MANIFEST_NAME), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _update_manifest(data_dir, name, source_sha256, rows, parse_failures=None):
+    manifest = _read_manifest(data_dir)
+    manifest[name] = {
+        "source": ARTIFACTS[name][0],
+        "source_sha256": source_sha256,
+        "rows": rows,
+        "version": PREPROCESS_VERSION,
+        "parse_failures": parse_failures or {},
+    }
+    path = os.path.join(_version_dir(data_dir), MANIFEST_NAME)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(path + ".tmp", path)
+
+
+def write_artifact(name, df, source_sha256, data_dir="data"):
+    """전처리 결과를 산출물로 저장하고 manifest에 원본 해시를 기록."""
+    path = artifact_path(name, data_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    if path.endswith(".arrow"):
+        df.reset_index(drop=True).to_feather(tmp_path, compression="uncompressed")
+    else:
+        df.to_pickle(tmp_path)
+    os.replace(tmp_path, path)
+    _update_manifest(data_dir, name, source_sha256, len(df), df.attrs.get("parse_failures"))
+    return path
+
+
+def read_artifact(name, source_sha256=None, data_dir="data"):
+    """
+    산출물을 읽어 반환. 없거나 원본 해시(source_sha256)와 맞지 않으면 None.
+    source_sha256이 None이면(원본 CSV 없이 산출물만 배포한 경우) 해시를 확인하지 않음.
+    """
+    path = artifact_path(name, data_dir)
+    entry = _read_manifest(data_dir).get(name)
+    if entry is None or not os.path.exists(path):
+        return None
+    if source_sha256 is not None and entry.get("source_sha256") != source_sha256:
+        return None
+    if path.endswith(".arrow"):
+        import pyarrow as pa
+
+        table = pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+        return table.to_pandas(split_blocks=True)
+    return pd.read_pickle(path)
+
+
+def load_artifact(name):
+    """
+    대시보드용: 전처리 산출물을 반환.
+    최신 산출물이 있으면 그대로 읽고, 없으면 공유 데이터셋으로 계산한 뒤
+    같은 원본에서 나오는 산출물을 모두 저장.
+    """
+    from utils.data_loader import dataset_version, load_data
+
+    source_file = ARTIFACTS[name][0]
+    reference_file = REFERENCES.get(source_file)
+    source_sha256 = dataset_version(source_file)
+    if reference_file:
+        source_sha256 = source_version(source_sha256, dataset_version(reference_file))
+    df = read_artifact(name, source_sha256)
+    if df is not None:
+        return df
+    source_df = load_data(source_file)
+    if reference_file:
+        outputs = ENRICHERS[source_file](source_df, load_data(reference_file))
+    else:
+        outputs = ENRICHERS[source_file](source_df)
+    if source_sha256 is not None and not source_df.empty:
+        for output_name, output in outputs.items():
+            try:
+                write_artifact(output_name, output, source_sha256)
+            except Exception as e:
+                logger.warning("산출물 저장 실패 (%s): %s", output_name, e)
+    return outputs.get(name, pd.DataFrame())
+
+
+def load_enriched(file_name):
+    """원본 파일명으로 전처리된 데이터셋(파생 컬럼 포함)을 반환."""
+    return load_artifact(os.path.splitext(os.path.basename(file_name))[0])
+
+
+def build_artifacts(data_dir="data", file_names=None):
+    """원본 CSV에서 모든 전처리 산출물을 생성. {산출물 이름: 경로}를 반환."""
+    from utils.data_loader import _file_sha256
+
+    built = {}
+    for file_name in file_names or ENRICHERS:
+        source_path = os.path.join(data_dir, file_name)
+        if not os.path.exists(source_path):
+            print(f"건너뜀 (파일 없음): {source_path}")
+            continue
+        args = [read_csv_with_schema(source_path)]
+        source_sha256 = _file_sha256(source_path)
+        reference_file = REFERENCES.get(file_name)
+        if reference_file:
+            reference_path = os.path.join(data_dir, reference_file)
+            if not os.path.exists(reference_path):
+                print(f"건너뜀 (참조 파일 없음): {reference_path}")
+                continue
+            args.append(read_csv_with_schema(reference_path))
+            source_sha256 = source_version(source_sha256, _file_sha256(reference_path))
+        for name, df in ENRICHERS[file_name](*args).items():
+            built[name] = write_artifact(name, df, source_sha256, data_dir)
+            print(f"{name}: {len(df):,}행 → {built[name]}")
+    return built
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="K-소설 대시보드 데이터 전처리")
+    parser.add_argument("files", nargs="*", help="전처리할 원본 파일명 (기본값: 전체)")
+    parser.add_argument("--data-dir", default="data")
+    args = parser.parse_args(argv)
+    build_artifacts(args.data_dir, args.files or None)
+
+
+if __name__ == "__main__":
+    main()
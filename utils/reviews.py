@@ -0,0 +1,63 @@
+# utils/reviews.py
+"""
+리뷰 키워드(parsed_keywords)를 (review_id, cluster, category, label) 긴 테이블로 한 번만 펼치고,
+군집별 감정 빈도를 벡터 연산(groupby)으로 집계.
+"""
+import numpy as np
+import pandas as pd
+
+from utils.facets import parse_mapping
+
+# 리뷰 감정분석 레이더 차트에 쓰이는 키워드 카테고리
+EMOTION_CATEGORIES = ["emotions_positive", "emotions_negative", "emotions_complex"]
+
+
+def explode_review_keywords(df_reviews, keywords_col="parsed_keywords", cluster_col="cluster"):
+    """
+    리뷰마다 parsed_keywords를 한 번만 파싱해 긴 테이블로 반환.
+    - review_id: 리뷰의 행 위치 (int32)
+    - cluster / category / label: 범주형 코드로 저장
+    카테고리 값이 {라벨: ...} dict인 경우에만 라벨을 펼침 (기존 집계와 동일).
+    """
+    review_ids, clusters, categories, labels = [], [], [], []
+    if keywords_col in df_reviews.columns:
+        cluster_values = df_reviews[cluster_col].tolist() if cluster_col in df_reviews.columns else [None] * len(df_reviews)
+        for review_id, (text, cluster) in enumerate(zip(df_reviews[keywords_col].tolist(), cluster_values)):
+            parsed = text if isinstance(text, dict) else parse_mapping(text)
+            if not parsed:
+                continue
+            for category, values in parsed.items():
+                if not isinstance(values, dict):
+                    continue
+                for label in values:
+                    review_ids.append(review_id)
+                    clusters.append(cluster)
+                    categories.append(category)
+                    labels.append(str(label))
+    return pd.DataFrame({
+        "review_id": np.asarray(review_ids, dtype="int32"),
+        "cluster": pd.Categorical(clusters),
+        "category": pd.Categorical(categories),
+        "label": pd.Categorical(labels),
+    })
+
+
+def emotion_counts(review_keywords, categories=EMOTION_CATEGORIES):
+    """
+    군집 × 감정 라벨 빈도표 (행: cluster, 열: label).
+    같은 리뷰에서 여러 카테고리에 나온 라벨은 카테고리마다 한 번씩 셈.
+    """
+    emotions = review_keywords[review_keywords["category"].isin(categories)]
+    return (
+        emotions.groupby(["cluster", "label"], observed=True)
+        .size()
+        .unstack("label", fill_value=0)
+    )
+
+
+def cluster_emotion_counts(counts, cluster, labels):
+    """빈도표에서 한 군집의 labels 순서 빈도 리스트. 없는 군집/라벨은 0."""
+    if cluster not in counts.index:
+        return [0] * len(labels)
+    row = counts.loc[cluster]
+    return [int(row.get(label, 0)) for label in labels]
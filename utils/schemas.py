@@ -0,0 +1,177 @@
+# utils/schemas.py
+import hashlib
+import json
+import logging
+import os
+
+import pandas as pd
+
+# --- 데이터셋별 컬럼 dtype 선언 ---
+# category: 반복되는 라벨(장르, 저자, 출판사, 군집 등)
+# string: Arrow 기반 문자열(string[pyarrow]) - ISBN, 제목, 설명, URL 등
+# float32 / Int8 / Int16 / Int32: 다운캐스트한 수치형 (Int*는 결측 허용 정수)
+# 파일에 없는 컬럼은 무시하며, 선언되지 않은 컬럼은 pandas 기본 dtype을 유지
+DATASET_SCHEMAS = {
+    "book_korean.csv": {
+        "category": ["저자", "출판사", "primary_genre"],
+        "string": ["ISBN", "제목", "description", "image_url"],
+        "float32": ["salespoint", "max_imdb_similarity"],
+        "Int16": ["발행년도"],
+    },
+    "흥행예측도서_ranked.csv": {
+        "category": ["저자", "출판사", "primary_genre"],
+        "string": ["ISBN", "제목", "description", "image_url"],
+        "float32": ["salespoint", "nyb_max_s", "nyt_genre_score", "imdb_genre_score", "fuzzy_topsis_score"],
+        "Int32": ["fuzzy_rank"],
+        "Int16": ["발행년도"],
+    },
+    "trans_final_with_url.csv": {
+        "category": ["Author", "primary_genre", "primary_plot", "primary_character",
+                     "primary_theme", "primary_setting", "primary_tone"],
+        "string": ["ISBN", "ISBN_K", "Title", "book_image"],
+        "float32": ["salespoint", "nyb_max_s", "top_1_similarity", "amazon_rating_clean",
+                    "amazon_review_count", "avg_bsr", "marketing_exp"],
+        "Int8": ["success"],
+        "Int16": ["Published Year", "marketing_social_media", "marketing_tv_film_streaming",
+                  "marketing_award", "marketing_media_magazine_press", "marketing_book_club",
+                  "marketing_sales"],
+    },
+    "nyt_bestseller_with_keyword.csv": {
+        "category": ["author", "primary_genre"],
+        "string": ["title", "description", "book_image", "amazon_rating", "amazon_review_count",
+                   "plot_elements", "character_types", "theme_categories",
+                   "setting_categories", "tone_categories"],
+        "float32": ["marketing_exp"],
+        "Int16": ["rank", "weeks_on_list", "marketing_social_media", "marketing_tv_film_streaming",
+                  "marketing_award", "marketing_media_magazine_press", "marketing_book_club",
+                  "marketing_sales"],
+    },
+    "reviews_final_with_clusters.csv": {
+        "category": ["cluster"],
+        "string": ["parsed_keywords"],
+    },
+    "cluster_Similarity.csv": {
+        "category": ["nyt_genre", "pred_genre"],
+        "string": ["nyt_title", "pred_title", "nyt_image_url", "korean_image_url"],
+        "float32": ["Similarity"],
+        "Int8": ["cluseter Index"],
+    },
+    "imdb_llm_filtered_final.csv": {
+        "category": ["primary_genre"],
+    },
+}
+
+logger = logging.getLogger(__name__)
+
+# read_csv 단계에서 바로 지정해도 안전한 dtype (값 변환 실패가 없는 종류)
+_PARSE_TIME_KINDS = ("category", "string")
+_STRING_DTYPE = "string[pyarrow]"
+
+
+def get_schema(file_name):
+    """파일명에 해당하는 스키마 선언을 반환. 없으면 빈 dict."""
+    return DATASET_SCHEMAS.get(os.path.basename(file_name), {})
+
+
+def schema_fingerprint(file_name):
+    """스키마 선언의 해시. 스키마가 바뀌면 스냅샷을 무효화하는 데 사용."""
+    payload = json.dumps(get_schema(file_name), sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def parse_dtypes(file_name, columns):
+    """read_csv(dtype=...)에 넘길 {컬럼: dtype}. 파일에 있는 컬럼만 포함."""
+    schema = get_schema(file_name)
+    present = set(columns)
+    dtypes = {}
+    for kind in _PARSE_TIME_KINDS:
+        for col in schema.get(kind, []):
+            if col in present:
+                dtypes[col] = _STRING_DTYPE if kind == "string" else kind
+    return dtypes
+
+
+def apply_schema(df, file_name):
+    """
+    파싱된 DataFrame에 스키마를 적용 (수치형 다운캐스트 포함).
+    이미 수치형이 아닌 컬럼은 값이 바뀌지 않도록 변환하지 않음.
+    """
+    schema = get_schema(file_name)
+    for kind, cols in schema.items():
+        for col in cols:
+            if col not in df.columns or str(df[col].dtype) == (_STRING_DTYPE if kind == "string" else kind):
+                continue
+            if kind in _PARSE_TIME_KINDS:
+                df[col] = df[col].astype(_STRING_DTYPE if kind == "string" else kind)
+            elif pd.api.types.is_numeric_dtype(df[col]):
+                values = df[col]
+                if kind.startswith("Int") and pd.api.types.is_float_dtype(values):
+                    # 소수점이 있는 값은 정수로 바꿀 수 없으므로 float32로 유지
+                    non_null = values.dropna()
+                    if not (non_null == non_null.round()).all():
+                        df[col] = values.astype("float32")
+                        continue
+                df[col] = values.astype(kind)
+            else:
+                logger.warning("%s:%s 컬럼이 수치형이 아니어서 %s 변환을 건너뜀", file_name, col, kind)
+    return df
+
+
+def _restore_numeric_categories(df, dtypes):
+    """
+    read_csv(dtype='category')는 범주를 항상 문자열로 만들므로,
+    모든 범주가 숫자인 컬럼(예: cluster)은 숫자 범주로 되돌려 df['cluster'] == 0 비교가 동작하게 함.
+    """
+    for col, dtype in dtypes.items():
+        if dtype != "category":
+            continue
+        categories = df[col].cat.categories
+        numeric = pd.to_numeric(categories, errors="coerce")
+        if len(categories) and not numeric.isna().any():
+            if (numeric == numeric.round()).all():
+                numeric = numeric.astype("int64")
+            df[col] = df[col].cat.rename_categories(numeric)
+    return df
+
+
+def read_csv_with_schema(file_path):
+    """스키마를 적용해 CSV를 읽음. 문자열/범주형은 파싱 시점에 지정."""
+    file_name = os.path.basename(file_path)
+    header = pd.read_csv(file_path, nrows=0).columns
+    dtypes = parse_dtypes(file_name, header)
+    df = pd.read_csv(file_path, dtype=dtypes)
+    df = _restore_numeric_categories(df, dtypes)
+    return apply_schema(df, file_name)
+
+
+def memory_report(data_dir="data", file_names=None):
+    """
+    데이터셋별 메모리 사용량 비교표.
+    pandas 기본 dtype으로 읽었을 때와 스키마를 적용했을 때의 바이트 수, 절감량을 반환.
+    """
+    rows = []
+    for file_name in file_names or DATASET_SCHEMAS:
+        file_path = os.path.join(data_dir, file_name)
+        if not os.path.exists(file_path):
+            continue
+        before = pd.read_csv(file_path).memory_usage(deep=True).sum()
+        after = read_csv_with_schema(file_path).memory_usage(deep=True).sum()
+        rows.append({
+            "dataset": file_name,
+            "default_bytes": int(before),
+            "schema_bytes": int(after),
+            "saved_bytes": int(before - after),
+            "saved_pct": round((before - after) / before * 100, 1) if before else 0.0,
+        })
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    # python -m utils.schemas : data/ 폴더의 데이터셋별 메모리 절감 리포트 출력
+    report = memory_report()
+    if report.empty:
+        print("data/ 폴더에서 데이터셋을 찾을 수 없습니다.")
+    else:
+        print(report.to_string(index=False))
+        print(f"\n합계: {report['default_bytes'].sum():,} → {report['schema_bytes'].sum():,} bytes "
+              f"({report['saved_bytes'].sum():,} bytes 절감)")
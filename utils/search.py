@@ -0,0 +1,210 @@
+# utils/search.py
+"""
+도서 검색용 문자 n-gram 역색인.
+
+여러 필드(제목, 저자, ISBN 등)를 행마다 하나의 문자열로 이어 붙여 길이 1..n의 n-gram을 색인하고,
+검색어의 n-gram 포스팅 리스트(행 번호 배열)를 교집합해 후보 행을 찾음.
+검색어가 n보다 길면 후보에 대해서만 실제 부분 문자열 포함 여부를 확인.
+
+BookSearchIndex는 여기에 한글 검색을 더함: 자모 분해 문자열 색인(입력 중인 글자),
+초성 색인('ㅂㅈㄹ'), 자모 트라이그램 유사도(오타가 있는 제목/저자명)로 찾은 결과를 점수순으로 반환.
+"""
+import unicodedata
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from utils.hangul import choseong, decompose, is_choseong_query
+
+# 필드 사이 구분자. 검색어에서는 제거하므로 필드 경계를 넘는 n-gram은 검색되지 않음
+FIELD_SEPARATOR = "\x00"
+DEFAULT_NGRAM = 3
+# 오타 허용 검색에서 결과로 인정할 최소 트라이그램 일치 비율
+DEFAULT_MIN_SIMILARITY = 0.5
+# 오타 허용 검색을 시도할 최소 자모 수 (더 짧으면 우연히 겹치는 결과가 너무 많음)
+MIN_FUZZY_JAMO = 4
+
+
+def normalize_text(text):
+    """검색용 정규화: NFC + 대소문자 무시. 결측은 빈 문자열."""
+    if not isinstance(text, str):
+        return ""
+    return unicodedata.normalize("NFC", text).casefold()
+
+
+def normalize_query(query):
+    """검색어 정규화: normalize_text에 더해 필드 구분자를 빼고, 앞뒤 공백을 없애고 연속 공백을 하나로 줄임."""
+    return " ".join(normalize_text(query).replace(FIELD_SEPARATOR, "").split())
+
+
+def _join_fields(df, columns):
+    columns = [c for c in columns if c in df.columns]
+    fields = [df[c].astype("string").fillna("").tolist() for c in columns]
+    return [FIELD_SEPARATOR.join(values) for values in zip(*fields)] if fields else [""] * len(df)
+
+
+def _match_substring(texts, rows, query):
+    """Arrow 문자열 배열 texts에서 rows 행이 query를 포함하는지 여부 (bool 배열)."""
+    if not rows.size:
+        return np.zeros(0, dtype=bool)
+    return pc.match_substring(texts.take(pa.array(rows)), query).to_numpy(zero_copy_only=False)
+
+
+def _intersect_sorted(small, large):
+    """정렬된 두 행 번호 배열의 교집합 (작은 배열 기준 이진 탐색)."""
+    if not small.size or not large.size:
+        return small[:0]
+    idx = np.searchsorted(large, small)
+    idx[idx == large.size] = large.size - 1
+    return small[large[idx] == small]
+
+
+class _PostingLists:
+    """
+    n-gram → 행 번호 포스팅 리스트 (CSR 형태).
+    - _vocab: {n-gram: id}
+    - _offsets / _rows: id별 포스팅 리스트 _rows[_offsets[id]:_offsets[id + 1]] (정렬된 행 번호, int32)
+    """
+
+    def __init__(self, gram_sets):
+        vocab = {}
+        gram_ids, rows = [], []
+        for row, grams in enumerate(gram_sets):
+            gram_ids.extend(vocab.setdefault(gram, len(vocab)) for gram in grams)
+            rows.extend([row] * len(grams))
+        gram_ids = np.asarray(gram_ids, dtype=np.int64)
+        # 행 순서대로 쌓았으므로 안정 정렬하면 포스팅 리스트 안의 행 번호도 정렬된 상태가 됨
+        order = np.argsort(gram_ids, kind="stable")
+        self._vocab = vocab
+        self._rows = np.asarray(rows, dtype=np.int32)[order]
+        self._offsets = np.zeros(len(vocab) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(gram_ids, minlength=len(vocab)), out=self._offsets[1:])
+
+    def get(self, gram):
+        gram_id = self._vocab.get(gram)
+        if gram_id is None:
+            return None
+        return self._rows[self._offsets[gram_id]:self._offsets[gram_id + 1]]
+
+
+class NgramIndex:
+    """문자 n-gram 역색인. 길이 1..n의 n-gram을 모두 색인해 짧은 검색어도 교집합만으로 찾음."""
+
+    def __init__(self, texts, n=DEFAULT_NGRAM):
+        self.n = n
+        texts = [normalize_text(t) for t in texts]
+        # 후보 확인(부분 문자열 검사)은 Arrow 문자열 배열에서 벡터 연산으로 처리
+        self._texts = pa.array(texts, type=pa.large_string())
+        self._postings = _PostingLists(
+            {text[i:i + size] for size in range(1, n + 1) for i in range(len(text) - size + 1)}
+            for text in texts
+        )
+
+    @classmethod
+    def from_frame(cls, df, columns, n=DEFAULT_NGRAM):
+        """df의 columns 값을 행마다 구분자로 이어 붙여 색인. 행 번호는 df의 위치(iloc)와 같음."""
+        return cls(_join_fields(df, columns), n=n)
+
+    def __len__(self):
+        return len(self._texts)
+
+    def search(self, query):
+        """검색어를 부분 문자열로 포함하는 행 번호 배열(오름차순, int32). 빈 검색어는 전체 행."""
+        query = normalize_query(query)
+        if not query:
+            return np.arange(len(self), dtype=np.int32)
+        size = min(self.n, len(query))
+        postings = []
+        for gram in {query[i:i + size] for i in range(len(query) - size + 1)}:
+            rows = self._postings.get(gram)
+            if rows is None:
+                return np.empty(0, dtype=np.int32)
+            # 모든 행에 있는 n-gram은 후보를 줄이지 못하므로 교집합에서 제외
+            if rows.size < len(self):
+                postings.append(rows)
+        if not postings:
+            postings.append(np.arange(len(self), dtype=np.int32))
+        postings.sort(key=len)
+        rows = postings[0]
+        for other in postings[1:]:
+            rows = _intersect_sorted(rows, other)
+            if not rows.size:
+                return rows
+        if len(query) > self.n:
+            # n-gram이 모두 있어도 순서/위치가 다를 수 있으므로 후보만 실제로 확인
+            rows = rows[_match_substring(self._texts, rows, query)]
+        return rows
+
+
+def _padded_trigrams(text):
+    """단어마다 앞뒤를 공백으로 채운 트라이그램 집합 (pg_trgm 방식). 짧은 단어도 트라이그램이 생김."""
+    grams = set()
+    for word in text.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class BookSearchIndex:
+    """
+    한글 인식 도서 검색.
+    색인 시점에 제목/저자 등을 한 번만 자모 분해·초성 추출해 두고, 검색 결과를 다음 점수로 정렬:
+    - 3: 원문 부분 문자열 일치
+    - 2: 자모 부분 문자열 일치 (입력 중인 글자 '작벼' → '작별') 또는 초성 일치 ('ㅈㅂ')
+    - 0.5~1: 자모 트라이그램 일치 비율 (오타 허용, 예: '한깡' → '한강')
+    """
+
+    def __init__(self, texts, n=DEFAULT_NGRAM, min_similarity=DEFAULT_MIN_SIMILARITY):
+        texts = [normalize_text(t) for t in texts]
+        jamo = [decompose(t) for t in texts]
+        self.min_similarity = min_similarity
+        self._jamo = NgramIndex(jamo, n=n)
+        # 초성은 띄어쓰기 없이 입력하는 경우가 많으므로 공백을 빼고 색인
+        self._choseong = NgramIndex([choseong(t).replace(" ", "") for t in texts], n=n)
+        self._texts = pa.array(texts, type=pa.large_string())
+        self._trigrams = _PostingLists(_padded_trigrams(t.replace(FIELD_SEPARATOR, " ")) for t in jamo)
+
+    @classmethod
+    def from_frame(cls, df, columns, **kwargs):
+        """df의 columns 값을 행마다 이어 붙여 색인. 행 번호는 df의 위치(iloc)와 같음."""
+        return cls(_join_fields(df, columns), **kwargs)
+
+    def __len__(self):
+        return len(self._texts)
+
+    def _fuzzy(self, jamo_query):
+        """검색어 트라이그램 중 행에 있는 비율이 min_similarity 이상인 (행, 비율)."""
+        grams = _padded_trigrams(jamo_query)
+        postings = [rows for rows in map(self._trigrams.get, grams) if rows is not None]
+        if len(jamo_query.replace(" ", "")) < MIN_FUZZY_JAMO or not postings:
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float32)
+        shared = np.bincount(np.concatenate(postings), minlength=len(self))
+        similarity = (shared / len(grams)).astype(np.float32)
+        rows = np.flatnonzero(similarity >= self.min_similarity).astype(np.int32)
+        return rows, similarity[rows]
+
+    def search(self, query, limit=None):
+        """
+        (행 번호 배열, 점수 배열)을 점수 내림차순으로 반환 (같은 점수는 원래 행 순서).
+        검색어의 앞뒤 공백은 무시하고 연속 공백은 하나로 봄. 빈 검색어는 전체 행을 점수 0으로 반환.
+        """
+        query = normalize_query(query)
+        if not query:
+            return np.arange(len(self), dtype=np.int32), np.zeros(len(self), dtype=np.float32)
+        scores = np.zeros(len(self), dtype=np.float32)
+        if is_choseong_query(query):
+            # 자음만 입력한 검색어는 초성으로만 찾음 (자모 문자열에서 우연히 이어지는 자음은 무시)
+            scores[self._choseong.search(query.replace(" ", ""))] = 2.0
+        else:
+            jamo_query = decompose(query)
+            partial = self._jamo.search(jamo_query)
+            scores[partial] = 2.0
+            scores[partial[_match_substring(self._texts, partial, query)]] = 3.0
+            fuzzy_rows, similarity = self._fuzzy(jamo_query)
+            scores[fuzzy_rows] = np.maximum(scores[fuzzy_rows], similarity)
+        rows = np.flatnonzero(scores > 0).astype(np.int32)
+        rows = rows[np.argsort(-scores[rows], kind="stable")]
+        if limit is not None:
+            rows = rows[:limit]
+        return rows, scores[rows]
@@ -0,0 +1,172 @@
+# utils/similarity.py
+"""
+도서 소개 글의 문자 n-gram TF-IDF 유사도 (네트워크/모델 다운로드 없이 로컬 계산).
+
+기준 코퍼스(NYT 베스트셀러)로 어휘와 IDF를 한 번만 학습해 L2 정규화한 희소 행렬로 보관하고,
+새 도서는 그 어휘로 벡터화해 기준 행렬과의 희소 행렬 곱(코사인 유사도)만 계산.
+따라서 도서 한 권을 추가로 평가할 때 전체 유사도 행렬을 다시 만들 필요가 없음.
+여러 권을 평가할 때는 블록 단위로 곱해 메모리를 일정하게 유지하고, 상위 k개는 argpartition으로 고름.
+
+문자 n-gram은 같은 언어·같은 표기의 텍스트끼리만 겹치므로, 한국어 소개 글과 영어 소개 글 사이의 유사도는
+장르/플롯/테마 키워드처럼 양쪽에 같은 어휘로 기록된 필드가 주로 결정함.
+"""
+import math
+import re
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from utils.search import normalize_text
+
+# 문자 n-gram 길이 범위 (양 끝 포함)
+NGRAM_RANGE = (2, 4)
+# 유사도 계산에 사용하는 필드 (있는 컬럼만, 공백으로 이어 붙임)
+TEXT_COLUMNS = ["primary_genre", "plot_elements", "theme_categories", "description"]
+# 한 번에 곱하는 질의 도서 수 (블록마다 질의 수 × 기준 수 크기의 밀집 행렬을 만듦)
+BLOCK_SIZE = 512
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def char_ngrams(text, ngram_range=NGRAM_RANGE):
+    """정규화한 문자열의 문자 n-gram 빈도 (Counter). 공백은 하나로 줄이고 양 끝에 공백을 덧붙여 단어 경계를 표시."""
+    text = " " + _WHITESPACE.sub(" ", normalize_text(text)).strip() + " "
+    low, high = ngram_range
+    grams = Counter()
+    for n in range(low, high + 1):
+        grams.update(text[i:i + n] for i in range(len(text) - n + 1))
+    return grams
+
+
+def document_texts(df, columns=TEXT_COLUMNS):
+    """df의 columns(있는 컬럼만)를 행마다 공백으로 이어 붙인 문자열 목록. 결측은 빈 문자열."""
+    columns = [c for c in columns if c in df.columns]
+    fields = [df[c].astype("string").fillna("").tolist() for c in columns]
+    return [" ".join(values) for values in zip(*fields)] if fields else [""] * len(df)
+
+
+class CharTfidf:
+    """
+    기준 코퍼스로 학습한 문자 n-gram TF-IDF 벡터화기.
+    - tf: 1 + ln(빈도) (sublinear), idf: ln((1 + 문서 수) / (1 + 문서 빈도)) + 1 (smooth)
+    - 어휘에 없는 n-gram은 벡터에 넣지 않지만 L2 노름에는 반영 (문서 빈도 0인 idf 사용)
+    """
+
+    def __init__(self, texts, ngram_range=NGRAM_RANGE):
+        self.ngram_range = ngram_range
+        counts = [char_ngrams(text, ngram_range) for text in texts]
+        document_frequency = Counter()
+        for grams in counts:
+            document_frequency.update(grams.keys())
+        self.vocabulary = {gram: i for i, gram in enumerate(document_frequency)}
+        n_docs = len(counts)
+        df = np.fromiter(document_frequency.values(), dtype=np.float64, count=len(document_frequency))
+        self.idf = np.log((1 + n_docs) / (1 + df)) + 1
+        self.oov_idf = np.log(1 + n_docs) + 1
+        self.matrix = self._vectorize(counts)
+
+    @classmethod
+    def from_vocabulary(cls, grams, idf, oov_idf, ngram_range=NGRAM_RANGE):
+        """저장해 둔 어휘(n-gram 목록, 같은 순서의 idf)로 벡터화기를 복원. matrix는 None."""
+        self = cls.__new__(cls)
+        self.ngram_range = tuple(int(n) for n in ngram_range)
+        self.vocabulary = {gram: i for i, gram in enumerate(grams)}
+        self.idf = np.asarray(idf, dtype=np.float64)
+        self.oov_idf = float(oov_idf)
+        self.matrix = None
+        return self
+
+    @property
+    def n_features(self):
+        return len(self.vocabulary)
+
+    def _vectorize(self, counts):
+        indptr, indices, tf = [0], [], []
+        oov_squares = np.zeros(len(counts))
+        for row, grams in enumerate(counts):
+            for gram, count in grams.items():
+                col = self.vocabulary.get(gram)
+                if col is None:
+                    oov_squares[row] += ((1 + math.log(count)) * self.oov_idf) ** 2
+                else:
+                    indices.append(col)
+                    tf.append(1 + math.log(count))
+            indptr.append(len(indices))
+        indices = np.asarray(indices, dtype=np.int32)
+        indptr = np.asarray(indptr, dtype=np.int64)
+        data = np.asarray(tf, dtype=np.float64) * self.idf[indices]
+        squares = np.add.reduceat(np.square(data), indptr[:-1]) if data.size else np.zeros(len(counts))
+        # reduceat은 빈 행에 다음 값을 넣으므로 빈 행은 0으로
+        squares[indptr[:-1] == indptr[1:]] = 0.0
+        norms = np.sqrt(squares + oov_squares)
+        data /= np.repeat(np.where(norms > 0, norms, 1.0), np.diff(indptr))
+        return sp.csr_matrix((data.astype(np.float32), indices, indptr), shape=(len(counts), self.n_features))
+
+    def transform(self, texts):
+        """문자열 목록 → L2 정규화한 (문서 수, 어휘 수) CSR 행렬 (float32)."""
+        return self._vectorize([char_ngrams(text, self.ngram_range) for text in texts])
+
+
+class SimilarityIndex:
+    """
+    기준 문서(NYT 베스트셀러 등)에 대한 코사인 유사도 검색.
+    nearest()가 돌려주는 번호는 기준 문서 목록(from_frame이면 df의 위치)과 같음.
+    """
+
+    def __init__(self, texts, ngram_range=NGRAM_RANGE):
+        self.vectorizer = CharTfidf(texts, ngram_range)
+        # 질의 행렬 @ (어휘 수, 기준 수) 행렬 형태로 곱하기 위해 전치해 둠
+        self._reference_t = self.vectorizer.matrix.T.tocsr()
+
+    @classmethod
+    def from_frame(cls, df, columns=TEXT_COLUMNS, **kwargs):
+        return cls(document_texts(df, columns), **kwargs)
+
+    def __len__(self):
+        return self._reference_t.shape[1]
+
+    def nearest(self, texts, k=1, block_size=BLOCK_SIZE):
+        """
+        texts 각각과 가장 유사한 기준 문서 k개.
+        (번호 (문서 수, k) int32, 코사인 유사도 (문서 수, k) float32)를 유사도 내림차순으로 반환.
+        """
+        queries = self.vectorizer.transform(texts)
+        n_queries, n_reference = queries.shape[0], len(self)
+        k = min(k, n_reference)
+        rows = np.zeros((n_queries, k), dtype=np.int32)
+        scores = np.zeros((n_queries, k), dtype=np.float32)
+        for start in range(0, n_queries, block_size):
+            block = (queries[start:start + block_size] @ self._reference_t).toarray()
+            if k < n_reference:
+                top = np.argpartition(-block, k - 1, axis=1)[:, :k]
+            else:
+                top = np.broadcast_to(np.arange(n_reference), block.shape)
+            top_scores = np.take_along_axis(block, top, axis=1)
+            order = np.argsort(-top_scores, axis=1, kind="stable")
+            rows[start:start + block_size] = np.take_along_axis(top, order, axis=1)
+            scores[start:start + block_size] = np.take_along_axis(top_scores, order, axis=1)
+        return rows, scores
+
+    def max_similarity(self, texts, block_size=BLOCK_SIZE):
+        """texts 각각의 기준 문서 중 최대 코사인 유사도 (float32). 기준 문서가 없으면 0."""
+        if not len(self):
+            return np.zeros(len(texts), dtype=np.float32)
+        return self.nearest(texts, k=1, block_size=block_size)[1][:, 0]
+
+
+def similarity_frame(df, index, columns=TEXT_COLUMNS):
+    """
+    df 도서별 기준 문서와의 최대 유사도(nyb_max_s, float32), 가장 유사한 기준 문서(top-1)와의 유사도
+    (top_1_similarity, float32)와 그 기준 문서 번호(nyb_top_row, Int32).
+    최근접 이웃 하나와 비교하므로 nyb_max_s와 top_1_similarity는 같은 값이며, 데이터셋의 두 컬럼을 함께 채우는 데 사용.
+    기준 문서가 없으면 유사도 0, 번호 결측.
+    """
+    if not len(index):
+        zeros = np.zeros(len(df), dtype=np.float32)
+        return pd.DataFrame({"nyb_max_s": zeros, "top_1_similarity": zeros.copy(),
+                             "nyb_top_row": pd.array([pd.NA] * len(df), dtype="Int32")}, index=df.index)
+    rows, scores = index.nearest(document_texts(df, columns), k=1)
+    return pd.DataFrame({"nyb_max_s": scores[:, 0], "top_1_similarity": scores[:, 0].copy(),
+                         "nyb_top_row": pd.array(rows[:, 0], dtype="Int32")}, index=df.index)
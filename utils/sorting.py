@@ -0,0 +1,71 @@
+# utils/sorting.py
+"""
+정렬 기준별로 미리 계산한 행 순서(permutation).
+
+컬럼마다 안정 정렬(argsort)을 한 번만 해 두고, 화면에서는
+필터 마스크를 순서 배열에 적용(O(n))해 정렬된 행 번호를 얻음. 다시 정렬하지 않음.
+내림차순은 오름차순 순서에서 같은 값 묶음의 순서만 뒤집어 만들므로, 두 방향 모두 같은 값끼리는 원래 행 순서를 유지(안정 정렬).
+결측값은 pandas sort_values와 같이 방향과 관계없이 맨 뒤에 둠.
+"""
+import numpy as np
+import pandas as pd
+
+
+def _sort_keys(values):
+    """argsort에 쓸 numpy 배열. 범주형은 범주 순서(코드), 결측 허용 정수형은 float64로 변환."""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values.cat.codes.to_numpy()
+    if pd.api.types.is_numeric_dtype(values.dtype) and not pd.api.types.is_bool_dtype(values.dtype):
+        return values.to_numpy(dtype="float64", na_value=np.nan)
+    return values.to_numpy()
+
+
+class SortIndex:
+    """
+    columns별 정렬 순서.
+    - _valid[col]: 값이 있는 행을 오름차순으로 정렬한 행 번호 (int32)
+    - _descending[col]: 값이 있는 행을 내림차순으로 정렬한 행 번호 (int32)
+    - _missing[col]: 결측인 행 번호 (원래 순서)
+    """
+
+    def __init__(self, df, columns):
+        self.n_rows = len(df)
+        self._valid, self._descending, self._missing = {}, {}, {}
+        for col in columns:
+            if col not in df.columns:
+                continue
+            values = df[col]
+            missing = values.isna().to_numpy()
+            rows = np.flatnonzero(~missing).astype(np.int32)
+            keys = _sort_keys(values)[rows]
+            order = np.argsort(keys, kind="stable")
+            self._valid[col] = rows[order]
+            # 같은 값 묶음 번호의 역순으로 안정 정렬: 묶음 순서만 뒤집히고 묶음 안의 행 순서는 그대로
+            sorted_keys = keys[order]
+            groups = np.cumsum(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]]) if rows.size else rows
+            self._descending[col] = self._valid[col][np.argsort(-groups, kind="stable")]
+            self._missing[col] = np.flatnonzero(missing).astype(np.int32)
+
+    def __contains__(self, column):
+        return column in self._valid
+
+    def order(self, column, ascending=True, mask=None):
+        """
+        column 기준으로 정렬된 행 번호 배열.
+        mask: 길이 n_rows의 bool 배열. 주어지면 True인 행만 순서를 유지한 채 남김.
+        색인하지 않은(데이터셋에 없는) 컬럼이면 빈 배열.
+        """
+        if column not in self._valid:
+            return np.empty(0, dtype=np.int32)
+        valid = self._valid[column] if ascending else self._descending[column]
+        missing = self._missing[column]
+        if mask is not None:
+            valid, missing = valid[mask[valid]], missing[mask[missing]]
+        return np.concatenate((valid, missing)) if missing.size else valid
+
+
+def rows_to_mask(rows, n_rows):
+    """행 번호 배열을 길이 n_rows의 bool 마스크로 변환."""
+    mask = np.zeros(n_rows, dtype=bool)
+    mask[rows] = True
+    return mask
@@ -0,0 +1,205 @@
+# utils/sources.py
+import json
+import os
+import shutil
+from email.utils import formatdate
+from urllib.parse import quote, urljoin
+
+import gdown
+import requests
+from requests.adapters import HTTPAdapter
+
+# 스트리밍 다운로드 청크 크기
+CHUNK_SIZE = 1 << 16
+# 재개 가능한 부분 다운로드 파일의 접미사
+PARTIAL_SUFFIX = ".part"
+# HTTP 재검증용 캐시 헤더(ETag/Last-Modified)를 저장하는 사이드카 파일 접미사
+VALIDATORS_SUFFIX = ".http.json"
+
+
+class DatasetSource:
+    """
+    데이터셋 파일을 가져오는 백엔드의 공통 인터페이스.
+    fetch()는 dest에 최신 파일을 두고, 실제로 내용을 받았으면 True, 변경이 없으면 False를 반환.
+    """
+
+    # True면 dest가 이미 있어도 fetch()를 호출해 원본과 비교(재검증)함
+    revalidates = False
+
+    def fetch(self, name, dest, on_progress=None):
+        raise NotImplementedError
+
+    def describe(self):
+        return type(self).__name__
+
+
+class LocalDirectorySource(DatasetSource):
+    """로컬(또는 마운트된) 디렉터리에서 파일을 복사. 크기/수정시각이 같으면 건너뜀."""
+
+    revalidates = True
+
+    def __init__(self, root):
+        self.root = root
+
+    def fetch(self, name, dest, on_progress=None):
+        src = os.path.join(self.root, name)
+        stat = os.stat(src)
+        if os.path.exists(dest):
+            dest_stat = os.stat(dest)
+            if dest_stat.st_size == stat.st_size and dest_stat.st_mtime_ns == stat.st_mtime_ns:
+                if on_progress:
+                    on_progress(stat.st_size, stat.st_size)
+                return False
+        part_path = dest + PARTIAL_SUFFIX
+        shutil.copy2(src, part_path)
+        os.replace(part_path, dest)
+        if on_progress:
+            on_progress(stat.st_size, stat.st_size)
+        return True
+
+    def describe(self):
+        return f"local:{self.root}"
+
+
+class HTTPSource(DatasetSource):
+    """
+    base_url 아래의 파일을 HTTP(S)로 내려받음 (예: 사내 미러).
+    keep-alive 커넥션 풀을 공유하는 requests.Session을 사용하고,
+    기존 파일은 ETag/If-Modified-Since 조건부 GET으로 재검증해 변경이 없으면 304 한 번으로 끝냄.
+    """
+
+    revalidates = True
+
+    def __init__(self, base_url, pool_size=8, timeout=60, session=None):
+        self.base_url = base_url if base_url.endswith("/") else base_url + "/"
+        self.timeout = timeout
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=2)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+        self.session = session
+
+    def url_for(self, name):
+        return urljoin(self.base_url, quote(name))
+
+    def fetch(self, name, dest, on_progress=None):
+        return download_http(self.session, self.url_for(name), dest, on_progress, timeout=self.timeout)
+
+    def describe(self):
+        return self.base_url
+
+
+class GoogleDriveSource(DatasetSource):
+    """{파일명: Google Drive 공유 링크}로 gdown을 통해 내려받음. 이미 받은 파일은 재검증하지 않음."""
+
+    def __init__(self, links):
+        self.links = dict(links)
+
+    def fetch(self, name, dest, on_progress=None):
+        url = self.links[name]
+        if on_progress:
+            on_progress(0, None)
+        # gdown은 임시 파일에 기록한 뒤 dest로 이동하며, resume=True면 남은 임시 파일을 이어받음
+        gdown.download(url, dest, quiet=True, fuzzy=True, resume=True)
+        if not os.path.exists(dest):
+            raise RuntimeError(f"다운로드 실패: {url}")
+        size = os.path.getsize(dest)
+        if on_progress:
+            on_progress(size, size)
+        return True
+
+    def describe(self):
+        return "google-drive"
+
+
+def _read_validators(dest):
+    try:
+        with open(dest + VALIDATORS_SUFFIX, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_validators(dest, response):
+    validators = {
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+    }
+    with open(dest + VALIDATORS_SUFFIX, "w", encoding="utf-8") as f:
+        json.dump(validators, f)
+
+
+def download_http(session, url, dest, on_progress=None, timeout=60):
+    """
+    url을 dest로 내려받음.
+    - dest가 있으면 저장된 ETag/Last-Modified(없으면 파일 mtime)로 조건부 GET을 보내고, 304면 False 반환.
+    - dest + ".part"에 기록한 뒤 완료 시 원자적으로 이름을 바꾸며,
+      .part 파일이 남아 있으면 Range 요청으로 이어받음.
+    """
+    headers = {}
+    if os.path.exists(dest):
+        validators = _read_validators(dest)
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        headers["If-Modified-Since"] = validators.get("last_modified") or formatdate(
+            os.path.getmtime(dest), usegmt=True
+        )
+
+    part_path = dest + PARTIAL_SUFFIX
+    offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+    if offset:
+        headers["Range"] = f"bytes={offset}-"
+        # 이어받는 중 원본이 바뀌면 서버가 전체 본문(200)을 보내도록 함
+        validators = _read_validators(part_path)
+        if validators.get("etag") or validators.get("last_modified"):
+            headers["If-Range"] = validators.get("etag") or validators["last_modified"]
+
+    with session.get(url, headers=headers, stream=True, timeout=timeout) as response:
+        if response.status_code == 304:
+            size = os.path.getsize(dest)
+            if on_progress:
+                on_progress(size, size)
+            return False
+        if response.status_code == 416 and offset:
+            # 부분 파일이 이미 끝까지 받아진 상태이거나 깨진 경우: 처음부터 다시 받음
+            os.remove(part_path)
+            return download_http(session, url, dest, on_progress, timeout)
+        response.raise_for_status()
+        if response.status_code != 206:
+            offset = 0
+        _write_validators(part_path, response)
+        length = response.headers.get("Content-Length")
+        total = offset + int(length) if length is not None else None
+        done = offset
+        if on_progress:
+            on_progress(done, total)
+        with open(part_path, "ab" if offset else "wb") as f:
+            for chunk in response.iter_content(CHUNK_SIZE):
+                f.write(chunk)
+                done += len(chunk)
+                if on_progress:
+                    on_progress(done, total)
+
+    os.replace(part_path, dest)
+    os.replace(part_path + VALIDATORS_SUFFIX, dest + VALIDATORS_SUFFIX)
+    return True
+
+
+def source_from_env(drive_links, env_var="KNOVEL_DATA_SOURCE"):
+    """
+    환경변수로 데이터 소스를 선택.
+    - 미설정 또는 "drive": Google Drive (drive_links 사용)
+    - "http://..." / "https://...": 해당 URL을 기준으로 하는 HTTP 미러
+    - "local:/경로" 또는 존재하는 디렉터리 경로: 로컬 디렉터리
+    """
+    spec = os.environ.get(env_var, "").strip()
+    if not spec or spec == "drive":
+        return GoogleDriveSource(drive_links)
+    if spec.startswith(("http://", "https://")):
+        return HTTPSource(spec)
+    if spec.startswith("local:"):
+        return LocalDirectorySource(spec[len("local:"):])
+    if os.path.isdir(spec):
+        return LocalDirectorySource(spec)
+    raise ValueError(f"알 수 없는 데이터 소스입니다: {env_var}={spec}")
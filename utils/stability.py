@@ -0,0 +1,135 @@
+# utils/stability.py
+"""
+fuzzy TOPSIS 순위의 가중치 민감도(Monte-Carlo 순위 안정성) 분석.
+
+기준 가중치 주변에서 Dirichlet 분포로 가중치를 여러 벌 뽑아, 가중치 묶음(chunk)마다
+(가중치 수 × 기준 수 × 도서 수) 배열 연산 한 번으로 점수와 순위를 계산.
+도서별 순위는 표본을 모두 저장하지 않고 순위 구간 히스토그램으로 누적해 메모리를 일정하게 유지하며,
+히스토그램에서 중앙값과 5~95% 구간을 구함. 구간은 로그 간격이라 상위 순위는 한 순위씩(정확한 분위수),
+아래로 갈수록 넓어져 순위 대비 상대 오차가 일정함. 가중치 묶음은 선택적으로 프로세스 풀에 나눠 계산.
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from utils.topsis import VALUE_SPREAD, WEIGHT_SPREAD, closeness, normalized_matrix, normalize_weights
+
+DEFAULT_SAMPLES = 2000
+# Dirichlet 집중도: 클수록 기준 가중치 가까이에서만 흔들림
+DEFAULT_CONCENTRATION = 30.0
+# 도서별 순위 히스토그램의 최대 구간 수 (도서 수가 이보다 적으면 순위마다 한 구간 = 정확한 분위수).
+# 더 많으면 로그 간격 구간: 도서 10만 권이면 상위 약 20위까지 한 순위씩, 그 아래는 순위의 약 5% 폭
+MAX_RANK_BINS = 256
+# 가중치 묶음 하나에서 만드는 (가중치 수 × 기준 수 × 도서 수) 배열의 최대 원소 수
+CHUNK_ELEMENTS = 4_000_000
+QUANTILES = (0.05, 0.5, 0.95)
+
+
+def stability_workers():
+    """
+    대시보드에서 사용할 프로세스 수. KNOVEL_STABILITY_WORKERS 환경변수로 지정하며,
+    없거나 1 이하이면 현재 프로세스에서 계산.
+    """
+    try:
+        return int(os.environ.get("KNOVEL_STABILITY_WORKERS", "1"))
+    except ValueError:
+        return 1
+
+
+def perturbed_weights(base_weights, n_samples, concentration=DEFAULT_CONCENTRATION, rng=None):
+    """기준 가중치(정규화)를 평균으로 하는 Dirichlet 표본 (n_samples, 기준 수)."""
+    rng = np.random.default_rng(rng)
+    alpha = np.maximum(normalize_weights(base_weights) * concentration, 1e-3)
+    return rng.dirichlet(alpha, size=n_samples)
+
+
+def _triangular(weight_matrix, spread):
+    # triangular_weights()의 일괄 버전: (표본 수, 기준 수) → (표본 수, 기준 수, 3)
+    return np.stack([np.clip(weight_matrix - spread, 0.0, None), weight_matrix, weight_matrix + spread], axis=2)
+
+
+def rank_bin_edges(n_books, max_bins=MAX_RANK_BINS):
+    """
+    0부터의 순위 구간 경계 (구간 b = [edges[b], edges[b + 1])).
+    도서 수가 max_bins 이하이면 순위마다 한 구간, 많으면 1 ~ n_books를 로그 간격으로 나눈 정수 경계
+    (간격이 1보다 좁은 상위 구간은 한 순위씩).
+    """
+    if n_books <= max_bins:
+        return np.arange(n_books + 1)
+    edges = np.unique(np.rint(np.geomspace(1, n_books, max_bins)).astype(np.int64))
+    return np.concatenate([[0], edges])
+
+
+def _rank_histogram(y, shape, weight_matrix, edges, weight_spread, chunk_size):
+    """
+    가중치 표본별 순위를 계산해 (도서 수, 구간 수) int32 히스토그램으로 누적.
+    묶음마다 그 묶음의 (표본 수 × 도서 수) 칸만 기존 히스토그램에 더하므로 히스토그램 외 메모리는 묶음 크기로 제한됨.
+    """
+    n_books = y.shape[1]
+    n_bins = len(edges) - 1
+    # 순위 → 구간 번호 조회표
+    bin_of_rank = np.repeat(np.arange(n_bins, dtype=np.int64), np.diff(edges))
+    histogram = np.zeros(n_books * n_bins, dtype=np.int32)
+    book_offsets = np.arange(n_books, dtype=np.int64) * n_bins
+    for start in range(0, len(weight_matrix), chunk_size):
+        weights = weight_matrix[start:start + chunk_size]
+        scores = closeness(y, shape[None, :, :] * _triangular(weights, weight_spread))
+        # 표본마다 점수 내림차순 순위 (0부터; 동점은 먼저 나온 도서가 앞)
+        order = np.argsort(-scores, axis=1, kind="stable")
+        ranks = np.empty_like(order)
+        np.put_along_axis(ranks, order, np.arange(n_books)[None, :], axis=1)
+        bins = bin_of_rank[ranks]
+        np.add.at(histogram, (book_offsets[None, :] + bins).ravel(), 1)
+    return histogram.reshape(n_books, n_bins)
+
+
+def _histogram_quantiles(histogram, edges, quantiles):
+    """
+    순위 히스토그램에서 분위수별 순위(1부터, 구간 중앙값)를 (도서 수, 분위수 수)로 반환.
+    히스토그램 자리에서 누적합을 계산하므로 histogram은 누적 빈도로 바뀜.
+    """
+    cumulative = np.cumsum(histogram, axis=1, out=histogram)
+    total = cumulative[:, -1:]
+    # 구간 b에 들어가는 0부터의 순위는 [edges[b], edges[b + 1]) 이므로 그 중앙값 + 1
+    centers = (edges[:-1] + edges[1:] - 1) / 2 + 1
+    result = np.empty((histogram.shape[0], len(quantiles)))
+    for i, q in enumerate(quantiles):
+        target = np.maximum(np.ceil(q * total), 1)
+        result[:, i] = centers[(cumulative < target).sum(axis=1)]
+    return result
+
+
+def rank_stability(values, base_weights, n_samples=DEFAULT_SAMPLES, concentration=DEFAULT_CONCENTRATION,
+                   seed=0, workers=None, benefit=None, value_spread=VALUE_SPREAD, weight_spread=WEIGHT_SPREAD):
+    """
+    도서별 순위 분포 요약 DataFrame (rank_p05, rank_median, rank_p95, float32).
+    values: (도서 수, 기준 수) 기준 값 행렬. 기준 값이 하나라도 결측인 도서는 NaN.
+    workers: 2 이상이면 가중치 표본을 그 수의 프로세스에 나눠 계산. 스트림릿 서버는 여러 스레드로 동작하므로
+    fork 대신 spawn으로 새 프로세스를 만듦.
+    """
+    y, shape, valid = normalized_matrix(values, benefit, value_spread)
+    summary = np.full((valid.size, len(QUANTILES)), np.nan)
+    n_books = y.shape[1]
+    if n_books:
+        weight_matrix = perturbed_weights(base_weights, n_samples, concentration, seed)
+        edges = rank_bin_edges(n_books)
+        chunk_size = max(1, CHUNK_ELEMENTS // (y.shape[0] * n_books))
+        if workers and workers > 1 and len(weight_matrix) > chunk_size:
+            parts = np.array_split(weight_matrix, workers)
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+                futures = [pool.submit(_rank_histogram, y, shape, part, edges, weight_spread, chunk_size)
+                           for part in parts if len(part)]
+                histogram = sum(future.result() for future in futures)
+        else:
+            histogram = _rank_histogram(y, shape, weight_matrix, edges, weight_spread, chunk_size)
+        summary[valid] = _histogram_quantiles(histogram, edges, QUANTILES)
+    return pd.DataFrame(summary.astype("float32"), columns=["rank_p05", "rank_median", "rank_p95"])
+
+
+def stability_frame(df, base_weights, criteria, **kwargs):
+    """df의 criteria 컬럼으로 rank_stability()를 계산. 행 순서는 df와 같음."""
+    values = np.column_stack([df[c].to_numpy(dtype="float64", na_value=np.nan) for c in criteria])
+    return rank_stability(values, base_weights, **kwargs)
@@ -0,0 +1,142 @@
+# utils/topsis.py
+"""
+Fuzzy TOPSIS 점수 계산 (NumPy 벡터 연산).
+
+각 평가 기준 값과 가중치를 삼각 퍼지수(TFN, (l, m, u))로 표현하고,
+정규화 → 가중 → 이상해(FPIS)/반이상해(FNIS)까지의 정점 거리(vertex distance) → 근접 계수(closeness)를
+(도서 수 × 기준 수 × 3) 배열 연산으로 한 번에 계산.
+"""
+import numpy as np
+import pandas as pd
+
+# 흥행예측도서 종합 평가 점수의 평가 기준 (모두 클수록 좋은 benefit 기준)
+CRITERIA = ["salespoint", "nyb_max_s", "nyt_genre_score", "imdb_genre_score"]
+DEFAULT_WEIGHTS = {criterion: 0.25 for criterion in CRITERIA}
+# 가중치 TFN의 폭: w → (w - spread, w, w + spread) (0 미만은 0으로)
+WEIGHT_SPREAD = 0.05
+# 기준 값 TFN의 상대 폭: x → (x(1 - spread), x, x(1 + spread))
+VALUE_SPREAD = 0.05
+
+
+def normalize_weights(weights):
+    """가중치를 합이 1이 되도록 정규화. 음수·결측 가중치가 있거나 합이 0이면 ValueError."""
+    weights = np.asarray(weights, dtype=np.float64)
+    if not np.isfinite(weights).all() or (weights < 0).any():
+        raise ValueError("가중치는 0 이상의 유한한 값이어야 합니다.")
+    total = weights.sum()
+    if total <= 0:
+        raise ValueError("가중치의 합은 0보다 커야 합니다.")
+    return weights / total
+
+
+def triangular_weights(weights, spread=WEIGHT_SPREAD):
+    """정규화한 가중치를 (기준 수, 3) TFN 배열로 변환."""
+    w = normalize_weights(weights)
+    return np.stack([np.clip(w - spread, 0.0, None), w, w + spread], axis=1)
+
+
+def fuzzify(values, spread=VALUE_SPREAD):
+    """(도서 수, 기준 수) 실수 행렬을 (도서 수, 기준 수, 3) TFN 배열로 변환."""
+    values = np.asarray(values, dtype=np.float64)
+    return np.stack([values * (1 - spread), values, values * (1 + spread)], axis=2)
+
+
+def _vertex_distance(y, shape, point):
+    """
+    TFN y * shape와 실수 point의 정점 거리 sqrt(mean_k (y * shape_k - point)^2)를
+    3번째 축을 만들지 않고 전개식으로 계산.
+    y: (기준 수, 도서 수), shape: (..., 기준 수, 3), point: (..., 기준 수) → (..., 기준 수, 도서 수)
+    """
+    a = (shape ** 2).mean(axis=-1)[..., None]
+    b = shape.mean(axis=-1)[..., None]
+    point = point[..., None]
+    squared = y * (y * a - 2 * b * point) + point ** 2
+    return np.sqrt(np.maximum(squared, 0.0))
+
+
+def normalized_matrix(values, benefit=None, value_spread=VALUE_SPREAD):
+    """
+    fuzzify()한 TFN을 정규화하면 칸마다 (실수 y) × (기준별 TFN 모양)이 되므로 그 두 부분을 반환.
+    - y: (기준 수, 유효 도서 수). 도서 축 집계가 연속 메모리에서 일어나도록 전치한 형태
+    - shape: (기준 수, 3)
+    - valid: (도서 수,) 기준 값이 모두 있는 도서
+    values는 (도서 수, 기준 수) 0 이상의 실수 행렬, benefit은 기준별 bool (기본값 모두 True).
+    """
+    x = np.ascontiguousarray(np.asarray(values, dtype=np.float64).T)
+    n_criteria = x.shape[0]
+    benefit = np.ones(n_criteria, dtype=bool) if benefit is None else np.asarray(benefit, dtype=bool)
+    valid = ~np.isnan(x).any(axis=0)
+    if not valid.all():
+        x = x[:, valid]
+
+    # 정규화: benefit은 (l, m, u) / max(u), cost는 min(l) / (u, m, l)
+    spread = np.array([1 - value_spread, 1.0, 1 + value_spread])
+    y = np.empty_like(x)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for j in range(n_criteria):
+            if not x.shape[1]:
+                break
+            if benefit[j]:
+                max_u = x[j].max() * spread[2]
+                y[j] = x[j] / max_u if max_u != 0 else 0.0
+            else:
+                y[j] = x[j].min() * spread[0] / x[j]
+    y = np.nan_to_num(y, nan=0.0, posinf=1.0 / spread[0], copy=False)
+    shape = np.where(benefit[:, None], spread[None, :], 1.0 / spread[::-1][None, :])
+    return y, shape, valid
+
+
+def closeness(y, shape):
+    """
+    가중 TFN y × shape의 근접 계수. shape에 가중치가 이미 곱해져 있어야 함.
+    shape가 (기준 수, 3)이면 (도서 수,), (가중치 수, 기준 수, 3)이면 (가중치 수, 도서 수)를 반환.
+    """
+    # 이상해/반이상해: 기준별 가중 TFN의 최댓값(u)/최솟값(l)을 세 꼭짓점으로 하는 TFN
+    ideal = y.max(axis=1) * shape[..., 2]
+    anti_ideal = y.min(axis=1) * shape[..., 0]
+    d_ideal = _vertex_distance(y, shape, ideal).sum(axis=-2)
+    d_anti = _vertex_distance(y, shape, anti_ideal).sum(axis=-2)
+    total = d_ideal + d_anti
+    return np.divide(d_anti, total, out=np.zeros_like(total), where=total > 0)
+
+
+def fuzzy_topsis(values, weights, benefit=None, value_spread=VALUE_SPREAD, weight_spread=WEIGHT_SPREAD):
+    """
+    근접 계수(closeness coefficient, 0~1, 클수록 좋음)를 도서별로 반환.
+    values: (도서 수, 기준 수) 0 이상의 실수 행렬. 기준 값이 하나라도 결측인 도서는 NaN.
+    benefit: 기준별 bool (True: 클수록 좋음, False: 작을수록 좋음). 기본값은 모두 True.
+    """
+    y, shape, valid = normalized_matrix(values, benefit, value_spread)
+    scores = np.full(valid.size, np.nan)
+    if valid.any():
+        # 가중 TFN = y × (shape ⊙ 가중치 TFN)
+        scores[valid] = closeness(y, shape * triangular_weights(weights, weight_spread))
+    return scores
+
+
+def rank_scores(scores):
+    """점수 내림차순 순위 (1부터, 동점은 같은 최소 순위). 점수가 결측이면 순위도 결측 (Int32)."""
+    scores = np.asarray(scores, dtype=np.float64)
+    missing = np.isnan(scores)
+    ranks = np.zeros(scores.size, dtype=np.int32)
+    valid_rows = np.flatnonzero(~missing)
+    order = np.argsort(-scores[valid_rows], kind="stable")
+    ordered = scores[valid_rows][order]
+    # 값이 바뀌는 위치의 순번을 앞으로 채워 동점에 같은 순위를 부여
+    starts = np.r_[True, ordered[1:] != ordered[:-1]]
+    positions = np.arange(1, ordered.size + 1, dtype=np.int32)
+    ranks[valid_rows[order]] = np.maximum.accumulate(np.where(starts, positions, 0))
+    return pd.arrays.IntegerArray(ranks, missing)
+
+
+def score_frame(df, weights, criteria=CRITERIA):
+    """
+    df의 criteria 컬럼으로 다시 계산한 fuzzy_topsis_score(float32)와 fuzzy_rank(Int32) DataFrame.
+    weights: criteria 순서의 가중치 (합이 1이 아니어도 정규화).
+    """
+    values = np.column_stack([df[c].to_numpy(dtype="float64", na_value=np.nan) for c in criteria])
+    scores = fuzzy_topsis(values, weights)
+    return pd.DataFrame({
+        "fuzzy_topsis_score": scores.astype("float32"),
+        "fuzzy_rank": rank_scores(scores),
+    })